@@ -2,3 +2,6 @@ from pathlib import Path
 
 CURRENT_FILE = Path(__file__).resolve()
 ROOT_DIR = CURRENT_FILE.parent
+
+# Время жизни закэшированных ответов API hh.ru, в секундах
+CACHE_TTL = 15 * 60
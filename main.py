@@ -1,14 +1,22 @@
 from typing import Any
 
-from config import ROOT_DIR
+from requests import RequestException
+
+from config import CACHE_TTL, ROOT_DIR
 from src.hh import HeadHunterAPI
+from src.http_cache import ResponseCache
 from src.json_saver import JSONSaver
+from src.sync import IncrementalSync, SyncError
+from src.text_index import InvertedIndex
 from src.vacancies_hh import Vacancy
 
 
 def user_interaction() -> Any:
-    platform = HeadHunterAPI()
-    storage = JSONSaver(f"{ROOT_DIR}/data/vacancies.json")
+    platform = HeadHunterAPI(cache=ResponseCache(f"{ROOT_DIR}/data/cache", ttl=CACHE_TTL))
+    storage = JSONSaver(
+        f"{ROOT_DIR}/data/vacancies.json", text_index=InvertedIndex(f"{ROOT_DIR}/data/vacancies.index.json")
+    )
+    sync = IncrementalSync(platform, storage)
     while True:
         print("\n1. Ввести поисковый запрос")
         print("2. Получить топ N вакансий по зарплате")
@@ -19,9 +27,11 @@ def user_interaction() -> Any:
 
         if choice == "1":
             query = input("Введите поисковый запрос: ")
-            vacancies = platform.receiving_vacancies(query)
-            vacancies_list = Vacancy.receiving_vacancies_list(vacancies)
-            storage.add_vacancy(vacancies_list)
+            try:
+                vacancies_list = sync.run(query)
+            except (RequestException, SyncError) as e:
+                print(f"Синхронизация не завершена, повторите запрос позже: {e}")
+                continue
             print(f"Добавлено {len(vacancies_list)} вакансий.")
 
         elif choice == "2":
@@ -32,25 +42,12 @@ def user_interaction() -> Any:
             except ValueError:
                 print("Пожалуйста, введите корректное положительное число")
                 continue
-            info = storage.load_data()
-            vacancies_list = [Vacancy(**vacancy) for vacancy in info]  # Преобразуем словари в объекты Vacancy
-            sorted_vacancies = sorted(
-                vacancies_list,
-                key=lambda x: (isinstance(x.salary_from, int) + isinstance(x.salary_to, int)) / 2,
-                reverse=True,
-            )
-            for vacancy in sorted_vacancies[:n]:
-                print(vacancy.__repr__())
+            for item in storage.top_by_salary(n):
+                print(Vacancy(**item).__repr__())
 
         elif choice == "3":
             keyword = input("Введите ключевое слово: ").lower()
-            all_vacancies = storage.load_data()
-
-            filtered_vacancies = [
-                Vacancy(**vacancy)
-                for vacancy in all_vacancies
-                if vacancy.get("requirement") is not None and keyword in vacancy.get("requirement", "").lower()
-            ]
+            filtered_vacancies = [Vacancy(**vacancy) for vacancy in storage.search(keyword)]
 
             for vacancy in filtered_vacancies:
                 print(vacancy)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from typing import Dict, Iterable, Union
 
 from src.vacancies_hh import Vacancy
 
@@ -11,8 +11,9 @@ class BaseClass(ABC):
     и удаления информации о вакансиях."""
 
     @abstractmethod
-    def add_vacancy(self, vacancies: Union[Vacancy, List[Vacancy]]) -> None:
-        """Метод для добавления вакансий в файл."""
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий в файл. on_conflict задаёт поведение при совпадении
+        ключа вакансии: "skip", "replace" или "merge"."""
         pass
 
     @abstractmethod
@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+from src.vacancies_hh import Vacancy, VacancyCollection, extract_fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Страница выдачи: ответ API целиком (словарь с items), список вакансий или сырые байты/строка ответа
+Page = Union[bytes, bytearray, str, Dict[str, Any], List[Any]]
+
+
+class ParseError(NamedTuple):
+    """Ошибка разбора: номер страницы, номер вакансии на странице (-1 — страница целиком) и описание."""
+    page: int
+    item: int
+    error: str
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Разбор JSON: orjson, если он установлен, иначе стандартный json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_pages(pages: Union[Page, Iterable[Page]]) -> Iterator[Page]:
+    """Одна страница или последовательность страниц — всегда последовательность страниц."""
+    if isinstance(pages, (bytes, bytearray, str, dict)):
+        yield pages
+        return
+    if isinstance(pages, list) and pages and isinstance(pages[0], dict) and 'items' not in pages[0]:
+        yield pages
+        return
+    yield from pages
+
+
+def parse_records(pages: Union[Page, Iterable[Page]]) -> Tuple[List[Dict[str, Any]], List[ParseError]]:
+    """Разбор страниц выдачи в словари вакансий. Некорректные вакансии и страницы
+    не прерывают обработку, а попадают в список ошибок."""
+    records: List[Dict[str, Any]] = []
+    errors: List[ParseError] = []
+    append = records.append
+    for page_number, page in enumerate(iter_pages(pages)):
+        try:
+            if isinstance(page, (bytes, bytearray, str)):
+                page = loads(page)
+            items = page.get('items', []) if isinstance(page, dict) else page
+            if not isinstance(items, list):
+                raise TypeError(f"Ожидался список вакансий, получен {type(items).__name__}")
+        except (ValueError, TypeError) as e:
+            errors.append(ParseError(page_number, -1, str(e)))
+            continue
+        for item_number, item in enumerate(items):
+            try:
+                append(extract_fields(item))
+            except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+                errors.append(ParseError(page_number, item_number, f"{type(e).__name__}: {e}"))
+    return records, errors
+
+
+def parse_vacancies(pages: Union[Page, Iterable[Page]]) -> Tuple[List[Vacancy], List[ParseError]]:
+    """Разбор страниц выдачи в объекты Vacancy."""
+    records, errors = parse_records(pages)
+    return [Vacancy(**record) for record in records], errors
+
+
+def parse_collection(pages: Union[Page, Iterable[Page]]) -> Tuple[VacancyCollection, List[ParseError]]:
+    """Разбор страниц выдачи сразу в колоночную коллекцию, без создания объектов Vacancy."""
+    records, errors = parse_records(pages)
+    return VacancyCollection.from_records(records), errors
@@ -0,0 +1,61 @@
+import gzip
+from pathlib import Path
+from typing import IO, Any, Dict, Optional, Union
+
+try:
+    import zstandard  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    lz4_frame = None
+
+# Расширение файла -> алгоритм сжатия
+CODECS: Dict[str, str] = {".gz": "gzip", ".zst": "zstd", ".lz4": "lz4"}
+# Уровень gzip: почти та же степень сжатия, что у максимального 9, но заметно быстрее
+GZIP_LEVEL = 6
+
+
+def codec_for(path: Union[str, Path]) -> Optional[str]:
+    """Алгоритм сжатия по расширению файла или None для несжатого файла."""
+    return CODECS.get(Path(path).suffix.lower())
+
+
+def _codec_module(codec: str) -> Any:
+    """Модуль, реализующий алгоритм сжатия; для отсутствующих пакетов — ImportError."""
+    if codec == "gzip":
+        return gzip
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("Для файлов .zst нужен пакет zstandard")
+        return zstandard
+    if lz4_frame is None:
+        raise ImportError("Для файлов .lz4 нужен пакет lz4")
+    return lz4_frame
+
+
+def open_text(path: Union[str, Path], mode: str = "r", encoding: str = "utf-8",
+              codec: Optional[str] = None) -> IO[str]:
+    """Открытие текстового файла с потоковым сжатием или распаковкой по расширению пути
+    (или явно заданному алгоритму codec). Несжатые файлы открываются обычным open()."""
+    codec = codec or codec_for(path)
+    if codec is None:
+        return open(path, mode, encoding=encoding)
+    mode = mode.replace("t", "") + "t"
+    if codec == "gzip":
+        text: IO[str] = gzip.open(path, mode, compresslevel=GZIP_LEVEL, encoding=encoding)  # type: ignore[assignment]
+        return text
+    file: IO[str] = _codec_module(codec).open(path, mode, encoding=encoding)
+    return file
+
+
+def read_bytes(path: Union[str, Path]) -> bytes:
+    """Содержимое файла, распакованное по расширению пути."""
+    codec = codec_for(path)
+    if codec is None:
+        return Path(path).read_bytes()
+    with _codec_module(codec).open(path, "rb") as file:
+        data: bytes = file.read()
+    return data
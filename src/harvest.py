@@ -0,0 +1,103 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.hh import HeadHunterAPI
+
+# hh.ru отдаёт не больше 2000 вакансий по одному запросу (page * per_page)
+RESULTS_LIMIT = 2000
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+# Точность фильтров date_from/date_to в API hh.ru
+DATE_STEP = timedelta(seconds=1)
+
+
+class HarvestPlanner:
+    """Планировщик полной выгрузки вакансий по широким запросам.
+    Запрос, упирающийся в ограничение выдачи hh.ru, рекурсивно делится
+    на непересекающиеся подзапросы по регионам и окнам даты публикации,
+    которые затем загружаются параллельно и объединяются без дублей.
+    Окна полуоткрытые: (start, stop], поскольку date_from и date_to в API включают границы,
+    date_from сдвигается на секунду. Выгрузка охватывает вакансии, опубликованные после since,
+    по умолчанию — за последние window_days дней; более ранние публикации не запрашиваются.
+    С strict=True ошибки запросов не пропускаются, а пробрасываются вызывающему коду."""
+
+    def __init__(self, api: HeadHunterAPI, max_workers: int = 4, per_page: int = 100,
+                 window_days: int = 30, min_window: timedelta = timedelta(minutes=10), strict: bool = False) -> None:
+        self.__api = api
+        self.__strict = strict
+        self.__max_workers = max_workers
+        self.__per_page = per_page
+        self.__window = timedelta(days=window_days)
+        self.__min_window = max(min_window, DATE_STEP)
+
+    def __search(self, keyword: str, page: int, **filters: Any) -> Optional[Dict[str, Any]]:
+        if self.__strict:
+            return self.__api.fetch(keyword, page, **filters)
+        return self.__api.search(keyword, page, **filters)
+
+    def __found(self, keyword: str, filters: Dict[str, Any]) -> Optional[int]:
+        """Количество вакансий по подзапросу."""
+        payload = self.__search(keyword, 0, per_page=1, **filters)
+        if payload is None:
+            return None
+        return int(payload.get('found', 0))
+
+    @staticmethod
+    def __window_filters(start: datetime, end: datetime, base: Dict[str, Any]) -> Dict[str, Any]:
+        return {**base, 'date_from': (start + DATE_STEP).strftime(DATE_FORMAT), 'date_to': end.strftime(DATE_FORMAT)}
+
+    def plan(self, keyword: str, areas: Optional[Iterable[str]] = None, now: Optional[datetime] = None,
+             since: Optional[datetime] = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Метод построения списка подзапросов, каждый из которых укладывается в ограничение выдачи.
+        Подзапросы покрывают публикации в интервале (since, now] без пересечений.
+        Возвращает фильтры подзапросов с ожидаемым количеством вакансий в поле found."""
+        end = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        start = since.replace(microsecond=0) if since is not None else end - self.__window
+        bases = [{**filters, 'area': area} for area in areas] if areas else [filters]
+        pending: List[Tuple[datetime, datetime, Dict[str, Any]]] = [(start, end, base) for base in bases]
+        planned: List[Dict[str, Any]] = []
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            while pending:
+                queries = [self.__window_filters(start, stop, base) for start, stop, base in pending]
+                counts = list(executor.map(lambda query: self.__found(keyword, query), queries))
+                next_level = []
+                for (start, stop, base), query, found in zip(pending, queries, counts):
+                    if found is None or found == 0:
+                        continue
+                    if found <= RESULTS_LIMIT or stop - start <= self.__min_window:
+                        if found > RESULTS_LIMIT:
+                            print(f'Подзапрос {query} не удалось разделить: доступно {RESULTS_LIMIT} из {found}')
+                        planned.append({**query, 'found': found})
+                        continue
+                    middle = start + (stop - start) // 2 // DATE_STEP * DATE_STEP
+                    next_level.extend([(start, middle, base), (middle, stop, base)])
+                pending = next_level
+        return planned
+
+    def __fetch(self, keyword: str, filters: Dict[str, Any], page: int) -> List[Dict[str, Any]]:
+        payload = self.__search(keyword, page, per_page=self.__per_page, **filters)
+        items: List[Dict[str, Any]] = payload.get('items', []) if payload else []
+        return items
+
+    def harvest(self, keyword: str, areas: Optional[Iterable[str]] = None, now: Optional[datetime] = None,
+                since: Optional[datetime] = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Метод полной выгрузки вакансий, опубликованных в интервале (since, now], с удалением дублей по id."""
+        return self.fetch_plan(keyword, self.plan(keyword, areas, now, since, **filters))
+
+    def fetch_plan(self, keyword: str, plan: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Метод загрузки вакансий по готовому списку подзапросов (см. plan()) с удалением дублей по id."""
+        tasks: List[Tuple[Dict[str, Any], int]] = []
+        for planned in plan:
+            query = dict(planned)
+            found = query.pop('found')
+            pages = math.ceil(min(found, RESULTS_LIMIT) / self.__per_page)
+            tasks.extend((query, page) for page in range(pages))
+
+        vacancies: Dict[Any, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            for items in executor.map(lambda task: self.__fetch(keyword, *task), tasks):
+                for item in items:
+                    vacancies.setdefault(item.get('id'), item)
+        return list(vacancies.values())
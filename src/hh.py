@@ -1,50 +1,195 @@
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import requests
 from requests import HTTPError, RequestException
+from requests.adapters import HTTPAdapter
 
 from src.base_api import BaseApi
+from src.bulk_parser import parse_vacancies
+from src.http_cache import ResponseCache
+from src.rate_limit import RateLimiter, RetryPolicy
+from src.vacancies_hh import Vacancy
 
 
 class HeadHunterAPI(BaseApi):
     """Класс для работы с API с HeadHunter."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = 1, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None) -> None:
         super().__init__()
         self.__url: str = 'https://api.hh.ru/vacancies'
         self.__headers: Dict[str, str] = {'User-Agent': 'HH-User-Agent'}
         self.__params: Dict[str, Any] = {'text': '', 'page': 0, 'per_page': 100}
         self.__vacancies: List[Dict[str, Any]] = []
+        self.__max_workers: int = max(1, max_workers)
+        self.__session: Optional[requests.Session] = None
+        self.__cache: Optional[ResponseCache] = cache
+        self.__rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.__retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
 
     def __repr__(self) -> str:
         """Строковое представление списка вакансий."""
         return f'{self.__vacancies}'
 
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Счётчики повторных запросов и ожиданий ограничителя частоты."""
+        return {'retries': self.__retry_policy.retries,
+                'throttle_waits': self.__rate_limiter.throttle_waits,
+                'throttle_wait_time': self.__rate_limiter.throttle_wait_time,
+                'rate': self.__rate_limiter.rate}
+
     @property
     def _BaseApi__connect_to_api(self) -> str:
         return ""
 
+    def __get_session(self) -> requests.Session:
+        """Общая сессия с пулом keep-alive соединений для параллельной загрузки."""
+        if self.__session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.__max_workers)
+            session.mount('https://', adapter)
+            session.headers.update(self.__headers)
+            self.__session = session
+        return self.__session
+
+    def __request(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Запрос к API с учётом кэша. Возвращает тело ответа или None, если статус ответа не 200."""
+        entry = self.__cache.get(self.__url, params) if self.__cache is not None else None
+        if entry is not None and self.__cache is not None and self.__cache.is_fresh(entry):
+            cached: Dict[str, Any] = entry['payload']
+            return cached
+        conditional_headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.get('etag'):
+                conditional_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.__send(params, conditional_headers)
+
+        if response.status_code == 304 and entry is not None and self.__cache is not None:
+            self.__cache.refresh(self.__url, params, entry)
+            revalidated: Dict[str, Any] = entry['payload']
+            return revalidated
+        if response.status_code != 200:
+            print(f'Получен статус: {response.status_code}')
+            return None
+        payload: Dict[str, Any] = response.json()
+        if self.__cache is not None:
+            self.__cache.set(self.__url, params, payload,
+                             response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return payload
+
+    def __send(self, params: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
+        """Отправка запроса с ограничением частоты и повторами при 429/5xx и сбоях соединения."""
+        attempt = 0
+        while True:
+            self.__rate_limiter.acquire()
+            try:
+                if self.__max_workers > 1:
+                    response = self.__get_session().get(self.__url, headers=headers, params=params)
+                else:
+                    response = requests.get(self.__url, headers={**self.__headers, **headers}, params=params)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.__retry_policy.max_retries:
+                    raise
+                self.__retry_policy.wait(attempt)
+                attempt += 1
+                continue
+            if response.status_code == 429:
+                self.__rate_limiter.on_throttled()
+            elif response.status_code < 400:
+                self.__rate_limiter.on_success()
+            if not self.__retry_policy.should_retry(response.status_code, attempt):
+                return response
+            self.__retry_policy.wait(attempt, response.headers.get('Retry-After'))
+            attempt += 1
+
+    def __fetch_page(self, params: Dict[str, Any], page: int) -> Optional[List[Dict[str, Any]]]:
+        """Загрузка одной страницы выдачи. Возвращает None, если страницу получить не удалось."""
+        payload = self.__request({**params, 'page': page})
+        if payload is None:
+            return None
+        items: List[Dict[str, Any]] = payload.get('items', [])
+        return items
+
+    def __iter_pages(self, params: Dict[str, Any], pages: int) -> Iterator[List[Dict[str, Any]]]:
+        """Генератор страниц выдачи по порядку; останавливается на первой ошибочной или пустой странице."""
+        try:
+            if self.__max_workers > 1:
+                yield from self.__iter_pages_concurrently(params, pages)
+                return
+            for page in range(pages):
+                vacancies = self.__fetch_page(params, page)
+                if not vacancies:
+                    return
+                yield vacancies
+        except HTTPError as e:
+            print(f'HTTP ошибка: {e}')
+        except RequestException as e:
+            print(f'Сетевая ошибка: {e}')
+
+    def __iter_pages_concurrently(self, params: Dict[str, Any], pages: int) -> Iterator[List[Dict[str, Any]]]:
+        """Параллельная загрузка страниц в пуле потоков с сохранением порядка страниц."""
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        try:
+            for vacancies in executor.map(lambda page: self.__fetch_page(params, page), range(pages)):
+                if not vacancies:
+                    return
+                yield vacancies
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def __connect_to_api(self, keyword: str, pages: int = 1) -> None:
         """Метод подключения к API hh.ru."""
         self.__params['text'] = keyword
+        self.__vacancies = [vacancy for page in self.__iter_pages(self.__params, pages) for vacancy in page]
+
+    def fetch(self, keyword: str, page: int = 0, **filters: Any) -> Dict[str, Any]:
+        """Метод получения одной страницы выдачи целиком, вместе с полями found и pages.
+        В отличие от search() ошибки не скрываются: сетевые ошибки пробрасываются,
+        а на ответ со статусом, отличным от 200, бросается HTTPError."""
+        payload = self.__request({**self.__params, **filters, 'text': keyword, 'page': page})
+        if payload is None:
+            raise HTTPError(f'Не удалось получить страницу {page} по запросу {keyword!r}')
+        return payload
+
+    def search(self, keyword: str, page: int = 0, **filters: Any) -> Optional[Dict[str, Any]]:
+        """Метод получения одной страницы выдачи целиком, вместе с полями found и pages.
+        Дополнительные фильтры передаются в API как есть (area, date_from, salary и т.д.).
+        При ошибке выводится сообщение и возвращается None."""
         try:
-            current_page: int = self.__params.get('page', 0)
-            while current_page < pages:
-                response = requests.get(self.__url, headers=self.__headers, params=self.__params)
-                if response.status_code == 200:
-                    vacancies = response.json().get('items', [])
-                    self.__vacancies.extend(vacancies)
-                    current_page += 1
-                    self.__params['page'] = current_page
-                else:
-                    print(f'Получен статус: {response.status_code}')
-                    break
+            return self.fetch(keyword, page, **filters)
         except HTTPError as e:
             print(f'HTTP ошибка: {e}')
         except RequestException as e:
             print(f'Сетевая ошибка: {e}')
+        return None
+
+    def iter_vacancies(self, keyword: str, pages: int = 1, as_objects: bool = False,
+                       **filters: Any) -> Iterator[Union[Dict[str, Any], Vacancy]]:
+        """Генератор вакансий с hh.ru: выдаёт вакансии по мере загрузки страниц,
+        не накапливая их в памяти. При as_objects=True выдаются объекты Vacancy,
+        некорректные вакансии пропускаются с сообщением."""
+        params = {**self.__params, **filters, 'text': keyword}
+        for page in self.__iter_pages(params, pages):
+            if not as_objects:
+                yield from page
+                continue
+            vacancies, errors = parse_vacancies([page])
+            for error in errors:
+                print(f'Некорректная вакансия: {error.error}')
+            yield from vacancies
 
     def receiving_vacancies(self, keyword: str, pages: int = 1) -> List[Dict]:
         """Метод получения вакансий с hh.ru."""
         self.__connect_to_api(keyword, pages)
         return self.__vacancies
+
+    def close(self) -> None:
+        """Закрытие общей HTTP-сессии."""
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
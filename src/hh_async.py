@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.base_api import BaseApi
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+
+class AsyncHeadHunterAPI(BaseApi):
+    """Асинхронный клиент API HeadHunter на aiohttp."""
+
+    def __init__(self, limit: int = 20, limit_per_host: int = 10, session: Optional[Any] = None) -> None:
+        if aiohttp is None:
+            raise ImportError("Для асинхронного клиента требуется пакет aiohttp")
+        super().__init__()
+        self.__url: str = 'https://api.hh.ru/vacancies'
+        self.__headers: Dict[str, str] = {'User-Agent': 'HH-User-Agent'}
+        self.__per_page: int = 100
+        self.__limit: int = limit
+        self.__limit_per_host: int = limit_per_host
+        self.__session: Optional[Any] = session
+        self.__own_session: bool = session is None
+        self.__vacancies: List[Dict[str, Any]] = []
+
+    def __repr__(self) -> str:
+        """Строковое представление списка вакансий."""
+        return f'{self.__vacancies}'
+
+    @property
+    def _BaseApi__connect_to_api(self) -> str:
+        return ""
+
+    async def __aenter__(self) -> "AsyncHeadHunterAPI":
+        self.__get_session()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def __get_session(self) -> Any:
+        """Сессия с ограничением общего числа соединений и соединений на один хост."""
+        if self.__session is None:
+            connector = aiohttp.TCPConnector(limit=self.__limit, limit_per_host=self.__limit_per_host)
+            self.__session = aiohttp.ClientSession(connector=connector, headers=self.__headers)
+        return self.__session
+
+    async def __fetch_page(self, keyword: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        """Загрузка одной страницы выдачи. Возвращает None при ошибке."""
+        params = {'text': keyword, 'page': page, 'per_page': self.__per_page}
+        try:
+            async with self.__get_session().get(self.__url, params=params) as response:
+                if response.status != 200:
+                    print(f'Получен статус: {response.status}')
+                    return None
+                payload = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f'Сетевая ошибка: {e}')
+            return None
+        items: List[Dict[str, Any]] = payload.get('items', [])
+        return items
+
+    async def __connect_to_api(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
+        """Параллельная загрузка страниц; страницы после первой ошибочной отбрасываются."""
+        results = await asyncio.gather(*(self.__fetch_page(keyword, page) for page in range(pages)))
+        vacancies: List[Dict[str, Any]] = []
+        for items in results:
+            if items is None:
+                break
+            vacancies.extend(items)
+        return vacancies
+
+    async def receiving_vacancies(self, keyword: str, pages: int = 1) -> List[Dict]:  # type: ignore[override]
+        """Метод получения вакансий с hh.ru."""
+        self.__vacancies = await self.__connect_to_api(keyword, pages)
+        return self.__vacancies
+
+    async def receiving_many(self, keywords: Iterable[str], pages: int = 1) -> Dict[str, List[Dict]]:
+        """Метод получения вакансий сразу по нескольким запросам в одном цикле событий."""
+        keywords = list(keywords)
+        results = await asyncio.gather(*(self.__connect_to_api(keyword, pages) for keyword in keywords))
+        return dict(zip(keywords, results))
+
+    async def close(self) -> None:
+        """Закрытие сессии, если она была создана клиентом."""
+        if self.__session is not None and self.__own_session:
+            await self.__session.close()
+            self.__session = None
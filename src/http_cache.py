@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """Дисковый кэш ответов API с временем жизни записей, LRU-вытеснением
+    и поддержкой условных запросов по ETag/Last-Modified."""
+
+    def __init__(self, cache_dir: str = "data/cache", ttl: float = 3600, max_entries: int = 1000) -> None:
+        self.__cache_dir = Path(cache_dir)
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__lock = threading.Lock()
+        self.__index: Optional["OrderedDict[str, None]"] = None
+
+    @staticmethod
+    def make_key(url: str, params: Dict[str, Any]) -> str:
+        """Ключ записи по URL и параметрам запроса."""
+        raw = json.dumps([url, sorted(params.items())], ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __path(self, key: str) -> Path:
+        return self.__cache_dir / f"{key}.json"
+
+    def __load_index(self) -> "OrderedDict[str, None]":
+        """Порядок использования записей восстанавливается по времени изменения файлов."""
+        if self.__index is None:
+            self.__cache_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.__cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+            self.__index = OrderedDict((path.stem, None) for path in files)
+        return self.__index
+
+    def get(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Метод получения записи кэша (в том числе устаревшей) или None."""
+        key = self.make_key(url, params)
+        with self.__lock:
+            index = self.__load_index()
+            if key not in index:
+                return None
+            try:
+                with open(self.__path(key), "r", encoding="utf-8") as file:
+                    entry: Dict[str, Any] = json.load(file)
+            except (OSError, ValueError):
+                index.pop(key, None)
+                return None
+            index.move_to_end(key)
+            os.utime(self.__path(key))
+            return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Проверка, что запись ещё не истекла."""
+        return bool(time.time() - entry.get("stored_at", 0) < self.__ttl)
+
+    def set(self, url: str, params: Dict[str, Any], payload: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Метод сохранения ответа в кэш."""
+        entry = {"payload": payload, "etag": etag, "last_modified": last_modified, "stored_at": time.time()}
+        key = self.make_key(url, params)
+        with self.__lock:
+            index = self.__load_index()
+            self.__write(key, entry)
+            index[key] = None
+            index.move_to_end(key)
+            while len(index) > self.__max_entries:
+                oldest, _ = index.popitem(last=False)
+                self.__path(oldest).unlink(missing_ok=True)
+
+    def refresh(self, url: str, params: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """Продление срока жизни записи после ответа 304 Not Modified."""
+        self.set(url, params, entry["payload"], entry.get("etag"), entry.get("last_modified"))
+
+    def clear(self) -> None:
+        """Метод очистки кэша."""
+        with self.__lock:
+            for key in self.__load_index():
+                self.__path(key).unlink(missing_ok=True)
+            self.__index = OrderedDict()
+
+    def __write(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.__cache_dir, suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, self.__path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__load_index())
@@ -1,69 +1,481 @@
 import json
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 from src.base_json import BaseClass
-from src.vacancies_hh import Vacancy
+from src.compression import open_text
+from src.json_stream import iter_json_array, write_json_array
+from src.query import SALARY_FIELDS, MemoryIndex, Predicate, Query
+from src.salary import parse_salary, top_by_salary
+from src.safe_io import FileLock, atomic_write
+from src.text_index import InvertedIndex
+from src.vacancies_hh import IDENTITY_FIELDS, Vacancy, vacancy_key
+
+CONFLICT_MODES = ("skip", "replace", "merge")
+TOMBSTONE_SUFFIX = ".tombstones"
+# Версия формата ключей vacancy_key в сохранённом текстовом индексе: индекс другой версии перестраивается
+KEY_FORMAT = 2
+
+
+def matches_criteria(item: Mapping[str, Any], criteria: Mapping[str, Any]) -> bool:
+    """Совпадение записи с критериями по равенству полей. Зарплаты сравниваются после parse_salary:
+    записи старого формата с заглушками вроде "Зарплата не указана" совпадают с None."""
+    return all(parse_salary(item.get(key)) == parse_salary(value) if key in SALARY_FIELDS else item.get(key) == value
+               for key, value in criteria.items())
+
+
+def _tombstone_header(file_path: Path) -> str:
+    """Первая строка журнала надгробий — подпись файла (время изменения и размер), к которому он относится.
+    Журнал, оставшийся от уже переписанного файла, не применяется."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns} {stat.st_size}"
+
+
+def read_tombstones(file_path: Union[str, Path]) -> Set[str]:
+    """Ключи вакансий, удалённых из JSON-файла JSONSaver, по его журналу надгробий."""
+    file_path = Path(file_path)
+    try:
+        with open(file_path.with_name(file_path.name + TOMBSTONE_SUFFIX), encoding="utf-8") as file:
+            if file.readline().rstrip("\n") != _tombstone_header(file_path):
+                return set()
+            return {line.rstrip("\n") for line in file if line.strip()}
+    except FileNotFoundError:
+        return set()
+    except OSError as e:
+        print(f"Ошибка при чтении журнала удалений: {e}")
+        return set()
 
 
 class JSONSaver(BaseClass):
     """Класс, который реализовывает методы для добавления вакансий в файл,
-    получения данных из файла по указанным критериям и удаления информации о вакансиях. """
-    def __init__(self, file_path: str = "data/vacancies.json") -> None:
+    получения данных из файла по указанным критериям и удаления информации о вакансиях.
+    Разобранные данные хранятся в памяти и перечитываются, только если файл
+    изменился (по времени изменения и размеру). С cache=False чтение, поиск и удаление
+    обрабатывают файл потоково, не загружая его целиком. Если передан text_index,
+    он обновляется при добавлении и удалении вакансий и используется методом search().
+    Пути с расширением .gz, .zst или .lz4 сжимаются и распаковываются на лету;
+    compact=True записывает JSON без отступов и пробелов.
+    Удаление не переписывает файл, а дописывает ключи вакансий в журнал надгробий
+    (<файл>.tombstones), который применяется при чтении. Когда доля удалённых записей
+    превышает compact_ratio (и записей не меньше compact_min_records), файл сжимается."""
+    def __init__(self, file_path: str = "data/vacancies.json", cache: bool = True,
+                 text_index: Optional[InvertedIndex] = None, compact: bool = False,
+                 compact_ratio: float = 0.5, compact_min_records: int = 1000) -> None:
         self.__file_path = Path(file_path)
+        self.__tombstone_path = self.__file_path.with_name(self.__file_path.name + TOMBSTONE_SUFFIX)
+        self.__compact_ratio = compact_ratio
+        self.__compact_min_records = compact_min_records
+        self.__format: Dict[str, Any] = {"indent": None, "separators": (",", ":")} if compact else {"indent": 4}
+        self.__use_cache = cache
+        self.__text_index = text_index
+        self.__cache: Optional[List[Dict]] = None
+        self.__index: Optional[Dict[str, int]] = None
+        self.__signature: Optional[Tuple[int, ...]] = None
+        self.__memory_index: Optional[MemoryIndex] = None
+        # Число ключей в журнале надгробий; действительно, пока файлы соответствуют self.__signature
+        self.__dead: Optional[int] = None
+        self.__batch_depth = 0
+        self.__dirty = False
+        self.__lock = FileLock(self.__file_path)
         if not self.__file_path.exists():
             self.save_data([])
 
+    @property
+    def file_path(self) -> Path:
+        """Путь к файлу с вакансиями."""
+        return self.__file_path
+
+    @staticmethod
+    def __file_stat(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __stat(self) -> Optional[Tuple[int, ...]]:
+        """Подпись файла для проверки актуальности кэша: время изменения и размер файла
+        и журнала надгробий."""
+        signature = self.__file_stat(self.__file_path)
+        if signature is None:
+            return None
+        return signature + (self.__file_stat(self.__tombstone_path) or (0, 0))
+
+    def __tombstone_header(self) -> str:
+        return _tombstone_header(self.__file_path)
+
+    def __read_tombstones(self) -> Set[str]:
+        """Ключи удалённых вакансий из журнала надгробий."""
+        return read_tombstones(self.__file_path)
+
+    def __write_tombstones(self, keys: Iterable[str]) -> None:
+        """Дописывание ключей в журнал надгробий с fsync; устаревший журнал начинается заново."""
+        header = self.__tombstone_header()
+        try:
+            with open(self.__tombstone_path, encoding="utf-8") as file:
+                fresh = file.readline().rstrip("\n") != header
+        except FileNotFoundError:
+            fresh = True
+        with open(self.__tombstone_path, "w" if fresh else "a", encoding="utf-8") as file:
+            if fresh:
+                file.write(header + "\n")
+            file.writelines(key + "\n" for key in keys)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def __set_cache(self, data: Optional[List[Dict]]) -> None:
+        self.__cache = data
+        self.__index = None
+        self.__memory_index = None
+
     def save_data(self, data: List[Dict]) -> None:
-        """Метод для сохранения данных в JSON-файл."""
+        """Метод для сохранения данных в JSON-файл. Внутри batch() запись откладывается."""
+        if self.__text_index is not None:
+            self.__text_index.rebuild((vacancy_key(item), item.get("requirement")) for item in data)
+        self.__set_cache([dict(item) for item in data])
+        self.__commit()
+
+    def __commit(self) -> None:
+        """Запись закэшированных данных в файл или отметка об отложенной записи внутри batch()."""
+        self.__memory_index = None
+        if self.__batch_depth:
+            self.__dirty = True
+            return
+        self.__dirty = False
         try:
-            with open(self.__file_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=4)
+            with self.__lock.exclusive():
+                with atomic_write(self.__file_path) as file:
+                    json.dump(self.__cache, file, ensure_ascii=False, **self.__format)
+                self.__tombstone_path.unlink(missing_ok=True)
+                self.__signature = self.__stat()
+                self.__dead = 0
+            if not self.__use_cache:
+                self.__set_cache(None)
         except Exception as e:
+            self.__set_cache(None)
+            self.__save_index(False)
             print(f"Ошибка при сохранении данных в файл: {e}")
+            return
+        self.__save_index(True)
 
-    def load_data(self) -> List[Dict]:
-        """Метод для загрузки данных из JSON-файла."""
+    @staticmethod
+    def __index_signature(signature: Optional[Tuple[int, ...]]) -> List[int]:
+        """Подпись текстового индекса: версия формата ключей и подпись файла."""
+        return [KEY_FORMAT, *(signature or ())]
+
+    def __save_index(self, synced: bool) -> None:
+        """Сохранение текстового индекса с подписью файла, которой он соответствует.
+        Если запись файла не удалась, индекс помечается устаревшим и будет перестроен."""
+        if self.__text_index is None:
+            return
+        self.__text_index.signature = self.__index_signature(self.__signature) if synced else None
+        self.__text_index.save()
+
+    @contextmanager
+    def batch(self) -> Iterator["JSONSaver"]:
+        """Контекст, объединяющий несколько изменений в одну запись файла.
+        На время контекста файл блокируется для других писателей.
+        При исключении внутри контекста изменения отбрасываются."""
+        with self.__lock.exclusive():
+            self.__data()
+            self.__batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.__batch_depth -= 1
+                if not self.__batch_depth:
+                    self.__dirty = False
+                    self.__set_cache(None)
+                    self.__save_index(False)
+                raise
+            self.__batch_depth -= 1
+            if not self.__batch_depth and self.__dirty:
+                self.__commit()
+
+    def __data(self) -> List[Dict]:
+        """Закэшированные данные; файл перечитывается, только если он изменился."""
+        if self.__cache is not None and (self.__batch_depth or self.__signature == self.__stat()):
+            return self.__cache
+        with self.__lock.shared():
+            signature = self.__stat()
+            data = self.__read()
+        self.__set_cache(data)
+        self.__signature = signature
+        return data
+
+    def __read(self) -> List[Dict]:
         try:
-            with open(self.__file_path, "r", encoding="utf-8") as file:
+            with open_text(self.__file_path) as file:
                 content = file.read().strip()
                 data = json.loads(content) if content else []
-                return data
         except FileNotFoundError:
             return []
         except Exception as e:
             print(f"Ошибка при чтении файла: {e}")
             return []
+        dead = self.__read_tombstones()
+        self.__dead = len(dead)
+        if dead:
+            data = [item for item in data if vacancy_key(item) not in dead]
+        return data
+
+    def __key_index(self) -> Dict[str, int]:
+        """Индекс ключ вакансии -> позиция в закэшированных данных."""
+        data = self.__data()
+        if self.__index is None:
+            self.__index = {vacancy_key(item): position for position, item in enumerate(data)}
+        return self.__index
+
+    def load_data(self) -> List[Dict]:
+        """Метод для загрузки данных из JSON-файла. Возвращаются копии записей: их изменение не затрагивает кэш."""
+        if self.__streaming():
+            return list(self.iter_data())
+        return [dict(item) for item in self.__data()]
+
+    def __streaming(self) -> bool:
+        """Работа с файлом идёт потоково: кэш выключен и нет незаписанных изменений batch()."""
+        return not self.__use_cache and not self.__batch_depth
+
+    def iter_data(self) -> Iterator[Dict]:
+        """Генератор записей: копии записей из кэша или, если кэш выключен, потоковым разбором файла
+        по одной записи с постоянным расходом памяти."""
+        if not self.__streaming():
+            for item in self.__data():
+                yield dict(item)
+            return
+        with self.__lock.shared():
+            dead = self.__read_tombstones()
+            try:
+                with open_text(self.__file_path) as file:
+                    for item in iter_json_array(file):
+                        if not dead or vacancy_key(item) not in dead:
+                            yield item
+            except FileNotFoundError:
+                return
+            except ValueError as e:
+                print(f"Ошибка при чтении файла: {e}")
 
-    def add_vacancy(self, vacancies: Union[Vacancy, List[Vacancy]]) -> None:
-        """Метод для добавления вакансий в JSON-файл."""
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий в JSON-файл.
+        Совпадение определяется по ключу вакансии (id с hh.ru или хэш содержимого),
+        on_conflict задаёт поведение при совпадении: "skip", "replace" или "merge"."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
         if isinstance(vacancies, Vacancy):
             vacancies = [vacancies]
 
-        data = self.load_data()
-        for vacancy in vacancies:
-            vacancy_dict = vacancy.to_dict()
-            if vacancy_dict not in data:
-                data.append(vacancy_dict)
-        self.save_data(data)
+        with self.__lock.exclusive():
+            index = self.__key_index()
+            data = self.__data()
+            try:
+                for vacancy in vacancies:
+                    vacancy_dict = vacancy.to_dict()
+                    key = vacancy_key(vacancy_dict)
+                    position = index.get(key)
+                    if position is None:
+                        position = index[key] = len(data)
+                        data.append(vacancy_dict)
+                    elif on_conflict == "replace":
+                        data[position] = vacancy_dict
+                    elif on_conflict == "merge":
+                        data[position] = {**data[position], **{k: v for k, v in vacancy_dict.items() if v is not None}}
+                    else:
+                        continue
+                    if self.__text_index is not None:
+                        self.__text_index.add(key, data[position].get("requirement"))
+            except BaseException:
+                self.__set_cache(None)
+                self.__save_index(False)
+                raise
+            self.__commit()
 
-    def get_vacancy(self, criteria: Union[Dict, Vacancy]) -> list:
-        """Метод для получения данных из файла по заданным критериям."""
+    def upsert_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]]) -> None:
+        """Метод для добавления вакансий с заменой уже сохранённых записей с тем же id вакансии."""
+        self.add_vacancy(vacancies, on_conflict="replace")
+
+    def get_vacancy(self, criteria: Union[Dict, Vacancy, Query, Predicate]) -> list:
+        """Метод для получения данных из файла по заданным критериям.
+        Вместо словаря можно передать запрос Query или условие (см. src.query)."""
+        if isinstance(criteria, (Query, Predicate)):
+            return self.query(criteria)
         if isinstance(criteria, Vacancy):
             criteria = criteria.to_dict()
 
-        data = self.load_data()
-        result = []
-        for item in data:
-            if all(item.get(key) == value for key, value in criteria.items()):
-                result.append(item)
-        return result
+        return [item for item in self.iter_data() if matches_criteria(item, criteria)]
 
     def delete_vacancy(self, criteria: Union[Dict, Vacancy]) -> None:
-        """Метод для удаления вакансии."""
+        """Метод для удаления вакансии: ключи найденных записей дописываются в журнал надгробий,
+        файл переписывается только при сжатии. Внутри batch() удаление входит в общую запись файла.
+        Текстовый индекс обновляется в памяти и сохраняется при следующей записи файла."""
         if isinstance(criteria, Vacancy):
             criteria = criteria.to_dict()
 
-        data = self.load_data()
-        data = [item for item in data if not all(item.get(key) == value for key, value in criteria.items())]
-        self.save_data(data)
+        with self.__lock.exclusive():
+            if self.__batch_depth:
+                self.__set_cache([item for item in self.__data()
+                                  if not matches_criteria(item, criteria)
+                                  or self.__unindex(item)])
+                self.__commit()
+                return
+            positions: List[int] = []
+            deleted: Dict[str, None] = {}
+            if self.__streaming():
+                live = 0
+                for item in self.iter_data():
+                    if matches_criteria(item, criteria):
+                        deleted[vacancy_key(item)] = None
+                        self.__unindex(item)
+                    else:
+                        live += 1
+            else:
+                data = self.__data()
+                positions = self.__find(criteria)
+                for position in positions:
+                    deleted[vacancy_key(data[position])] = None
+                    self.__unindex(data[position])
+                live = len(data) - len(positions)
+            if not deleted:
+                return
+            dead = self.__dead_count()
+            try:
+                self.__write_tombstones(deleted)
+            except OSError as e:
+                self.__set_cache(None)
+                self.__save_index(False)
+                print(f"Ошибка при сохранении данных в файл: {e}")
+                return
+            if positions:
+                self.__remove(positions)
+            self.__signature = self.__stat()
+            self.__dead = dead + len(deleted)
+            if self.__text_index is not None:
+                self.__text_index.signature = self.__index_signature(self.__signature)
+            if self.__dead / (self.__dead + live) > self.__compact_ratio and \
+                    self.__dead + live >= self.__compact_min_records:
+                self.compact()
+
+    def __find(self, criteria: Dict) -> List[int]:
+        """Позиции закэшированных записей, совпавших с критериями, без копирования записей.
+        Если критерии задают ключ вакансии (id с hh.ru или все поля содержимого без id),
+        запись находится по индексу ключей."""
+        data = self.__data()
+        candidates: Iterable[int] = range(len(data))
+        if criteria.get("vacancy_id"):
+            key: Optional[str] = f"id:{criteria['vacancy_id']}"
+        elif "vacancy_id" in criteria and all(field in criteria for field in IDENTITY_FIELDS):
+            key = vacancy_key(criteria)
+        else:
+            key = None
+        index = self.__key_index()
+        # при повторяющихся ключах в файле индекс указывает только на одну из записей
+        if key is not None and len(index) == len(data):
+            candidates = [index[key]] if key in index else []
+        return [position for position in candidates if matches_criteria(data[position], criteria)]
+
+    def __remove(self, positions: List[int]) -> None:
+        """Удаление записей из кэша по позициям со сдвигом позиций в индексе ключей."""
+        data = self.__cache or []
+        removed = sorted(positions)
+        for position in reversed(removed):
+            del data[position]
+        if self.__index is not None:
+            dropped = set(removed)
+            self.__index = {key: position - bisect_left(removed, position)
+                            for key, position in self.__index.items() if position not in dropped}
+        self.__memory_index = None
+
+    def __dead_count(self) -> int:
+        """Число удалённых записей в журнале надгробий: ведётся при удалении,
+        журнал перечитывается, только если файлы изменены извне."""
+        if self.__dead is None or self.__signature != self.__stat():
+            self.__dead = len(self.__read_tombstones())
+            self.__signature = self.__stat() if self.__cache is None else self.__signature
+        return self.__dead
+
+    def dead_ratio(self) -> float:
+        """Доля удалённых, но ещё не вычищенных из файла записей."""
+        with self.__lock.shared():
+            live = sum(1 for _ in self.iter_data()) if self.__streaming() else len(self.__data())
+            dead = self.__dead_count()
+            return dead / (dead + live) if dead else 0.0
+
+    def compact(self) -> None:
+        """Метод сжатия: переписывает файл без удалённых записей и очищает журнал надгробий."""
+        with self.__lock.exclusive():
+            if not self.__streaming():
+                self.__set_cache(list(self.__data()))
+                self.__commit()
+                return
+            try:
+                with atomic_write(self.__file_path) as file:
+                    write_json_array(file, self.iter_data(), **self.__format)
+                self.__tombstone_path.unlink(missing_ok=True)
+                self.__signature = self.__stat()
+                self.__dead = 0
+            except Exception as e:
+                self.__save_index(False)
+                print(f"Ошибка при сохранении данных в файл: {e}")
+                return
+            self.__save_index(True)
+
+    def top_by_salary(self, n: int, rates: Optional[Mapping[str, float]] = None) -> List[Dict]:
+        """Метод получения N вакансий с наибольшей зарплатой без полной сортировки файла.
+        Зарплаты в разных валютах сравниваются в рублях по курсам rates (по умолчанию DEFAULT_RATES)."""
+        return top_by_salary(self.iter_data(), n, rates)
+
+    def __unindex(self, item: Dict) -> bool:
+        """Удаление записи из текстового индекса. Всегда возвращает False для использования в фильтрах."""
+        if self.__text_index is not None:
+            self.__text_index.remove(vacancy_key(item))
+        return False
+
+    def __fresh_text_index(self) -> InvertedIndex:
+        """Текстовый индекс, перестроенный, если он не соответствует текущему файлу."""
+        if self.__text_index is None:
+            raise ValueError("Для поиска нужен текстовый индекс (параметр text_index)")
+        current = self.__stat()
+        if not self.__batch_depth and self.__text_index.signature != self.__index_signature(current):
+            self.__text_index.rebuild((vacancy_key(item), item.get("requirement")) for item in self.iter_data())
+            self.__text_index.signature = self.__index_signature(current)
+            self.__text_index.save()
+        return self.__text_index
+
+    def __text_positions(self, query: str, mode: str) -> Set[int]:
+        """Позиции записей, найденных текстовым индексом (для планировщика запросов)."""
+        index = self.__key_index()
+        return {index[key] for key, _ in self.__fresh_text_index().search(query, mode) if key in index}
+
+    def query(self, query: Union[Query, Predicate, Dict]) -> List[Dict]:
+        """Метод выполнения запроса (src.query). С кэшем условия по городу, формату работы, id и ссылке
+        используют хэш-индексы, диапазоны зарплат — отсортированные индексы, полнотекстовые условия
+        по требованиям — текстовый индекс; без кэша запрос выполняется одним потоковым проходом."""
+        query = Query.coerce(query)
+        with self.__lock.shared():
+            if self.__streaming():
+                return query.finish(item for item in self.iter_data() if query.matches(item))
+            data = self.__data()
+            if self.__memory_index is None:
+                text_search = self.__text_positions if self.__text_index is not None else None
+                self.__memory_index = MemoryIndex(data, text_search)
+            return [dict(item) for item in self.__memory_index.run(query)]
+
+    def search(self, query: str, mode: str = "and", limit: Optional[int] = None) -> List[Dict]:
+        """Метод полнотекстового поиска по требованиям вакансий с ранжированием результатов.
+        mode="and" — все слова запроса, "or" — хотя бы одно."""
+        with self.__lock.shared():
+            ranked = self.__fresh_text_index().search(query, mode, limit)
+            if not ranked:
+                return []
+            if self.__streaming():
+                order = {key: position for position, (key, _) in enumerate(ranked)}
+                found = [(order[key], item) for item in self.iter_data() if (key := vacancy_key(item)) in order]
+                return [item for _, item in sorted(found, key=lambda pair: pair[0])]
+            index = self.__key_index()
+            data = self.__data()
+            return [dict(data[index[key]]) for key, _ in ranked if key in index]
@@ -0,0 +1,90 @@
+import json
+from typing import IO, Any, Iterable, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(file: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Потоковый разбор JSON-массива верхнего уровня: элементы выдаются по одному,
+    в памяти держится только текущий фрагмент файла. Пустой файл считается пустым массивом."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def next_char() -> Optional[str]:
+        """Первый непробельный символ начиная с текущей позиции (без его поглощения)."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not read_more():
+                return None
+
+    first = next_char()
+    if first is None:
+        return
+    if first != "[":
+        raise ValueError("Ожидался JSON-массив")
+    position += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        if next_char() is None:
+            raise ValueError("Неожиданный конец файла")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if read_more():
+                    continue
+                raise
+            if end < len(buffer) or eof or not read_more():
+                break
+        position = end
+        yield item
+        separator = next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Ожидалась запятая или конец массива")
+        position += 1
+
+
+def write_json_array(file: IO[str], items: Iterable[Any], indent: Optional[int] = 4,
+                     separators: Optional[Tuple[str, str]] = None) -> int:
+    """Потоковая запись JSON-массива в том же виде, что и json.dump(..., ensure_ascii=False)
+    с теми же indent и separators. Возвращает количество записанных элементов."""
+    count = 0
+    pad = " " * indent if indent is not None else ""
+    item_separator = separators[0] if separators else ", "
+    for item in items:
+        text = json.dumps(item, ensure_ascii=False, indent=indent, separators=separators)
+        if indent is not None:
+            text = pad + text.replace("\n", "\n" + pad)
+            file.write("[\n" if not count else ",\n")
+        else:
+            file.write("[" if not count else item_separator)
+        file.write(text)
+        count += 1
+    if not count:
+        file.write("[]")
+    else:
+        file.write("\n]" if indent is not None else "]")
+    return count
@@ -0,0 +1,168 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.base_json import BaseClass
+from src.compression import open_text
+from src.json_saver import CONFLICT_MODES, matches_criteria
+from src.query import Predicate, Query
+from src.safe_io import atomic_write
+from src.vacancies_hh import Vacancy, vacancy_key
+
+# Служебное поле записи-надгробия, помечающей вакансию с данным ключом удалённой
+TOMBSTONE = "_deleted"
+
+
+class JSONLinesSaver(BaseClass):
+    """Хранилище вакансий в формате JSON Lines: добавление дописывает строки в конец файла,
+    удаление дописывает записи-надгробия, а сжатие переписывает файл только с живыми записями.
+    Пути с расширением .gz, .zst или .lz4 сжимаются на лету (дописывание создаёт новый сжатый блок)."""
+
+    def __init__(self, file_path: str = "data/vacancies.jsonl", compact_ratio: float = 0.5,
+                 compact_min_lines: int = 1000) -> None:
+        self.__file_path = Path(file_path)
+        self.__compact_ratio = compact_ratio
+        self.__compact_min_lines = compact_min_lines
+        self.__live_keys: Optional[Dict[str, None]] = None
+        self.__total_lines = 0
+        if not self.__file_path.exists():
+            self.__file_path.touch()
+
+    @property
+    def file_path(self) -> Path:
+        """Путь к файлу с вакансиями."""
+        return self.__file_path
+
+    def __iter_lines(self) -> Iterator[Dict[str, Any]]:
+        try:
+            with open_text(self.__file_path) as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def __load_index(self) -> Dict[str, None]:
+        """Набор ключей живых записей; строится одним проходом при первом изменении."""
+        if self.__live_keys is None:
+            live: Dict[str, None] = {}
+            total = 0
+            for record in self.__iter_lines():
+                total += 1
+                if TOMBSTONE in record:
+                    live.pop(record[TOMBSTONE], None)
+                else:
+                    live[vacancy_key(record)] = None
+            self.__live_keys = live
+            self.__total_lines = total
+        return self.__live_keys
+
+    def iter_data(self) -> Iterator[Dict[str, Any]]:
+        """Генератор живых записей. Читает файл двумя проходами и держит в памяти только
+        позиции надгробий, а не сами записи."""
+        deleted_at: Dict[str, int] = {}
+        for number, record in enumerate(self.__iter_lines()):
+            if TOMBSTONE in record:
+                deleted_at[record[TOMBSTONE]] = number
+        for number, record in enumerate(self.__iter_lines()):
+            if TOMBSTONE not in record and deleted_at.get(vacancy_key(record), -1) < number:
+                yield record
+
+    def load_data(self) -> List[Dict]:
+        """Метод для загрузки всех живых записей."""
+        return list(self.iter_data())
+
+    def __append(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        with open_text(self.__file_path, "a") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write("\n")
+        self.__total_lines += len(records)
+
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий дописыванием в конец файла."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
+        if isinstance(vacancies, Vacancy):
+            vacancies = [vacancies]
+
+        live = self.__load_index()
+        pending: Dict[str, Dict[str, Any]] = {}
+        conflicts: List[Tuple[str, Dict[str, Any]]] = []
+        for vacancy in vacancies:
+            vacancy_dict = vacancy.to_dict()
+            key = vacancy_key(vacancy_dict)
+            if key in live:
+                if on_conflict != "skip":
+                    conflicts.append((key, vacancy_dict))
+            elif key in pending:
+                if on_conflict == "replace":
+                    pending[key] = vacancy_dict
+                elif on_conflict == "merge":
+                    pending[key] = self.__merge(pending[key], vacancy_dict)
+            else:
+                pending[key] = vacancy_dict
+
+        records: List[Dict[str, Any]] = []
+        if conflicts:
+            current = self.__find(dict(conflicts)) if on_conflict == "merge" else {}
+            for key, vacancy_dict in conflicts:
+                if key in current:
+                    vacancy_dict = current[key] = self.__merge(current[key], vacancy_dict)
+                records.append({TOMBSTONE: key})
+                records.append(vacancy_dict)
+        records.extend(pending.values())
+        self.__append(records)
+        live.update(dict.fromkeys(pending))
+
+    @staticmethod
+    def __merge(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        return {**old, **{key: value for key, value in new.items() if value is not None}}
+
+    def __find(self, keys: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        return {key: record for record in self.iter_data() if (key := vacancy_key(record)) in keys}
+
+    def get_vacancy(self, criteria: Union[Dict, Vacancy, Query, Predicate]) -> list:
+        """Метод для получения данных из файла по заданным критериям.
+        Вместо словаря можно передать запрос Query или условие (см. src.query)."""
+        if isinstance(criteria, (Query, Predicate)):
+            return self.query(criteria)
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        return [item for item in self.iter_data() if matches_criteria(item, criteria)]
+
+    def query(self, query: Union[Query, Predicate, Dict]) -> List[Dict[str, Any]]:
+        """Метод выполнения запроса (src.query) одним потоковым проходом по файлу."""
+        query = Query.coerce(query)
+        return query.finish(item for item in self.iter_data() if query.matches(item))
+
+    def delete_vacancy(self, criteria: Union[Dict, Vacancy]) -> None:
+        """Метод для удаления вакансий: дописывает надгробия для найденных записей."""
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        live = self.__load_index()
+        keys = dict.fromkeys(vacancy_key(item) for item in self.get_vacancy(criteria))
+        self.__append([{TOMBSTONE: key} for key in keys])
+        for key in keys:
+            live.pop(key, None)
+        if self.dead_ratio() > self.__compact_ratio and self.__total_lines >= self.__compact_min_lines:
+            self.compact()
+
+    def dead_ratio(self) -> float:
+        """Доля строк файла, не относящихся к живым записям."""
+        live = self.__load_index()
+        if not self.__total_lines:
+            return 0.0
+        return 1 - len(live) / self.__total_lines
+
+    def compact(self) -> None:
+        """Метод сжатия: переписывает файл, оставляя только живые записи."""
+        count = 0
+        with atomic_write(self.__file_path) as file:
+            for record in self.iter_data():
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+        self.__total_lines = count
@@ -1,68 +1,558 @@
-from typing import Dict, List, Union
+import math
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 import pandas as pd
+from openpyxl import Workbook, load_workbook  # type: ignore[import-untyped]
 from pandas.errors import EmptyDataError
 
 from src.base_json import BaseClass
-from src.vacancies_hh import Vacancy
+from src.json_saver import CONFLICT_MODES
+from src.query import OPERATORS, SALARY_FIELDS, And, Between, Compare, In, Not, Or, Predicate, Query
+from src.safe_io import FileLock, atomic_path
+from src.salary import parse_salary
+from src.vacancies_hh import Vacancy, vacancy_key
+
+try:
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.dataset as ds  # type: ignore[import-untyped]
+    import pyarrow.parquet as pq  # type: ignore[import-untyped]
+except ImportError:
+    pa = ds = pq = None
+
+COLUMNS = list(Vacancy.__slots__)
+
+
+def clean_record(record: Dict[Any, Any]) -> Dict[str, Any]:
+    """Запись, прочитанная из таблицы: пустые ячейки (NaN) -> None, целые числа с плавающей точкой -> int."""
+    cleaned = {}
+    for key, value in record.items():
+        if isinstance(value, float):
+            if math.isnan(value):
+                value = None
+            elif value.is_integer():
+                value = int(value)
+        cleaned[key] = value
+    return cleaned
 
 
 class ExcelFile(BaseClass):
     """Класс, который обязывает реализовать методы для добавления вакансий в файл,
-    получения данных из файла по указанным критериям и удаления информации о вакансиях."""
+    получения данных из файла по указанным критериям и удаления информации о вакансиях.
+    Каждое изменение вне batch() перезаписывает книгу целиком; внутри batch() изменения
+    копятся в памяти и записываются один раз при выходе из контекста."""
 
     def __init__(self, filename: str = "vacancies.xlsx") -> None:
         self.__filename: str = filename
+        self.__lock = FileLock(filename)
+        self.__cache: Optional[pd.DataFrame] = None
+        self.__cache_signature: Optional[Tuple[int, int]] = None
+        self.__pending: Optional[List[Dict[str, Any]]] = None
+        self.__positions: Optional[Dict[str, int]] = None
+        self.__batch_depth = 0
+        self.__dirty = False
+
+    def __stat(self) -> Optional[Tuple[int, int]]:
+        """Подпись файла (время изменения, размер) для проверки актуальности кэша."""
+        try:
+            stat = os.stat(self.__filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __frame(self) -> pd.DataFrame:
+        """Таблица из файла. Разобранная таблица кэшируется до изменения файла."""
+        signature = self.__stat()
+        if self.__cache is not None and signature is not None and signature == self.__cache_signature:
+            return self.__cache
+        df = pd.read_excel(self.__filename, sheet_name=0)
+        self.__cache, self.__cache_signature = df, signature
+        return df
 
-    def add_vacancy(self, vacancies: Union[Vacancy, List[Vacancy]]) -> None:
-        """Метод для добавления вакансий в файл."""
+    def __write(self, df: pd.DataFrame) -> None:
+        """Атомарная запись таблицы: через временный файл и переименование."""
+        self.__cache = self.__cache_signature = None
+        with atomic_path(self.__filename) as tmp_path:
+            df.to_excel(tmp_path, index=False)
+
+    def __records(self) -> List[Dict[str, Any]]:
+        """Строки таблицы: буфер batch() или строки файла."""
+        if self.__pending is not None:
+            return self.__pending
+        try:
+            df = self.__frame()
+        except (FileNotFoundError, EmptyDataError):
+            return []
+        return [clean_record(record) for record in df.to_dict('records')]
+
+    def __table(self) -> pd.DataFrame:
+        """Таблица для поиска и удаления: буфер batch() или таблица из файла."""
+        if self.__pending is not None:
+            return pd.DataFrame(self.__pending)
+        return self.__frame()
+
+    @contextmanager
+    def batch(self) -> Iterator["ExcelFile"]:
+        """Контекст, объединяющий несколько добавлений и удалений в одну запись файла.
+        На время контекста файл блокируется для других писателей.
+        При исключении внутри контекста изменения отбрасываются."""
+        with self.__lock.exclusive():
+            if not self.__batch_depth:
+                self.__pending = self.__records()
+                self.__positions = None
+            self.__batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.__batch_depth -= 1
+                if not self.__batch_depth:
+                    self.__pending = self.__positions = None
+                    self.__dirty = False
+                raise
+            self.__batch_depth -= 1
+            if not self.__batch_depth:
+                records, self.__pending, self.__positions = self.__pending, None, None
+                if self.__dirty:
+                    self.__dirty = False
+                    self.__write(pd.DataFrame(records))
+
+    @staticmethod
+    def __mask(df: pd.DataFrame, criteria: Union[Dict, Vacancy]) -> pd.Series:
+        """Одна общая булева маска строк, у которых все поля равны критериям (None — пустая ячейка)."""
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        mask = pd.Series(True, index=df.index)
+        for key, value in criteria.items():
+            if key not in df.columns:
+                if value is None:
+                    continue
+                return pd.Series(False, index=df.index)
+            mask &= df[key].isna() if value is None else df[key] == value
+        return mask
+
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий в файл.
+        on_conflict задаёт поведение при совпадении ключа вакансии: "skip", "replace" или "merge"."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
         try:
             if isinstance(vacancies, Vacancy):
                 vacancies = [vacancies]
 
-            try:
-                df = pd.read_excel(self.__filename, sheet_name=0)
-            except FileNotFoundError:
-                df = pd.DataFrame()
-            except EmptyDataError:
-                df = pd.DataFrame()
-
-            new_data = []
-            for vacancy in vacancies:
-                vacancy_dict = vacancy.to_dict()
-                if not df.equals(pd.DataFrame([vacancy_dict])):
-                    new_data.append(vacancy_dict)
-            if new_data:
-                new_df = pd.DataFrame(new_data)
-                df = pd.concat([df, new_df], ignore_index=True)
-                df.to_excel(self.__filename, index=False)
+            with self.__lock.exclusive():
+                records = self.__records()
+                positions = self.__positions
+                if positions is None:
+                    positions = {vacancy_key(record): position for position, record in enumerate(records)}
+                    if self.__batch_depth:
+                        self.__positions = positions
+                changed = False
+                for vacancy in vacancies:
+                    vacancy_dict = vacancy.to_dict()
+                    key = vacancy_key(vacancy_dict)
+                    position = positions.get(key)
+                    if position is None:
+                        positions[key] = len(records)
+                        records.append(vacancy_dict)
+                    elif on_conflict == "replace":
+                        records[position] = vacancy_dict
+                    elif on_conflict == "merge":
+                        records[position] = {**records[position],
+                                             **{k: v for k, v in vacancy_dict.items() if v is not None}}
+                    else:
+                        continue
+                    changed = True
+                if changed and self.__batch_depth:
+                    self.__dirty = True
+                elif changed:
+                    self.__write(pd.DataFrame(records))
         except Exception as e:
             print(f"Произошла ошибка: {str(e)}")
             raise
 
-    def get_vacancy(self, criteria: Union[Dict, Vacancy]) -> list:
-        """Метод для получения данных из файла по заданным критериям."""
+    def get_vacancy(self, criteria: Union[Dict, Vacancy, Query, Predicate],
+                    columns: Optional[List[str]] = None) -> list:
+        """Метод для получения данных из файла по заданным критериям.
+        Вместо словаря можно передать запрос Query или условие (см. src.query).
+        columns — список колонок, которые нужно вернуть (по умолчанию все)."""
+        if isinstance(criteria, (Query, Predicate)):
+            return self.query(criteria, columns)
+        try:
+            with self.__lock.shared():
+                df = self.__table()
+        except FileNotFoundError:
+            return []
+        if criteria:
+            df = df[self.__mask(df, criteria)]
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return [clean_record(record) for record in df.to_dict('records')]
+
+    def query(self, query: Union[Query, Predicate, Dict], columns: Optional[List[str]] = None) -> list:
+        """Метод выполнения запроса (src.query): условие переводится в одну булеву маску по закэшированной таблице."""
+        query = Query.coerce(query)
         try:
-            df = pd.read_excel(self.__filename, sheet_name=0)
-            return df.to_dict('records')
+            with self.__lock.shared():
+                df = self.__table()
         except FileNotFoundError:
             return []
+        if query.predicate is not None:
+            df = df[query.predicate.mask(df)]
+        if query.sort_field is not None and query.sort_field in df.columns:
+            df = df.sort_values(query.sort_field, ascending=not query.descending, na_position="last", kind="stable",
+                                key=lambda column: pd.to_numeric(column, errors="coerce")
+                                if column.name in SALARY_FIELDS else column)
+        if query.limit_count is not None:
+            df = df.head(query.limit_count)
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return [clean_record(record) for record in df.to_dict('records')]
 
     def delete_vacancy(self, criteria: Union[Dict, Vacancy]) -> None:
         """Метод для удаления вакансии."""
-        if isinstance(criteria, Vacancy):
-            criteria = criteria.to_dict()
+        if not criteria:
+            return
         try:
-            df = pd.read_excel(self.__filename, sheet_name=0)
-            filtered_df = df
-            for key, value in criteria.items():
-                filtered_df = filtered_df[filtered_df[key] != value]
-
-            filtered_df.to_excel(self.__filename, index=False)
+            with self.__lock.exclusive():
+                df = self.__table()
+                mask = self.__mask(df, criteria)
+                if not mask.any():
+                    return
+                if self.__pending is not None:
+                    self.__pending = [record for record, drop in zip(self.__pending, mask) if not drop]
+                    self.__positions = None
+                    self.__dirty = True
+                else:
+                    self.__write(df[~mask])
         except FileNotFoundError:
             print(f"Файл {self.__filename} не найден.")
 
 
+class ExcelExporter:
+    """Буферизованная выгрузка вакансий в Excel: вакансии копятся в памяти без дублей
+    (по ключу вакансии) и записываются одним проходом в потоковом режиме openpyxl (write_only)
+    при flush() или close(). Строки, уже записанные в файл, загружаются в буфер при первом
+    обращении к нему, поэтому запись их не теряет."""
+
+    def __init__(self, filename: str = "vacancies.xlsx", on_conflict: str = "skip") -> None:
+        if on_conflict not in ("skip", "replace"):
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
+        self.__filename = filename
+        self.__lock = FileLock(filename)
+        self.__on_conflict = on_conflict
+        self.__rows: Optional[Dict[str, Dict[str, Any]]] = None
+        self.__dirty = False
+
+    def __buffer(self) -> Dict[str, Dict[str, Any]]:
+        """Буфер строк; при первом обращении в него читаются строки существующего файла (read_only)."""
+        if self.__rows is None:
+            self.__rows = {}
+            if os.path.exists(self.__filename):
+                with self.__lock.shared():
+                    workbook = load_workbook(self.__filename, read_only=True)
+                    try:
+                        rows = workbook.worksheets[0].iter_rows(values_only=True)
+                        header = next(rows, ())
+                        for values in rows:
+                            row = dict(zip(header, values))
+                            self.__rows[vacancy_key(row)] = row
+                    finally:
+                        workbook.close()
+        return self.__rows
+
+    def __len__(self) -> int:
+        return len(self.__buffer())
+
+    def __enter__(self) -> "ExcelExporter":
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if exc_type is None:
+            self.close()
+
+    def add_vacancy(self, vacancies: Union[Vacancy, Dict[str, Any], Iterable[Union[Vacancy, Dict[str, Any]]]]) -> None:
+        """Метод для добавления вакансий (объектов или словарей) в буфер."""
+        if isinstance(vacancies, (Vacancy, dict)):
+            vacancies = [vacancies]
+        buffer = self.__buffer()
+        for vacancy in vacancies:
+            row = vacancy.to_dict() if isinstance(vacancy, Vacancy) else vacancy
+            key = vacancy_key(row)
+            if key in buffer and self.__on_conflict == "skip":
+                continue
+            buffer[key] = row
+            self.__dirty = True
+
+    def flush(self) -> None:
+        """Запись буфера в файл, если с прошлой записи он изменился."""
+        if not self.__dirty:
+            return
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(COLUMNS)
+        for row in self.__buffer().values():
+            sheet.append([row.get(column) for column in COLUMNS])
+        with self.__lock.exclusive(), atomic_path(self.__filename) as tmp_path:
+            workbook.save(tmp_path)
+        self.__dirty = False
+
+    def close(self) -> None:
+        """Запись буфера и его очистка."""
+        self.flush()
+        self.__rows = None
+
+
+class ParquetSaver(BaseClass):
+    """Хранилище вакансий в Parquet, разбитое на разделы по значению поля (по умолчанию — город):
+    <каталог>/city=<значение>/part-0.parquet. Строки раздела упорядочены по зарплате и записаны
+    группами строк со статистикой, поэтому фильтры по разделу и зарплате пропускают лишние файлы
+    и группы строк, а чтение ограничивается нужными колонками. Файлы сжимаются (по умолчанию zstd).
+    Требуется пакет pyarrow."""
+
+    PART_FILE = "part-0.parquet"
+    NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+    def __init__(self, directory: str = "data/vacancies.parquet", partition_by: str = "city",
+                 row_group_size: int = 10000, compression: str = "zstd") -> None:
+        if pa is None:
+            raise ImportError("Для ParquetSaver нужен пакет pyarrow")
+        if partition_by not in COLUMNS:
+            raise ValueError(f"Неизвестное поле для разбиения: {partition_by}")
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__partition_by = partition_by
+        self.__row_group_size = row_group_size
+        self.__compression = compression
+        self.__lock = FileLock(self.__directory)
+        self.__schema = pa.schema([
+            (column, pa.int64() if column in ("salary_from", "salary_to")
+             else pa.bool_() if column == "salary_gross" else pa.string())
+            for column in COLUMNS
+        ])
+
+    @property
+    def directory(self) -> Path:
+        """Каталог набора данных."""
+        return self.__directory
+
+    def __partition_path(self, value: Any) -> Path:
+        name = self.NULL_PARTITION if value is None else quote(str(value), safe="")
+        return self.__directory / f"{self.__partition_by}={name}"
+
+    def __dataset(self) -> Any:
+        partitioning = ds.partitioning(pa.schema([self.__schema.field(self.__partition_by)]), flavor="hive")
+        return ds.dataset(self.__directory, format="parquet", partitioning=partitioning,
+                          exclude_invalid_files=True)
+
+    def __filter(self, criteria: Union[Dict, Vacancy, None], salary_min: Optional[int] = None,
+                 salary_max: Optional[int] = None) -> Any:
+        """Выражение фильтра pyarrow: равенство по критериям и диапазон зарплаты."""
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        expression = None
+        conditions = []
+        for key, value in (criteria or {}).items():
+            if key not in COLUMNS:
+                if value is None:
+                    continue
+                return ds.scalar(False)
+            if key in ("salary_from", "salary_to"):
+                value = parse_salary(value)
+            conditions.append(ds.field(key).is_null() if value is None else ds.field(key) == value)
+        if salary_min is not None:
+            conditions.append(ds.field("salary_from") >= salary_min)
+        if salary_max is not None:
+            conditions.append(ds.field("salary_to") <= salary_max)
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def __comparable(self, field: str, value: Any) -> bool:
+        """Значение того же типа, что и колонка: иначе сравнение выполняется в Python."""
+        column_type = self.__schema.field(field).type
+        if pa.types.is_boolean(column_type):
+            return isinstance(value, bool)
+        if pa.types.is_integer(column_type):
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        return isinstance(value, str)
+
+    def __expression(self, predicate: Predicate) -> Any:
+        """Выражение pyarrow для условия или None, если условие проверяется в Python (подстрока,
+        полнотекстовое, неизвестное поле). Выражения не возвращают null, поэтому отрицание
+        и объединение условий сохраняют смысл пустых значений, как в Predicate.matches."""
+        if isinstance(predicate, (Compare, In, Between)) and predicate.field not in COLUMNS:
+            return None
+        if isinstance(predicate, Compare):
+            field = ds.field(predicate.field)
+            if predicate.value is None:
+                return (field.is_null() if predicate.op == "==" else field.is_valid() if predicate.op == "!="
+                        else ds.scalar(False))
+            if not self.__comparable(predicate.field, predicate.value):
+                return None
+            if predicate.op == "!=":
+                return field.is_null() | (field != predicate.value)
+            return field.is_valid() & OPERATORS[predicate.op](field, predicate.value)
+        if isinstance(predicate, In):
+            field = ds.field(predicate.field)
+            values = [value for value in predicate.values if value is not None]
+            if not all(self.__comparable(predicate.field, value) for value in values):
+                return None
+            expression = field.is_valid() & field.isin(values) if values else ds.scalar(False)
+            return expression | field.is_null() if None in predicate.values else expression
+        if isinstance(predicate, Between):
+            field = ds.field(predicate.field)
+            bounds = [bound for bound in (predicate.low, predicate.high) if bound is not None]
+            if not all(self.__comparable(predicate.field, bound) for bound in bounds):
+                return None
+            expression = field.is_valid()
+            if predicate.low is not None:
+                expression &= field >= predicate.low
+            if predicate.high is not None:
+                expression &= field <= predicate.high
+            return expression
+        if isinstance(predicate, (And, Or)):
+            parts = [self.__expression(part) for part in predicate.predicates]
+            if not parts or any(part is None for part in parts):
+                return None
+            expression = parts[0]
+            for part in parts[1:]:
+                expression = expression & part if isinstance(predicate, And) else expression | part
+            return expression
+        if isinstance(predicate, Not):
+            inner = self.__expression(predicate.predicate)
+            return None if inner is None else ~inner
+        return None
+
+    def __split(self, predicate: Optional[Predicate]) -> Tuple[Any, Optional[Predicate]]:
+        """Разделение условия на выражение pyarrow (пропуск разделов и групп строк по статистике)
+        и остаток, который проверяется в Python."""
+        if predicate is None:
+            return None, None
+        expression = None
+        residual: List[Predicate] = []
+        for part in predicate.predicates if isinstance(predicate, And) else (predicate,):
+            compiled = self.__expression(part)
+            if compiled is None:
+                residual.append(part)
+            else:
+                expression = compiled if expression is None else expression & compiled
+        return expression, None if not residual else residual[0] if len(residual) == 1 else And(*residual)
+
+    def __read(self, expression: Any = None, columns: Optional[List[str]] = None) -> Any:
+        if not any(self.__directory.iterdir()):
+            return self.__schema.empty_table().select(columns or COLUMNS)
+        table = self.__dataset().to_table(columns=columns or COLUMNS, filter=expression)
+        return table.cast(self.__schema) if columns is None else table
+
+    def __write_partition(self, value: Any, rows: List[Dict[str, Any]]) -> None:
+        """Перезапись раздела целиком; пустой раздел удаляется."""
+        path = self.__partition_path(value)
+        if not rows:
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        rows.sort(key=lambda row: (row["salary_from"] is None, row["salary_from"] or 0))
+        table = pa.Table.from_pylist(rows, schema=self.__schema).drop_columns([self.__partition_by])
+        path.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path / self.PART_FILE) as tmp_path:
+            pq.write_table(table, tmp_path, row_group_size=self.__row_group_size, write_statistics=True,
+                           compression=self.__compression)
+
+    def __partition_rows(self, value: Any) -> List[Dict[str, Any]]:
+        if not self.__partition_path(value).exists():
+            return []
+        field = ds.field(self.__partition_by)
+        rows: List[Dict[str, Any]] = self.__read(field.is_null() if value is None else field == value).to_pylist()
+        return rows
+
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий: перезаписываются только затронутые разделы.
+        on_conflict задаёт поведение при совпадении ключа вакансии: "skip", "replace" или "merge"."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
+        if isinstance(vacancies, Vacancy):
+            vacancies = [vacancies]
+        incoming: Dict[Any, List[Dict[str, Any]]] = {}
+        for vacancy in vacancies:
+            row = vacancy.to_dict()
+            incoming.setdefault(row[self.__partition_by], []).append(row)
+
+        with self.__lock.exclusive():
+            for value, rows in incoming.items():
+                existing = {vacancy_key(row): row for row in self.__partition_rows(value)}
+                changed = False
+                for row in rows:
+                    key = vacancy_key(row)
+                    if key not in existing or on_conflict == "replace":
+                        existing[key] = row
+                    elif on_conflict == "merge":
+                        existing[key] = {**existing[key], **{k: v for k, v in row.items() if v is not None}}
+                    else:
+                        continue
+                    changed = True
+                if changed:
+                    self.__write_partition(value, list(existing.values()))
+
+    def get_vacancy(self, criteria: Union[Dict, Vacancy, Query, Predicate], columns: Optional[List[str]] = None,
+                    salary_min: Optional[int] = None, salary_max: Optional[int] = None) -> list:
+        """Метод для получения данных по критериям равенства и диапазону зарплаты
+        (salary_from >= salary_min, salary_to <= salary_max); columns — нужные колонки.
+        Вместо словаря можно передать запрос Query или условие (см. src.query)."""
+        if isinstance(criteria, (Query, Predicate)):
+            return self.query(criteria, columns)
+        with self.__lock.shared():
+            rows: List[Dict[str, Any]] = self.__read(self.__filter(criteria, salary_min, salary_max),
+                                                     columns).to_pylist()
+        return rows
+
+    def query(self, query: Union[Query, Predicate, Dict], columns: Optional[List[str]] = None) -> list:
+        """Метод выполнения запроса (src.query): сравнения, наборы значений и диапазоны переводятся
+        в фильтр pyarrow, остальные условия, сортировка и limit выполняются над прочитанными строками."""
+        query = Query.coerce(query)
+        expression, residual = self.__split(query.predicate)
+        pushed = residual is None and (query.sort_field is None or columns is None or query.sort_field in columns)
+        with self.__lock.shared():
+            rows: List[Dict[str, Any]] = self.__read(expression, columns if pushed else None).to_pylist()
+        rows = query.finish(row for row in rows if residual is None or residual.matches(row))
+        if columns is not None and not pushed:
+            rows = [{column: row[column] for column in columns if column in row} for row in rows]
+        return rows
+
+    def read_frame(self, criteria: Union[Dict, Vacancy, None] = None, columns: Optional[List[str]] = None,
+                   salary_min: Optional[int] = None, salary_max: Optional[int] = None) -> pd.DataFrame:
+        """Выборка в виде DataFrame без промежуточных словарей — для аналитики в pandas."""
+        with self.__lock.shared():
+            frame: pd.DataFrame = self.__read(self.__filter(criteria, salary_min, salary_max), columns).to_pandas()
+        return frame
+
+    def iter_data(self) -> Iterator[Dict[str, Any]]:
+        """Генератор всех записей по разделам."""
+        yield from self.load_data()
+
+    def load_data(self) -> List[Dict[str, Any]]:
+        """Метод для загрузки всех вакансий."""
+        return self.get_vacancy({})
+
+    def delete_vacancy(self, criteria: Union[Dict, Vacancy]) -> None:
+        """Метод для удаления вакансий: перезаписываются только разделы с совпавшими строками."""
+        if not criteria:
+            return
+        expression = self.__filter(criteria)
+        if expression is None:
+            expression = ds.scalar(True)
+        with self.__lock.exclusive():
+            matched = self.__read(expression, [self.__partition_by]).column(0).to_pylist()
+            for value in set(matched):
+                field = ds.field(self.__partition_by)
+                partition = field.is_null() if value is None else field == value
+                removed = {vacancy_key(row) for row in self.__read(expression & partition).to_pylist()}
+                kept = [row for row in self.__partition_rows(value) if vacancy_key(row) not in removed]
+                self.__write_partition(value, kept)
+
+
 if __name__ == "__main__":
     vacancy = Vacancy(
         "Python Developer",
@@ -0,0 +1,547 @@
+import heapq
+import operator
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import pandas as pd
+
+from src.salary import parse_salary
+from src.text_index import tokenize
+from src.vacancies_hh import SALARY_FIELDS, Vacancy
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+# Условие SQL, часть параметров и остаток, который проверяется в Python
+SqlPlan = Tuple[Optional[str], List[Any], Optional["Predicate"]]
+
+
+def _value(record: Dict[str, Any], field: str) -> Any:
+    """Значение поля записи: зарплаты приводятся к числу, пустые значения (NaN) — к None."""
+    value = record.get(field)
+    if field in SALARY_FIELDS:
+        return parse_salary(value)
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _column(df: pd.DataFrame, field: str) -> pd.Series:
+    """Колонка таблицы; отсутствующая колонка считается пустой, зарплаты — числовыми."""
+    if field not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    if field in SALARY_FIELDS:
+        return pd.to_numeric(df[field], errors="coerce")
+    return df[field]
+
+
+class Predicate(ABC):
+    """Условие запроса. Условия объединяются операторами & (И), | (ИЛИ) и ~ (НЕ).
+    Каждое условие умеет проверять запись, строить булеву маску по DataFrame
+    и, если возможно, условие SQL (иначе sql() возвращает None)."""
+
+    @abstractmethod
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """Проверка одной записи."""
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """Булева маска строк таблицы; по умолчанию — построчная проверка."""
+        flags = [self.matches({str(key): value for key, value in record.items()}) for record in df.to_dict("records")]
+        return pd.Series(flags, index=df.index, dtype=bool)
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        """Условие SQL с параметрами или None, если условие не переводится в SQL."""
+        return None
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+
+class Compare(Predicate):
+    """Сравнение поля со значением: ==, !=, <, <=, >, >=. Сравнение с None проверяет пустое значение,
+    пустое значение не больше и не меньше ничего."""
+
+    def __init__(self, field: str, op: str, value: Any) -> None:
+        if op not in OPERATORS:
+            raise ValueError(f"Неизвестный оператор: {op}")
+        if op not in ("==", "!=") and value is None:
+            raise ValueError("С None можно сравнивать только на равенство")
+        self.field = field
+        self.op = op
+        self.value = parse_salary(value) if field in SALARY_FIELDS and value is not None else value
+
+    def __repr__(self) -> str:
+        return f"{self.field} {self.op} {self.value!r}"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        actual = _value(record, self.field)
+        if actual is None or self.value is None:
+            if self.op == "==":
+                return actual is None and self.value is None
+            if self.op == "!=":
+                return (actual is None) != (self.value is None)
+            return False
+        try:
+            return bool(OPERATORS[self.op](actual, self.value))
+        except TypeError:
+            return False
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        column = _column(df, self.field)
+        empty = column.isna()
+        if self.value is None:
+            return empty if self.op == "==" else ~empty
+        try:
+            result: pd.Series = OPERATORS[self.op](column, self.value).fillna(False).astype(bool)
+        except TypeError:
+            return super().mask(df)
+        return (result | empty) if self.op == "!=" else (result & ~empty)
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        if self.field not in columns:
+            return None
+        if self.value is None:
+            return f"{self.field} IS {'NOT ' if self.op == '!=' else ''}NULL", []
+        if self.op == "!=":
+            return f"({self.field} IS NULL OR {self.field} != ?)", [self.value]
+        return f"{self.field} {'=' if self.op == '==' else self.op} ?", [self.value]
+
+
+class In(Predicate):
+    """Значение поля входит в набор значений."""
+
+    def __init__(self, field: str, values: Iterable[Any]) -> None:
+        self.field = field
+        self.values = tuple(parse_salary(value) if field in SALARY_FIELDS and value is not None else value
+                            for value in values)
+
+    def __repr__(self) -> str:
+        return f"{self.field} in {self.values!r}"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return _value(record, self.field) in self.values
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        column = _column(df, self.field)
+        result = column.isin([value for value in self.values if value is not None])
+        return (result | column.isna()) if None in self.values else result
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        if self.field not in columns:
+            return None
+        values = [value for value in self.values if value is not None]
+        conditions = [f"{self.field} IN ({', '.join('?' * len(values))})"] if values else []
+        if None in self.values:
+            conditions.append(f"{self.field} IS NULL")
+        return (f"({' OR '.join(conditions)})" if conditions else "0"), values
+
+
+class Between(Predicate):
+    """Значение поля в диапазоне [low, high] включительно; None — граница не задана."""
+
+    def __init__(self, field: str, low: Any = None, high: Any = None) -> None:
+        self.field = field
+        self.low = parse_salary(low) if field in SALARY_FIELDS and low is not None else low
+        self.high = parse_salary(high) if field in SALARY_FIELDS and high is not None else high
+
+    def __repr__(self) -> str:
+        return f"{self.field} between {self.low!r} and {self.high!r}"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        actual = _value(record, self.field)
+        if actual is None:
+            return False
+        try:
+            return (self.low is None or actual >= self.low) and (self.high is None or actual <= self.high)
+        except TypeError:
+            return False
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        column = _column(df, self.field)
+        result = ~column.isna()
+        try:
+            if self.low is not None:
+                result &= (column >= self.low).fillna(False).astype(bool)
+            if self.high is not None:
+                result &= (column <= self.high).fillna(False).astype(bool)
+        except TypeError:
+            return super().mask(df)
+        return result
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        if self.field not in columns:
+            return None
+        conditions = [f"{self.field} IS NOT NULL"]
+        params = []
+        if self.low is not None:
+            conditions.append(f"{self.field} >= ?")
+            params.append(self.low)
+        if self.high is not None:
+            conditions.append(f"{self.field} <= ?")
+            params.append(self.high)
+        return f"({' AND '.join(conditions)})", params
+
+
+class Contains(Predicate):
+    """Подстрока в значении поля без учёта регистра."""
+
+    def __init__(self, field: str, text: str) -> None:
+        self.field = field
+        self.text = text.lower()
+
+    def __repr__(self) -> str:
+        return f"{self.field} contains {self.text!r}"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        actual = _value(record, self.field)
+        return isinstance(actual, str) and self.text in actual.lower()
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        column = _column(df, self.field)
+        return column.map(lambda value: isinstance(value, str) and self.text in value.lower()).astype(bool)
+
+
+class Text(Predicate):
+    """Полнотекстовое условие: все (mode="and") или хотя бы одно (mode="or") слово запроса
+    встречается в поле после нормализации, как в текстовом индексе."""
+
+    def __init__(self, field: str, query: str, mode: str = "and") -> None:
+        if mode not in ("and", "or"):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        self.field = field
+        self.query = query
+        self.mode = mode
+        self.tokens = set(tokenize(query))
+
+    def __repr__(self) -> str:
+        return f"{self.field} matches {self.query!r} ({self.mode})"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if not self.tokens:
+            return False
+        tokens = set(tokenize(_value(record, self.field)))
+        return self.tokens <= tokens if self.mode == "and" else bool(self.tokens & tokens)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        column = _column(df, self.field)
+        return column.map(lambda value: self.matches({self.field: value})).astype(bool)
+
+
+class And(Predicate):
+    """Все условия выполняются."""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        self.predicates: Tuple[Predicate, ...] = tuple(
+            part for predicate in predicates
+            for part in (predicate.predicates if isinstance(predicate, And) else (predicate,))
+        )
+
+    def __repr__(self) -> str:
+        return "(" + " and ".join(map(repr, self.predicates)) + ")"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return all(predicate.matches(record) for predicate in self.predicates)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        result = pd.Series(True, index=df.index)
+        for predicate in self.predicates:
+            result &= predicate.mask(df)
+        return result
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        compiled = [predicate.sql(columns) for predicate in self.predicates]
+        if not compiled or any(part is None for part in compiled):
+            return None
+        return ("(" + " AND ".join(sql for sql, _ in compiled) + ")",  # type: ignore[misc]
+                [param for _, params in compiled for param in params])  # type: ignore[misc]
+
+
+class Or(Predicate):
+    """Хотя бы одно условие выполняется."""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        self.predicates: Tuple[Predicate, ...] = tuple(
+            part for predicate in predicates
+            for part in (predicate.predicates if isinstance(predicate, Or) else (predicate,))
+        )
+
+    def __repr__(self) -> str:
+        return "(" + " or ".join(map(repr, self.predicates)) + ")"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return any(predicate.matches(record) for predicate in self.predicates)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        result = pd.Series(False, index=df.index)
+        for predicate in self.predicates:
+            result |= predicate.mask(df)
+        return result
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        compiled = [predicate.sql(columns) for predicate in self.predicates]
+        if not compiled or any(part is None for part in compiled):
+            return None
+        return ("(" + " OR ".join(sql for sql, _ in compiled) + ")",  # type: ignore[misc]
+                [param for _, params in compiled for param in params])  # type: ignore[misc]
+
+
+class Not(Predicate):
+    """Условие не выполняется."""
+
+    def __init__(self, predicate: Predicate) -> None:
+        self.predicate = predicate
+
+    def __repr__(self) -> str:
+        return f"not {self.predicate!r}"
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return not self.predicate.matches(record)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return ~self.predicate.mask(df)
+
+    def sql(self, columns: Sequence[str]) -> Optional[Tuple[str, List[Any]]]:
+        compiled = self.predicate.sql(columns)
+        if compiled is None:
+            return None
+        return f"NOT COALESCE({compiled[0]}, 0)", compiled[1]
+
+
+class Field:
+    """Построитель условий по полю: Field("salary_from") >= 150000, Field("city").isin(...) и т.д."""
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __eq__(self, value: Any) -> Predicate:  # type: ignore[override]
+        return Compare(self.name, "==", value)
+
+    def __ne__(self, value: Any) -> Predicate:  # type: ignore[override]
+        return Compare(self.name, "!=", value)
+
+    def __lt__(self, value: Any) -> Predicate:
+        return Compare(self.name, "<", value)
+
+    def __le__(self, value: Any) -> Predicate:
+        return Compare(self.name, "<=", value)
+
+    def __gt__(self, value: Any) -> Predicate:
+        return Compare(self.name, ">", value)
+
+    def __ge__(self, value: Any) -> Predicate:
+        return Compare(self.name, ">=", value)
+
+    def isin(self, values: Iterable[Any]) -> Predicate:
+        return In(self.name, values)
+
+    def between(self, low: Any = None, high: Any = None) -> Predicate:
+        return Between(self.name, low, high)
+
+    def contains(self, text: str) -> Predicate:
+        return Contains(self.name, text)
+
+    def matches(self, query: str, mode: str = "and") -> Predicate:
+        return Text(self.name, query, mode)
+
+
+def from_criteria(criteria: Union[Dict, Vacancy]) -> Optional[Predicate]:
+    """Условие из словаря критериев в прежнем смысле get_vacancy: равенство по всем ключам."""
+    if isinstance(criteria, Vacancy):
+        criteria = criteria.to_dict()
+    if not criteria:
+        return None
+    return And(*(Compare(key, "==", value) for key, value in criteria.items()))
+
+
+class Query:
+    """Запрос: условие, сортировка и ограничение числа результатов.
+    Методы where(), order_by() и limit() возвращают новый запрос."""
+
+    def __init__(self, predicate: Optional[Predicate] = None, sort_field: Optional[str] = None,
+                 descending: bool = False, limit_count: Optional[int] = None) -> None:
+        self.predicate = predicate
+        self.sort_field = sort_field
+        self.descending = descending
+        self.limit_count = limit_count
+
+    def __repr__(self) -> str:
+        return (f"Query({self.predicate!r}, order_by={self.sort_field!r}, descending={self.descending}, "
+                f"limit={self.limit_count})")
+
+    @classmethod
+    def coerce(cls, value: Union["Query", Predicate, Dict, Vacancy, None]) -> "Query":
+        """Запрос из запроса, условия или словаря критериев."""
+        if isinstance(value, Query):
+            return value
+        if isinstance(value, Predicate):
+            return cls(value)
+        return cls(from_criteria(value or {}))
+
+    def where(self, predicate: Predicate) -> "Query":
+        combined = predicate if self.predicate is None else And(self.predicate, predicate)
+        return Query(combined, self.sort_field, self.descending, self.limit_count)
+
+    def order_by(self, field: str, descending: bool = False) -> "Query":
+        return Query(self.predicate, field, descending, self.limit_count)
+
+    def limit(self, count: int) -> "Query":
+        return Query(self.predicate, self.sort_field, self.descending, count)
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return self.predicate is None or self.predicate.matches(record)
+
+    def finish(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Сортировка и ограничение уже отфильтрованных записей; пустые значения — в конце.
+        При заданном limit с сортировкой используется куча размера limit."""
+        if self.sort_field is None:
+            return list(islice(records, self.limit_count))
+        field = self.sort_field
+        valued: List[Tuple[Any, int, Dict[str, Any]]] = []
+        empty: List[Dict[str, Any]] = []
+        for number, record in enumerate(records):
+            value = _value(record, field)
+            if value is None:
+                empty.append(record)
+            else:
+                valued.append((value, number, record))
+
+        def key(item: Tuple[Any, int, Dict[str, Any]]) -> Tuple[Any, int]:
+            # при равных значениях сохраняется исходный порядок записей
+            return (item[0], -item[1]) if self.descending else (item[0], item[1])
+
+        if self.limit_count is not None:
+            pick = heapq.nlargest if self.descending else heapq.nsmallest
+            ordered = pick(self.limit_count, valued, key=key)
+        else:
+            ordered = sorted(valued, key=key, reverse=self.descending)
+        result = [record for _, _, record in ordered] + empty
+        return result[:self.limit_count] if self.limit_count is not None else result
+
+    def split_sql(self, columns: Sequence[str]) -> SqlPlan:
+        """Разделение условия на часть, выполняемую в SQL, и остаток для проверки в Python."""
+        if self.predicate is None:
+            return None, [], None
+        parts = self.predicate.predicates if isinstance(self.predicate, And) else (self.predicate,)
+        conditions: List[str] = []
+        params: List[Any] = []
+        residual: List[Predicate] = []
+        for part in parts:
+            compiled = part.sql(columns)
+            if compiled is None:
+                residual.append(part)
+            else:
+                conditions.append(compiled[0])
+                params.extend(compiled[1])
+        rest = None if not residual else residual[0] if len(residual) == 1 else And(*residual)
+        return (" AND ".join(conditions) or None), params, rest
+
+
+class MemoryIndex:
+    """Индексы по записям в памяти для планировщика: хэш-индексы по полям с повторяющимися
+    значениями, отсортированные списки зарплат для диапазонов и, если передан поиск
+    по текстовому индексу, полнотекстовые условия по требованиям. Индексы строятся при первом обращении."""
+
+    HASHED_FIELDS = ("city", "work_format", "vacancy_id", "url", "salary_currency", "name_vacancy")
+    SORTED_FIELDS = SALARY_FIELDS
+
+    def __init__(self, records: Sequence[Dict[str, Any]],
+                 text_search: Optional[Callable[[str, str], Set[int]]] = None) -> None:
+        self.__records = records
+        self.__text_search = text_search
+        self.__hashed: Dict[str, Dict[Any, List[int]]] = {}
+        self.__sorted: Dict[str, Tuple[List[Any], List[int]]] = {}
+
+    def __hash_index(self, field: str) -> Dict[Any, List[int]]:
+        if field not in self.__hashed:
+            index: Dict[Any, List[int]] = {}
+            for position, record in enumerate(self.__records):
+                value = _value(record, field)
+                try:
+                    index.setdefault(value, []).append(position)
+                except TypeError:
+                    continue
+            self.__hashed[field] = index
+        return self.__hashed[field]
+
+    def __sorted_index(self, field: str) -> Tuple[List[Any], List[int]]:
+        if field not in self.__sorted:
+            pairs = sorted((value, position) for position, record in enumerate(self.__records)
+                           if (value := _value(record, field)) is not None)
+            self.__sorted[field] = [value for value, _ in pairs], [position for _, position in pairs]
+        return self.__sorted[field]
+
+    def __range(self, field: str, low: Any, high: Any, include_low: bool = True,
+                include_high: bool = True) -> Set[int]:
+        values, positions = self.__sorted_index(field)
+        start = 0 if low is None else (bisect_left if include_low else bisect_right)(values, low)
+        end = len(values) if high is None else (bisect_right if include_high else bisect_left)(values, high)
+        return set(positions[start:end])
+
+    def candidates(self, predicate: Predicate) -> Optional[Set[int]]:
+        """Позиции записей, которые могут удовлетворять условию, или None, если индекс не применим."""
+        if isinstance(predicate, Compare) and predicate.value is not None:
+            if predicate.field in self.HASHED_FIELDS and predicate.op == "==":
+                return set(self.__hash_index(predicate.field).get(predicate.value, ()))
+            if predicate.field in self.SORTED_FIELDS and predicate.op != "!=":
+                op, value = predicate.op, predicate.value
+                if op == "==":
+                    return self.__range(predicate.field, value, value)
+                if op in (">", ">="):
+                    return self.__range(predicate.field, value, None, include_low=op == ">=")
+                return self.__range(predicate.field, None, value, include_high=op == "<=")
+        if isinstance(predicate, In) and predicate.field in self.HASHED_FIELDS:
+            index = self.__hash_index(predicate.field)
+            return {position for value in predicate.values for position in index.get(value, ())}
+        if isinstance(predicate, Between) and predicate.field in self.SORTED_FIELDS:
+            return self.__range(predicate.field, predicate.low, predicate.high)
+        if isinstance(predicate, Text) and predicate.field == "requirement" and self.__text_search is not None:
+            return self.__text_search(predicate.query, predicate.mode)
+        if isinstance(predicate, And):
+            found = [result for part in predicate.predicates if (result := self.candidates(part)) is not None]
+            if not found:
+                return None
+            found.sort(key=len)
+            return found[0].intersection(*found[1:])
+        if isinstance(predicate, Or):
+            union: Set[int] = set()
+            for part in predicate.predicates:
+                result = self.candidates(part)
+                if result is None:
+                    return None
+                union |= result
+            return union
+        return None
+
+    def run(self, query: Query) -> List[Dict[str, Any]]:
+        """Выполнение запроса: кандидаты из индексов проверяются полным условием,
+        без применимых индексов — один проход по всем записям."""
+        positions = self.candidates(query.predicate) if query.predicate is not None else None
+        records: Iterator[Dict[str, Any]] = (
+            (self.__records[position] for position in sorted(positions)) if positions is not None
+            else iter(self.__records)
+        )
+        return query.finish(record for record in records if query.matches(record))
+
+
+def execute(query: Union[Query, Predicate, Dict, Vacancy], storage: Any) -> List[Dict[str, Any]]:
+    """Выполнение запроса на любом хранилище. Хранилища с собственным планировщиком
+    (метод query) используют свои индексы, остальные обрабатываются одним потоковым проходом."""
+    query = Query.coerce(query)
+    if hasattr(storage, "query"):
+        result: List[Dict[str, Any]] = storage.query(query)
+        return result
+    if hasattr(storage, "iter_data"):
+        records: Iterable[Dict[str, Any]] = storage.iter_data()
+    else:
+        records = storage.get_vacancy({})
+    return query.finish(record for record in records if query.matches(record))
@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+
+
+class RateLimiter:
+    """Адаптивный ограничитель частоты запросов по алгоритму token bucket.
+    После ответа 429 частота уменьшается вдвое, после успешных ответов
+    постепенно возвращается к максимальной."""
+
+    def __init__(self, rate: float = 5.0, capacity: Optional[float] = None, min_rate: float = 0.5,
+                 max_rate: Optional[float] = None, increase_step: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.__rate = rate
+        self.__capacity = capacity if capacity is not None else max(1.0, rate)
+        self.__min_rate = min_rate
+        self.__max_rate = max_rate if max_rate is not None else rate
+        self.__increase_step = increase_step
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__tokens = self.__capacity
+        self.__updated = clock()
+        self.__lock = threading.Lock()
+        self.throttle_waits = 0
+        self.throttle_wait_time = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Текущая разрешённая частота запросов в секунду."""
+        return self.__rate
+
+    def acquire(self) -> float:
+        """Метод получения разрешения на запрос. Возвращает время ожидания в секундах."""
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate)
+            self.__updated = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return 0.0
+            wait = -self.__tokens / self.__rate
+            self.throttle_waits += 1
+            self.throttle_wait_time += wait
+        self.__sleep(wait)
+        return wait
+
+    def on_throttled(self) -> None:
+        """Уменьшение частоты после ответа 429 Too Many Requests."""
+        with self.__lock:
+            self.__rate = max(self.__min_rate, self.__rate / 2)
+
+    def on_success(self) -> None:
+        """Постепенное восстановление частоты после успешного ответа."""
+        with self.__lock:
+            self.__rate = min(self.__max_rate, self.__rate + self.__increase_step)
+
+
+class RetryPolicy:
+    """Политика повторных запросов с экспоненциальной задержкой, jitter
+    и учётом заголовка Retry-After. Задержка из Retry-After соблюдается как есть,
+    backoff_max её не ограничивает; retry_after_max лишь отсекает явно ошибочные значения."""
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_after_max: float = 3600.0,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 sleep: Callable[[float], None] = time.sleep,
+                 random_func: Callable[[float, float], float] = random.uniform) -> None:
+        self.max_retries = max_retries
+        self.__backoff_base = backoff_base
+        self.__backoff_max = backoff_max
+        self.__retry_after_max = retry_after_max
+        self.__retry_statuses = frozenset(retry_statuses)
+        self.__sleep = sleep
+        self.__random = random_func
+        self.__lock = threading.Lock()
+        self.retries = 0
+
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        """Проверка, нужно ли повторить запрос с данным статусом."""
+        return status_code in self.__retry_statuses and attempt < self.max_retries
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Разбор Retry-After: число секунд или HTTP-дата."""
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Задержка перед повтором номер attempt (начиная с нуля)."""
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.__retry_after_max)
+        return self.__random(0, min(self.__backoff_max, self.__backoff_base * 2 ** attempt))
+
+    def wait(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Ожидание перед повтором запроса."""
+        delay = self.delay(attempt, retry_after)
+        with self.__lock:
+            self.retries += 1
+        self.__sleep(delay)
+        return delay
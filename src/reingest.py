@@ -0,0 +1,144 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.base_json import BaseClass
+from src.bulk_parser import loads, parse_vacancies
+from src.compression import CODECS, read_bytes
+from src.json_saver import CONFLICT_MODES, JSONSaver
+from src.jsonl_saver import JSONLinesSaver
+from src.other_formats import ExcelFile
+from src.sqlite_saver import SQLiteSaver
+from src.vacancies_hh import Vacancy, vacancy_key
+
+# Страницы архива: несжатые и сжатые любым поддерживаемым алгоритмом (см. src.compression)
+ARCHIVE_PATTERNS: Tuple[str, ...] = ("*.json",) + tuple(f"*.json{suffix}" for suffix in CODECS)
+# Число частей на один процесс: мелкие части выравнивают нагрузку между процессами
+SHARDS_PER_WORKER = 4
+
+
+class ReingestReport(NamedTuple):
+    """Итог повторной обработки архива."""
+    files: int
+    vacancies: int
+    duplicates: int
+    errors: List[str]
+
+
+def find_archives(paths: Iterable[str], pattern: Union[str, Sequence[str]] = ARCHIVE_PATTERNS) -> List[Path]:
+    """Файлы архива: переданные файлы и файлы по шаблонам во вложенных каталогах, в порядке имён."""
+    patterns = [pattern] if isinstance(pattern, str) else pattern
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted({file for item in patterns for file in path.rglob(item)}))
+        else:
+            files.append(path)
+    return files
+
+
+def parse_shard(files: Sequence[str]) -> Tuple[List[Vacancy], List[str]]:
+    """Разбор части архива в отдельном процессе. Файл содержит страницу выдачи API
+    или запись кэша ответов ({"payload": ...}). Нормализация вакансий (зарплаты, интернирование строк)
+    тоже выполняется здесь, в процессе пула. Возвращает вакансии и описания ошибок."""
+    vacancies: List[Vacancy] = []
+    errors: List[str] = []
+    for file in files:
+        try:
+            page = loads(read_bytes(file))
+        except (OSError, ValueError) as e:
+            errors.append(f"{file}: {e}")
+            continue
+        if isinstance(page, dict) and "payload" in page and "items" not in page:
+            page = page["payload"]
+        parsed, page_errors = parse_vacancies([page])
+        vacancies.extend(parsed)
+        errors.extend(f"{file}[{error.item}]: {error.error}" for error in page_errors)
+    return vacancies, errors
+
+
+def shard(files: Sequence[Path], count: int) -> List[List[str]]:
+    """Разбиение списка файлов на count непрерывных частей примерно равного размера."""
+    count = max(1, min(count, len(files)))
+    size, rest = divmod(len(files), count)
+    shards = []
+    start = 0
+    for number in range(count):
+        end = start + size + (number < rest)
+        shards.append([str(file) for file in files[start:end]])
+        start = end
+    return shards
+
+
+def reingest(paths: Iterable[str], storage: BaseClass, max_workers: Optional[int] = None,
+             on_conflict: str = "replace", pattern: Union[str, Sequence[str]] = ARCHIVE_PATTERNS) -> ReingestReport:
+    """Повторная обработка архива страниц выдачи: файлы делятся на части, которые разбираются
+    в пуле процессов, результаты объединяются без дублей (при совпадении побеждает более поздний файл)
+    и записываются в хранилище одной пачкой. При max_workers=1 разбор идёт в текущем процессе."""
+    files = find_archives(paths, pattern)
+    workers = max_workers or os.cpu_count() or 1
+    shards = shard(files, workers * SHARDS_PER_WORKER)
+    if workers == 1 or len(shards) < 2:
+        results: Iterable[Tuple[List[Vacancy], List[str]]] = map(parse_shard, shards)
+        return _merge(files, results, storage, on_conflict)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge(files, executor.map(parse_shard, shards), storage, on_conflict)
+
+
+def _merge(files: List[Path], results: Iterable[Tuple[List[Vacancy], List[str]]],
+           storage: BaseClass, on_conflict: str) -> ReingestReport:
+    """Объединение результатов частей в порядке файлов и запись в хранилище."""
+    merged: Dict[str, Vacancy] = {}
+    errors: List[str] = []
+    total = 0
+    for vacancies, shard_errors in results:
+        total += len(vacancies)
+        errors.extend(shard_errors)
+        for vacancy in vacancies:
+            key = vacancy_key(vacancy.to_dict())
+            merged.pop(key, None)
+            merged[key] = vacancy
+    storage.add_vacancy(list(merged.values()), on_conflict=on_conflict)
+    return ReingestReport(len(files), len(merged), total - len(merged), errors)
+
+
+def open_storage(path: str) -> BaseClass:
+    """Хранилище по расширению файла: .json, .jsonl, .db/.sqlite или .xlsx."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".json":
+        return JSONSaver(path)
+    if suffix == ".jsonl":
+        return JSONLinesSaver(path)
+    if suffix in (".db", ".sqlite"):
+        return SQLiteSaver(path)
+    if suffix == ".xlsx":
+        return ExcelFile(path)
+    raise ValueError(f"Неизвестный формат хранилища: {path}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Командная строка: python -m src.reingest АРХИВ... --storage ФАЙЛ [--workers N]."""
+    parser = argparse.ArgumentParser(description="Повторная обработка архива страниц выдачи hh.ru")
+    parser.add_argument("archives", nargs="+", help="файлы или каталоги с архивом страниц")
+    parser.add_argument("--storage", default="data/vacancies.json", help="файл хранилища (.json, .jsonl, .db, .xlsx)")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — число ядер)")
+    parser.add_argument("--on-conflict", choices=CONFLICT_MODES, default="replace")
+    parser.add_argument("--pattern", action="append", default=None,
+                        help="шаблон имён файлов в каталогах, можно указать несколько раз "
+                             f"(по умолчанию {' '.join(ARCHIVE_PATTERNS)})")
+    args = parser.parse_args(argv)
+
+    report = reingest(args.archives, open_storage(args.storage), args.workers, args.on_conflict,
+                      args.pattern or ARCHIVE_PATTERNS)
+    for error in report.errors:
+        print(f"Ошибка разбора: {error}")
+    print(f"Файлов: {report.files}, вакансий: {report.vacancies}, дублей: {report.duplicates}, "
+          f"ошибок: {len(report.errors)}")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+from src.compression import codec_for, open_text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """Рекомендательная межпроцессная блокировка файла через файл-спутник <имя>.lock.
+    Читатели берут разделяемую блокировку, писатели — исключительную. Повторный захват
+    тем же объектом допускается: внутри исключительной можно брать любую, внутри разделяемой — только
+    разделяемую. Повышение разделяемой блокировки до исключительной запрещено: flock делает это
+    неатомарно, и два процесса, повышающие блокировку одновременно, блокируют друг друга навсегда.
+    Код, который может писать, должен сразу брать исключительную блокировку."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.__path = Path(f"{path}.lock")
+        self.__thread_lock = threading.RLock()
+        self.__fd: Optional[int] = None
+        self.__depth = 0
+        self.__exclusive = False
+
+    @staticmethod
+    def __lock(fd: int, exclusive: bool) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt is not None:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    @staticmethod
+    def __unlock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def __acquire(self, exclusive: bool) -> Iterator[None]:
+        with self.__thread_lock:
+            if self.__fd is None:
+                self.__fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o644)
+                self.__lock(self.__fd, exclusive)
+                self.__exclusive = exclusive
+            elif exclusive and not self.__exclusive:
+                raise RuntimeError(f"Нельзя повысить разделяемую блокировку {self.__path} до исключительной")
+            self.__depth += 1
+            try:
+                yield
+            finally:
+                self.__depth -= 1
+                if not self.__depth:
+                    self.__unlock(self.__fd)
+                    os.close(self.__fd)
+                    self.__fd = None
+
+    def shared(self) -> Any:
+        """Разделяемая блокировка для чтения."""
+        return self.__acquire(False)
+
+    def exclusive(self) -> Any:
+        """Исключительная блокировка для записи."""
+        return self.__acquire(True)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Сброс на диск записи каталога после переименования файла."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_path(path: Union[str, Path]) -> Iterator[Path]:
+    """Путь к временному файлу рядом с целевым. После успешного выхода из контекста
+    временный файл сбрасывается на диск и атомарно заменяет целевой."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=path.suffix)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(path.parent)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], encoding: str = "utf-8") -> Iterator[IO[str]]:
+    """Текстовый файл для атомарной записи: данные пишутся во временный файл,
+    сбрасываются на диск и переименовываются в целевой. Для путей .gz/.zst/.lz4 данные сжимаются на лету."""
+    path = Path(path)
+    codec = codec_for(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if codec is None:
+            with open(fd, "w", encoding=encoding) as file:
+                yield file
+                file.flush()
+                os.fsync(file.fileno())
+        else:
+            os.close(fd)
+            with open_text(tmp_name, "w", encoding, codec) as file:
+                yield file
+            with open(tmp_name, "rb") as raw:
+                os.fsync(raw.fileno())
+        os.replace(tmp_name, path)
+        _fsync_directory(path.parent)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
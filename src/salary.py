@@ -0,0 +1,49 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# Примерные курсы валют выдачи hh.ru к рублю (множитель). Используются для сравнения зарплат
+# в разных валютах, если актуальные курсы не переданы явно.
+DEFAULT_RATES: Dict[str, float] = {
+    "RUR": 1.0, "USD": 90.0, "EUR": 98.0, "KZT": 0.19, "BYR": 28.0, "UAH": 2.2,
+    "UZS": 0.0072, "KGS": 1.03, "AZN": 53.0, "GEL": 33.0,
+}
+
+
+def parse_salary(value: Any) -> Optional[int]:
+    """Приведение зарплаты к числу. Заглушки вроде "Зарплата не указана" и пустые значения дают None."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value == value else None
+    if isinstance(value, str):
+        digits = value.replace(" ", "").replace("\u00a0", "")
+        if digits.isdigit():
+            return int(digits)
+    return None
+
+
+def salary_value(record: Mapping[str, Any], rates: Optional[Mapping[str, float]] = None) -> Optional[float]:
+    """Зарплата вакансии одним числом: среднее указанных границ "от" и "до".
+    Если переданы курсы валют (множитель к рублю), сумма пересчитывается в рубли; зарплата в валюте,
+    для которой курса нет, несравнима и даёт None. Вакансии без валюты считаются рублёвыми."""
+    bounds = [bound for bound in (parse_salary(record.get("salary_from")), parse_salary(record.get("salary_to")))
+              if bound is not None]
+    if not bounds:
+        return None
+    value = sum(bounds) / len(bounds)
+    currency = record.get("salary_currency")
+    if rates and currency:
+        if currency not in rates:
+            return None
+        value *= rates[currency]
+    return value
+
+
+def top_by_salary(records: Iterable[Dict[str, Any]], n: int,
+                  rates: Optional[Mapping[str, float]] = None) -> List[Dict[str, Any]]:
+    """N вакансий с наибольшей зарплатой в рублях за один проход с кучей размера n: O(len * log n).
+    Без rates используются курсы DEFAULT_RATES. Вакансии без указанной зарплаты
+    и в валютах без курса не учитываются."""
+    rates = DEFAULT_RATES if rates is None else rates
+    valued = ((value, record) for record in records if (value := salary_value(record, rates)) is not None)
+    return [record for _, record in heapq.nlargest(n, valued, key=lambda pair: pair[0])]
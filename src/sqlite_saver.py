@@ -0,0 +1,184 @@
+import sqlite3
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from src.base_json import BaseClass
+from src.compression import open_text
+from src.json_saver import CONFLICT_MODES, read_tombstones
+from src.json_stream import iter_json_array
+from src.query import SALARY_FIELDS, Predicate, Query
+from src.salary import parse_salary
+from src.vacancies_hh import Vacancy, vacancy_key
+
+COLUMNS: Tuple[str, ...] = tuple(Vacancy.__slots__)
+INDEXED_COLUMNS = ('city', 'work_format', 'salary_from', 'salary_to', 'url', 'vacancy_id')
+BATCH_SIZE = 1000
+# Версия схемы (PRAGMA user_version): 1 — зарплаты хранятся только числами или NULL
+SCHEMA_VERSION = 1
+
+
+class SQLiteSaver(BaseClass):
+    """Хранилище вакансий в SQLite: индексы по городу, формату работы, зарплате и ссылке,
+    журнал WAL для одновременного чтения во время записи и пакетная вставка в транзакциях."""
+
+    def __init__(self, file_path: str = "data/vacancies.db") -> None:
+        self.__file_path = Path(file_path)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(self.__file_path, check_same_thread=False)
+        self.__connection.row_factory = sqlite3.Row
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__create_schema()
+
+    @staticmethod
+    def __column_sql(column: str) -> str:
+        return f"{column} INTEGER" if column in SALARY_FIELDS else column
+
+    def __create_schema(self) -> None:
+        """Создание таблицы и индексов; недостающие колонки добавляются к существующей таблице,
+        данные старых версий схемы приводятся к текущей."""
+        with self.__lock, self.__connection:
+            columns = ", ".join(map(self.__column_sql, COLUMNS))
+            self.__connection.execute(f"CREATE TABLE IF NOT EXISTS vacancies (key TEXT PRIMARY KEY, {columns})")
+            existing = {row["name"] for row in self.__connection.execute("PRAGMA table_info(vacancies)")}
+            for column in COLUMNS:
+                if column not in existing:
+                    self.__connection.execute(f"ALTER TABLE vacancies ADD COLUMN {self.__column_sql(column)}")
+            for column in INDEXED_COLUMNS:
+                self.__connection.execute(f"CREATE INDEX IF NOT EXISTS idx_vacancies_{column} ON vacancies({column})")
+            if self.__connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self.__normalize_salaries()
+                self.__connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __normalize_salaries(self) -> None:
+        """Миграция: заглушки вроде "Зарплата не указана" и числа в строках, сохранённые старыми версиями,
+        заменяются на NULL и целые числа. Иначе SQLite сравнивает текст с числами не так,
+        как остальные хранилища (текст больше любого числа)."""
+        untyped = " OR ".join(f"typeof({column}) NOT IN ('integer', 'null')" for column in SALARY_FIELDS)
+        rows = self.__connection.execute(f"SELECT key, {', '.join(SALARY_FIELDS)} FROM vacancies WHERE {untyped}")
+        self.__connection.executemany(
+            f"UPDATE vacancies SET {', '.join(f'{column} = ?' for column in SALARY_FIELDS)} WHERE key = ?",
+            [tuple(parse_salary(row[column]) for column in SALARY_FIELDS) + (row["key"],) for row in rows.fetchall()],
+        )
+
+    @property
+    def file_path(self) -> Path:
+        """Путь к файлу базы данных."""
+        return self.__file_path
+
+    def __enter__(self) -> "SQLiteSaver":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрытие соединения с базой данных."""
+        self.__connection.close()
+
+    @staticmethod
+    def __insert_sql(on_conflict: str) -> str:
+        columns = ", ".join(("key",) + COLUMNS)
+        placeholders = ", ".join("?" * (len(COLUMNS) + 1))
+        if on_conflict == "skip":
+            return f"INSERT OR IGNORE INTO vacancies ({columns}) VALUES ({placeholders})"
+        if on_conflict == "replace":
+            return f"INSERT OR REPLACE INTO vacancies ({columns}) VALUES ({placeholders})"
+        updates = ", ".join(f"{column} = COALESCE(excluded.{column}, {column})" for column in COLUMNS)
+        return f"INSERT INTO vacancies ({columns}) VALUES ({placeholders}) ON CONFLICT(key) DO UPDATE SET {updates}"
+
+    def __insert_rows(self, rows: Iterable[Dict[str, Any]], on_conflict: str = "skip") -> None:
+        """Пакетная вставка словарей вакансий, по BATCH_SIZE строк в транзакции."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Неизвестный режим on_conflict: {on_conflict}")
+        sql = self.__insert_sql(on_conflict)
+        rows = ({**row, **{column: parse_salary(row.get(column)) for column in SALARY_FIELDS}} for row in rows)
+        values = ((vacancy_key(row),) + tuple(row.get(column) for column in COLUMNS) for row in rows)
+        while batch := list(islice(values, BATCH_SIZE)):
+            with self.__lock, self.__connection:
+                self.__connection.executemany(sql, batch)
+
+    def add_vacancy(self, vacancies: Union[Vacancy, Iterable[Vacancy]], on_conflict: str = "skip") -> None:
+        """Метод для добавления вакансий в базу данных."""
+        if isinstance(vacancies, Vacancy):
+            vacancies = [vacancies]
+        self.__insert_rows((vacancy.to_dict() for vacancy in vacancies), on_conflict)
+
+    def import_json(self, file_path: str) -> None:
+        """Миграция: перенос вакансий из JSON-файла, сохранённого JSONSaver. Файл читается потоково
+        без изменений (удалённые по журналу надгробий пропускаются), зарплаты приводятся к числам."""
+        if not Path(file_path).is_file():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+        dead = read_tombstones(file_path)
+        with open_text(file_path) as file:
+            self.__insert_rows(item for item in iter_json_array(file) if not dead or vacancy_key(item) not in dead)
+
+    @staticmethod
+    def __where(criteria: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Условие WHERE для проверки равенства по всем ключам критериев."""
+        conditions = []
+        params = []
+        for key, value in criteria.items():
+            if key not in COLUMNS:
+                if value is None:
+                    continue
+                return " WHERE 0", []
+            if value is None:
+                conditions.append(f"{key} IS NULL")
+            else:
+                conditions.append(f"{key} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def iter_data(self, criteria: Union[Dict, Vacancy, None] = None) -> Iterator[Dict[str, Any]]:
+        """Генератор записей, удовлетворяющих критериям, в порядке добавления."""
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        where, params = self.__where(criteria or {})
+        cursor = self.__connection.execute(f"SELECT {', '.join(COLUMNS)} FROM vacancies{where} ORDER BY rowid", params)
+        for row in cursor:
+            yield dict(row)
+
+    def load_data(self) -> List[Dict]:
+        """Метод для загрузки всех вакансий."""
+        return list(self.iter_data())
+
+    def get_vacancy(self, criteria: Union[Dict, Vacancy, Query, Predicate]) -> list:
+        """Метод для получения данных по заданным критериям через индексы.
+        Вместо словаря можно передать запрос Query или условие (см. src.query)."""
+        if isinstance(criteria, (Query, Predicate)):
+            return self.query(criteria)
+        return list(self.iter_data(criteria))
+
+    def query(self, query: Union[Query, Predicate, Dict]) -> List[Dict[str, Any]]:
+        """Метод выполнения запроса (src.query): условия, переводимые в SQL, сортировка и limit выполняются
+        базой данных с её индексами, остальные условия (подстрока, полнотекстовое) проверяются в Python."""
+        query = Query.coerce(query)
+        where, params, residual = query.split_sql(COLUMNS)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM vacancies"
+        if where:
+            sql += f" WHERE {where}"
+        if query.sort_field is not None:
+            if query.sort_field not in COLUMNS:
+                raise ValueError(f"Неизвестное поле сортировки: {query.sort_field}")
+            direction = "DESC" if query.descending else "ASC"
+            sql += f" ORDER BY {query.sort_field} IS NULL, {query.sort_field} {direction}, rowid"
+        else:
+            sql += " ORDER BY rowid"
+        if query.limit_count is not None and residual is None:
+            sql += " LIMIT ?"
+            params = params + [query.limit_count]
+        rows = (dict(row) for row in self.__connection.execute(sql, params))
+        if residual is not None:
+            rows = (row for row in rows if residual.matches(row))
+        return list(islice(rows, query.limit_count))
+
+    def delete_vacancy(self, criteria: Union[Dict, Vacancy]) -> None:
+        """Метод для удаления вакансии."""
+        if isinstance(criteria, Vacancy):
+            criteria = criteria.to_dict()
+        where, params = self.__where(criteria)
+        with self.__lock, self.__connection:
+            self.__connection.execute(f"DELETE FROM vacancies{where}", params)
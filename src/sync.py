@@ -0,0 +1,117 @@
+import json
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.bulk_parser import parse_vacancies
+from src.harvest import DATE_STEP, RESULTS_LIMIT, HarvestPlanner
+from src.hh import HeadHunterAPI
+from src.json_saver import JSONSaver
+from src.vacancies_hh import Vacancy
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+PER_PAGE = 100
+
+
+class SyncError(Exception):
+    """Выгрузка по запросу получена не полностью; отметка синхронизации не сдвигается."""
+
+
+class IncrementalSync:
+    """Инкрементальная синхронизация вакансий: по каждому запросу хранится
+    отметка времени последней загруженной публикации, и при следующем запуске
+    запрашиваются только более новые вакансии. Отметка сдвигается, только если
+    выгрузка полная: загружены все найденные вакансии и ни один запрос не завершился ошибкой."""
+
+    def __init__(self, api: HeadHunterAPI, storage: JSONSaver, state_path: Optional[str] = None,
+                 planner: Optional[HarvestPlanner] = None) -> None:
+        self.__api = api
+        self.__storage = storage
+        self.__planner = planner if planner is not None else HarvestPlanner(api, per_page=PER_PAGE, strict=True)
+        self.__state_path = Path(state_path) if state_path else storage.file_path.with_suffix('.sync.json')
+
+    def load_state(self) -> Dict[str, str]:
+        """Метод загрузки отметок последней синхронизации по запросам."""
+        try:
+            with open(self.__state_path, 'r', encoding='utf-8') as file:
+                state: Dict[str, str] = json.load(file)
+                return state
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            print(f'Ошибка при чтении файла синхронизации: {e}')
+            return {}
+
+    def save_state(self, state: Dict[str, str]) -> None:
+        """Метод сохранения отметок последней синхронизации."""
+        with open(self.__state_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False, indent=4)
+
+    @staticmethod
+    def __parse_date(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, DATE_FORMAT)
+        except ValueError:
+            return None
+
+    def __fetch(self, query: str, pages: int, mark: Optional[datetime], filters: Dict[str, Any],
+                now: datetime) -> List[Dict[str, Any]]:
+        """Загрузка всех вакансий по запросу. Если найденное не умещается в pages страниц
+        или в ограничение выдачи hh.ru, интервал дат делится планировщиком на подзапросы.
+        Ошибки запросов пробрасываются, неполная выгрузка — SyncError.
+        Все страницы запрашиваются с date_to = now, чтобы новые публикации не сдвигали выдачу между запросами."""
+        filters = {**filters, 'date_to': now.strftime(DATE_FORMAT)}
+        first = self.__api.fetch(query, 0, per_page=PER_PAGE, **filters)
+        expected = int(first.get('found', 0))
+        if expected <= min(pages * PER_PAGE, RESULTS_LIMIT):
+            items: List[Dict[str, Any]] = list(first.get('items', []))
+            for page in range(1, math.ceil(expected / PER_PAGE)):
+                items.extend(self.__api.fetch(query, page, per_page=PER_PAGE, **filters).get('items', []))
+        else:
+            since = mark - DATE_STEP if mark is not None else None
+            plan = self.__planner.plan(query, now=now, since=since, order_by=filters['order_by'])
+            if any(planned['found'] > RESULTS_LIMIT for planned in plan):
+                raise SyncError(f'Запрос {query!r} не удалось разделить на подзапросы в пределах выдачи hh.ru')
+            expected = sum(planned['found'] for planned in plan)
+            items = self.__planner.fetch_plan(query, plan)
+
+        fetched = len({item.get('id') for item in items})
+        if fetched < expected:
+            self.__storage.upsert_vacancy(self.__parse(items))
+            raise SyncError(f'Запрос {query!r}: загружено {fetched} из {expected} вакансий')
+        return items
+
+    @staticmethod
+    def __parse(items: List[Dict[str, Any]]) -> List[Vacancy]:
+        vacancies, errors = parse_vacancies([{'items': items}])
+        for error in errors:
+            print(f'Некорректная вакансия: {error.error}')
+        return vacancies
+
+    def run(self, query: str, pages: int = 20, now: Optional[datetime] = None) -> List[Vacancy]:
+        """Метод загрузки вакансий, опубликованных после прошлой синхронизации по запросу.
+        Новые вакансии добавляются, уже сохранённые с тем же id заменяются.
+        Если найдено больше, чем помещается в pages страниц, интервал делится на подзапросы;
+        при первом запуске такой запрос охватывает горизонт планировщика (window_days).
+        При ошибке запроса или неполной выгрузке исключение пробрасывается, отметка не сохраняется."""
+        state = self.load_state()
+        mark = self.__parse_date(state.get(query))
+        filters = {'order_by': 'publication_time'}
+        if mark is not None:
+            filters['date_from'] = state[query]
+
+        now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        vacancies = self.__parse(self.__fetch(query, pages, mark, filters, now))
+        self.__storage.upsert_vacancy(vacancies)
+
+        for vacancy in vacancies:
+            published = self.__parse_date(vacancy.published_at)
+            if published is not None and (mark is None or published > mark):
+                mark = published
+        if mark is not None:
+            state[query] = mark.strftime(DATE_FORMAT)
+        self.save_state(state)
+        return vacancies
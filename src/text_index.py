@@ -0,0 +1,138 @@
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.safe_io import atomic_write
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+CYRILLIC_PATTERN = re.compile(r"[а-я]")
+# Окончания, которые отбрасываются у русских слов (от длинных к коротким)
+RUSSIAN_SUFFIXES = sorted(
+    (
+        "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ией", "ость", "ости",
+        "ая", "яя", "ое", "ее", "ые", "ие", "ый", "ий", "ой", "ом", "ем", "ам", "ям", "ах", "ях",
+        "ов", "ев", "ей", "ия", "ии", "ию", "ью", "ть", "ешь", "ет", "ют", "ут", "ит", "ат", "ят",
+        "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+    ),
+    key=len,
+    reverse=True,
+)
+MIN_STEM_LENGTH = 3
+
+
+def normalize_token(token: str) -> str:
+    """Нормализация слова: нижний регистр, ё -> е и отбрасывание русского окончания."""
+    token = token.lower().replace("ё", "е")
+    if CYRILLIC_PATTERN.search(token):
+        for suffix in RUSSIAN_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+                return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Разбиение текста на нормализованные слова."""
+    if not text:
+        return []
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text)]
+
+
+class InvertedIndex:
+    """Инвертированный индекс по тексту требований вакансий с ранжированием по TF-IDF.
+    На диске хранятся частоты слов по документам, списки вхождений строятся при загрузке."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.__path = Path(path) if path else None
+        self.__documents: Dict[str, Dict[str, int]] = {}
+        self.__postings: Dict[str, Dict[str, int]] = {}
+        self.signature: Optional[Any] = None
+        if self.__path is not None and self.__path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.__documents)
+
+    def add(self, key: str, text: Optional[str]) -> None:
+        """Метод добавления (или замены) документа в индексе."""
+        self.remove(key)
+        frequencies = Counter(tokenize(text))
+        if not frequencies:
+            return
+        self.__documents[key] = dict(frequencies)
+        for token, count in frequencies.items():
+            self.__postings.setdefault(token, {})[key] = count
+
+    def remove(self, key: str) -> None:
+        """Метод удаления документа из индекса."""
+        for token in self.__documents.pop(key, {}):
+            postings = self.__postings.get(token)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.__postings[token]
+
+    def rebuild(self, documents: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Метод полного перестроения индекса по парам (ключ, текст)."""
+        self.__documents = {}
+        self.__postings = {}
+        for key, text in documents:
+            self.add(key, text)
+
+    def search(self, query: str, mode: str = "and", limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Метод поиска: mode="and" — документы со всеми словами запроса, "or" — хотя бы с одним.
+        Возвращает пары (ключ, релевантность) по убыванию релевантности."""
+        if mode not in ("and", "or"):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        postings = [self.__postings.get(token, {}) for token in tokens]
+        candidates: Set[str] = set()
+        if mode == "and":
+            if not all(postings):
+                return []
+            smallest: Dict[str, int] = min(postings, key=len)
+            candidates.update(smallest)
+            for entries in postings:
+                candidates.intersection_update(entries)
+        else:
+            for entries in postings:
+                candidates.update(entries)
+
+        total = len(self.__documents)
+        scores = []
+        for key in candidates:
+            score = sum(
+                entries[key] * math.log(1 + total / len(entries)) for entries in postings if key in entries
+            )
+            scores.append((key, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit] if limit is not None else scores
+
+    def load(self) -> None:
+        """Метод загрузки индекса с диска."""
+        if self.__path is None:
+            return
+        try:
+            with open(self.__path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка при чтении индекса: {e}")
+            return
+        self.signature = content.get("signature")
+        self.__documents = {}
+        self.__postings = {}
+        for key, frequencies in content.get("documents", {}).items():
+            self.__documents[key] = frequencies
+            for token, count in frequencies.items():
+                self.__postings.setdefault(token, {})[key] = count
+
+    def save(self) -> None:
+        """Метод сохранения индекса на диск."""
+        if self.__path is None:
+            return
+        with atomic_write(self.__path) as file:
+            json.dump({"signature": self.signature, "documents": self.__documents}, file, ensure_ascii=False)
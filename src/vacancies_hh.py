@@ -1,40 +1,118 @@
-from typing import Any, Dict, List
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.salary import DEFAULT_RATES, parse_salary, salary_value
+
+# Поля, по содержимому которых определяется вакансия без id с hh.ru
+IDENTITY_FIELDS = ('name_vacancy', 'url', 'salary_from', 'salary_to', 'city', 'requirement', 'work_format')
+SALARY_FIELDS = ('salary_from', 'salary_to')
+
+
+def vacancy_key(data: Dict[str, Any]) -> str:
+    """Стабильный ключ вакансии: id с hh.ru, если он есть, иначе хэш содержимого.
+    Зарплаты хэшируются после parse_salary, поэтому запись старого формата с заглушкой
+    "Зарплата не указана" и та же вакансия с None получают один ключ."""
+    if data.get('vacancy_id'):
+        return f"id:{data['vacancy_id']}"
+    raw = json.dumps([parse_salary(data.get(field)) if field in SALARY_FIELDS else data.get(field)
+                      for field in IDENTITY_FIELDS], ensure_ascii=False, default=str)
+    return f"sha1:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def _intern(value: Any) -> Any:
+    """Интернирование часто повторяющихся строк: одинаковые значения разделяют один объект."""
+    return sys.intern(value) if type(value) is str else value
+
+
+NOT_SPECIFIED = 'Не указано'
+
+
+def extract_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля вакансии из элемента выдачи API за один проход; остальные поддеревья не просматриваются.
+    Повторяющиеся строки интернируются. Для некорректного элемента выбрасывается исключение."""
+    area = item['area']
+    roles = item.get('professional_roles')
+    formats = item.get('work_format')
+    snippet = item.get('snippet') or {}
+    salary = item.get('salary') or {}
+    name_vacancy = sys.intern(roles[0]['name']) if roles else NOT_SPECIFIED
+    url = area['url']
+    if not name_vacancy or not url:
+        raise ValueError("Название вакансии и URL обязательны.")
+    currency = salary.get('currency')
+    return {
+        'name_vacancy': name_vacancy,
+        'url': url,
+        'salary_from': salary.get('from'),
+        'salary_to': salary.get('to'),
+        'city': sys.intern(area['name']),
+        'requirement': snippet.get('requirement'),
+        'work_format': sys.intern(formats[0]['name']) if formats else NOT_SPECIFIED,
+        'vacancy_id': item.get('id'),
+        'published_at': item.get('published_at'),
+        'salary_currency': sys.intern(currency) if currency else currency,
+        'salary_gross': salary.get('gross'),
+    }
 
 
 class Vacancy:
     """Класс для работы с вакансиями."""
     __slots__ = ('name_vacancy', 'url', 'salary_from', 'salary_to', 'city',
-                 'requirement', 'work_format')
-    list_vacancies: list['Vacancy'] = []
+                 'requirement', 'work_format', 'vacancy_id', 'published_at',
+                 'salary_currency', 'salary_gross')
 
     def __init__(self, name_vacancy: str, url: str, salary_from: Any, salary_to: Any,
-                 city: str, requirement: str, work_format: str):
-        self.name_vacancy = name_vacancy
+                 city: str, requirement: str, work_format: str,
+                 vacancy_id: Optional[str] = None, published_at: Optional[str] = None,
+                 salary_currency: Optional[str] = None, salary_gross: Optional[bool] = None):
+        self.name_vacancy = _intern(name_vacancy)
         self.url = url
-        self.salary_from = salary_from
-        self.salary_to = salary_to
-        self.city = city
+        self.salary_from = parse_salary(salary_from)
+        self.salary_to = parse_salary(salary_to)
+        self.city = _intern(city)
         self.requirement = requirement
-        self.work_format = work_format
-        self.list_vacancies.append(self)
+        self.work_format = _intern(work_format)
+        self.vacancy_id = vacancy_id
+        self.published_at = published_at
+        self.salary_currency = _intern(salary_currency)
+        self.salary_gross = salary_gross
         self.__validate()
 
     def __repr__(self) -> str:
         """Строковое представление итоговой информации вакансий."""
         return (f'\nНазвание вакансии: {self.name_vacancy}\n'
                 f'Ссылка на вакансию: {self.url}\n'
-                f'Зарплата: {self.salary_from} - {self.salary_to}\n'
+                f'Зарплата: {self.__format_salary()}\n'
                 f'Город: {self.city}\n'
                 f'Требования: {self.requirement}\n'
                 f'Формат работы: {self.work_format}\n')
 
+    def __format_salary(self) -> str:
+        """Зарплата для вывода: отсутствующие границы заменяются пояснением."""
+        if self.salary_from is None and self.salary_to is None:
+            return 'Зарплата не указана'
+        salary_from = self.salary_from if self.salary_from is not None else 'Стартовая зарплата не указана'
+        salary_to = self.salary_to if self.salary_to is not None else 'Итоговая зарплата не указана'
+        currency = f' {self.salary_currency}' if self.salary_currency else ''
+        return f'{salary_from} - {salary_to}{currency}'
+
+    @property
+    def salary(self) -> float:
+        """Зарплата одним числом в рублях по курсам DEFAULT_RATES (среднее указанных границ),
+        0 если зарплата не указана."""
+        return salary_value(self.to_dict(), DEFAULT_RATES) or 0
+
     def __lt__(self, other: "Vacancy") -> Any:
         """Метод сравнения вакансий по минимальной зарплате"""
-        return (self.salary_from + self.salary_to) / 2 < (other.salary_from + other.salary_to) / 2
+        return self.salary < other.salary
 
     def __gt__(self, other: "Vacancy") -> Any:
         """Метод сравнения вакансий по максимальной зарплате"""
-        return (self.salary_from + self.salary_to) / 2 > (other.salary_from + other.salary_to) / 2
+        return self.salary > other.salary
 
     def __validate(self) -> None:
         """Приватный метод для валидации данных вакансии"""
@@ -43,22 +121,20 @@ class Vacancy:
 
     @classmethod
     def receiving_vacancies_list(cls, list_vacancies: List[Dict[str, Any]]) -> list['Vacancy']:
-        """Метод получения данных по каждой вакансии."""
-        cls.list_vacancies = []
-        for vacancy in list_vacancies:
-            name_vacancy = vacancy['professional_roles'][0]['name'] if vacancy['professional_roles'] else 'Не указано'
-            url = vacancy['area']['url']
-            requirement = vacancy['snippet']['requirement']
-            work_format = vacancy['work_format'][0]['name'] if vacancy['work_format'] else 'Не указано'
-            city = vacancy['area']['name']
-            salary_from = vacancy['salary']['from'] if vacancy['salary'] else 'Зарплата не указана'
-            if not salary_from:
-                salary_from = 'Стартовая зарплата не указана'
-            salary_to = vacancy['salary']['to'] if vacancy['salary'] else 'Зарплата не указана'
-            if not salary_to:
-                salary_to = 'Итоговая зарплата не указана'
-            cls(name_vacancy, url, salary_from, salary_to, city, requirement, work_format)
-        return cls.list_vacancies
+        """Метод получения данных по каждой вакансии: пакетное создание объектов из выдачи API.
+        Некорректные вакансии пропускаются с сообщением и не прерывают разбор остальных."""
+        # Отложенный импорт: src.bulk_parser сам зависит от Vacancy
+        from src.bulk_parser import parse_vacancies
+
+        vacancies, errors = parse_vacancies({'items': list_vacancies})
+        for error in errors:
+            print(f'Некорректная вакансия: {error.error}')
+        return vacancies
+
+    @classmethod
+    def from_api(cls, vacancy: Dict[str, Any]) -> "Vacancy":
+        """Создание вакансии из элемента выдачи API hh.ru."""
+        return cls(**extract_fields(vacancy))
 
     @classmethod
     def from_dict(cls, data: dict) -> "Vacancy":
@@ -69,7 +145,11 @@ class Vacancy:
             salary_to=data["salary_to"],
             city=data["city"],
             requirement=data["requirement"],
-            work_format=data["work_format"]
+            work_format=data["work_format"],
+            vacancy_id=data.get("vacancy_id"),
+            published_at=data.get("published_at"),
+            salary_currency=data.get("salary_currency"),
+            salary_gross=data.get("salary_gross")
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -80,4 +160,208 @@ class Vacancy:
                 'salary_to': self.salary_to,
                 'city': self.city,
                 'requirement': self.requirement,
-                'work_format': self.work_format}
+                'work_format': self.work_format,
+                'vacancy_id': self.vacancy_id,
+                'published_at': self.published_at,
+                'salary_currency': self.salary_currency,
+                'salary_gross': self.salary_gross}
+
+
+# Колонки с небольшим числом различных значений хранятся кодами в словарь значений
+CATEGORICAL_FIELDS = ('city', 'work_format', 'salary_currency')
+NUMERIC_FIELDS = ('salary_from', 'salary_to')
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+
+class VacancyCollection:
+    """Колоночное хранилище вакансий на массивах NumPy для векторных фильтров, сортировки и агрегатов.
+    Зарплаты хранятся как float64 (NaN — не указана), город, формат работы и валюта — кодами категорий.
+    Объекты Vacancy создаются только при обращении к конкретным строкам."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, np.ndarray]) -> None:
+        self.__columns = columns
+        self.__categories = categories
+        self.__lookup = {field: {value: code for code, value in enumerate(values)}
+                         for field, values in categories.items()}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "VacancyCollection":
+        """Создание коллекции из словарей вакансий (например, JSONSaver.iter_data()) за один проход."""
+        raw: Dict[str, List[Any]] = {field: [] for field in Vacancy.__slots__}
+        codes: Dict[str, Dict[Any, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+        for record in records:
+            for field in Vacancy.__slots__:
+                value = record.get(field)
+                if field in codes:
+                    value = codes[field].setdefault(value, len(codes[field]))
+                elif field in NUMERIC_FIELDS:
+                    value = parse_salary(value)
+                    value = np.nan if value is None else value
+                elif field == 'name_vacancy':
+                    value = _intern(value)
+                raw[field].append(value)
+
+        columns: Dict[str, np.ndarray] = {}
+        for field, values in raw.items():
+            if field in codes:
+                columns[field] = np.array(values, dtype=np.int32)
+            elif field in NUMERIC_FIELDS:
+                columns[field] = np.array(values, dtype=np.float64)
+            else:
+                columns[field] = np.empty(len(values), dtype=object)
+                columns[field][:] = values
+        categories = {}
+        for field, mapping in codes.items():
+            categories[field] = np.empty(len(mapping), dtype=object)
+            categories[field][:] = list(mapping)
+        return cls(columns, categories)
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyCollection":
+        """Создание коллекции из объектов Vacancy."""
+        return cls.from_records(vacancy.to_dict() for vacancy in vacancies)
+
+    def __len__(self) -> int:
+        return len(self.__columns['name_vacancy'])
+
+    def __getitem__(self, position: int) -> Vacancy:
+        """Вакансия в заданной строке: объект создаётся при обращении."""
+        return Vacancy.from_dict(self.record(position))
+
+    def __iter__(self) -> Iterator[Vacancy]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """Словарь вакансии в заданной строке."""
+        record = {}
+        for field, column in self.__columns.items():
+            value = column[position]
+            if field in self.__categories:
+                value = self.__categories[field][value]
+            elif field in NUMERIC_FIELDS:
+                value = None if np.isnan(value) else int(value)
+            record[field] = value
+        return record
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Все вакансии коллекции в виде словарей."""
+        return [self.record(position) for position in range(len(self))]
+
+    def column(self, field: str) -> np.ndarray:
+        """Значения колонки; категориальные колонки раскодируются."""
+        if field in self.__categories:
+            decoded: np.ndarray = self.__categories[field][self.__columns[field]]
+            return decoded
+        if field == 'salary':
+            return self.salary()
+        return self.__columns[field]
+
+    def salary(self, rates: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Зарплата одним числом в рублях по курсам rates (по умолчанию DEFAULT_RATES): среднее указанных границ.
+        NaN — зарплата не указана или для её валюты нет курса; пустой rates оставляет суммы в исходных валютах."""
+        rates = DEFAULT_RATES if rates is None else rates
+        bounds = np.stack((self.__columns['salary_from'], self.__columns['salary_to']))
+        present = (~np.isnan(bounds)).sum(axis=0)
+        total = np.nansum(bounds, axis=0)
+        values: np.ndarray = np.divide(total, present, out=np.full(len(self), np.nan), where=present > 0)
+        if rates:
+            factors = np.array([rates.get(currency, np.nan) if currency else 1.0
+                                for currency in self.__categories['salary_currency']], dtype=np.float64)
+            if len(factors):
+                values *= factors[self.__columns['salary_currency']]
+        return values
+
+    def mask(self, **criteria: Any) -> np.ndarray:
+        """Булева маска строк, у которых поля равны значениям критериев.
+        Список, кортеж или множество в значении означает «одно из»."""
+        result: np.ndarray = np.ones(len(self), dtype=bool)
+        for field, value in criteria.items():
+            if field not in self.__columns:
+                raise KeyError(f"Неизвестное поле: {field}")
+            values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            if field in self.__categories:
+                wanted = [self.__lookup[field][item] for item in values if item in self.__lookup[field]]
+                result &= np.isin(self.__columns[field], wanted)
+            elif field in NUMERIC_FIELDS:
+                column = self.__columns[field]
+                wanted = [number for item in values if (number := parse_salary(item)) is not None]
+                matched = np.isin(column, np.array(wanted, dtype=np.float64))
+                result &= (matched | np.isnan(column)) if None in values else matched
+            else:
+                result &= np.isin(self.__columns[field], np.array(values, dtype=object))
+        return result
+
+    def salary_mask(self, low: Optional[float] = None, high: Optional[float] = None,
+                    field: str = 'salary', rates: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Маска строк с зарплатой в диапазоне [low, high]; строки без зарплаты не попадают."""
+        values = self.salary(rates) if field == 'salary' else self.__columns[field]
+        result: np.ndarray = ~np.isnan(values)
+        if low is not None:
+            result &= values >= low
+        if high is not None:
+            result &= values <= high
+        return result
+
+    def take(self, rows: np.ndarray) -> "VacancyCollection":
+        """Новая коллекция из строк по булевой маске или массиву номеров строк."""
+        columns = {field: column[rows] for field, column in self.__columns.items()}
+        return VacancyCollection(columns, self.__categories)
+
+    def filter(self, **criteria: Any) -> "VacancyCollection":
+        """Вакансии, удовлетворяющие критериям равенства (см. mask)."""
+        return self.take(self.mask(**criteria))
+
+    def salary_between(self, low: Optional[float] = None, high: Optional[float] = None,
+                       field: str = 'salary', rates: Optional[Dict[str, float]] = None) -> "VacancyCollection":
+        """Вакансии с зарплатой в диапазоне [low, high]."""
+        return self.take(self.salary_mask(low, high, field, rates))
+
+    def sort_by(self, field: str = 'salary', descending: bool = True,
+                rates: Optional[Dict[str, float]] = None) -> "VacancyCollection":
+        """Коллекция, отсортированная по числовому полю; вакансии без значения — в конце."""
+        values = self.salary(rates) if field == 'salary' else self.__columns[field]
+        keys = -values if descending else values
+        return self.take(np.argsort(keys, kind='stable'))
+
+    def top(self, n: int, field: str = 'salary', rates: Optional[Dict[str, float]] = None) -> "VacancyCollection":
+        """N вакансий с наибольшим значением поля: частичная сортировка за O(len) плюс сортировка n строк."""
+        values = self.salary(rates) if field == 'salary' else self.__columns[field]
+        rows = np.flatnonzero(~np.isnan(values))
+        if n <= 0 or not len(rows):
+            return self.take(rows[:0])
+        if n < len(rows):
+            rows = rows[np.argpartition(-values[rows], n - 1)[:n]]
+        rows = rows[np.argsort(-values[rows], kind='stable')]
+        return self.take(rows)
+
+    def group_by(self, field: str, aggregate: str = 'mean', value: str = 'salary',
+                 rates: Optional[Dict[str, float]] = None) -> Dict[Any, float]:
+        """Агрегат числового поля по значениям категориального: count, sum, mean, min или max.
+        Строки без значения поля value не учитываются."""
+        if field not in self.__categories:
+            raise ValueError(f"Группировка возможна только по полям {CATEGORICAL_FIELDS}")
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Неизвестный агрегат: {aggregate}")
+        values = self.salary(rates) if value == 'salary' else self.__columns[value]
+        present = ~np.isnan(values)
+        codes = self.__columns[field][present]
+        values = values[present]
+        size = len(self.__categories[field])
+        counts = np.bincount(codes, minlength=size)
+        result: np.ndarray
+        if aggregate == 'count':
+            result = counts.astype(np.float64)
+        elif aggregate in ('sum', 'mean'):
+            result = np.bincount(codes, weights=values, minlength=size)
+            if aggregate == 'mean':
+                result = np.divide(result, counts, out=np.full(size, np.nan), where=counts > 0)
+        else:
+            order = np.lexsort((values, codes))
+            codes, values = codes[order], values[order]
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+            reduce = np.minimum if aggregate == 'min' else np.maximum
+            result = np.full(size, np.nan)
+            if len(starts):
+                result[codes[starts]] = reduce.reduceat(values, starts)
+        return {self.__categories[field][code]: float(result[code]) for code in np.flatnonzero(counts)}
@@ -0,0 +1,70 @@
+import json
+from unittest.mock import patch
+
+from src.bulk_parser import ParseError, parse_collection, parse_records, parse_vacancies
+from src.vacancies_hh import Vacancy, extract_fields
+
+ITEM = {
+    "id": "1",
+    "published_at": "2025-01-01T10:00:00+0300",
+    "professional_roles": [{"name": "Программист"}],
+    "area": {"url": "https://api.hh.ru/areas/1", "name": "Москва"},
+    "snippet": {"requirement": "Python"},
+    "work_format": [{"name": "Удалённо"}],
+    "salary": {"from": 100, "to": 200, "currency": "RUR", "gross": True},
+    "employer": {"name": "Компания", "logo_urls": {"90": "x"}},
+}
+SECOND = {
+    "professional_roles": [],
+    "area": {"url": "https://api.hh.ru/areas/2", "name": "Казань"},
+    "snippet": None,
+    "work_format": [],
+    "salary": None,
+}
+
+
+def test_extract_fields_matches_from_api() -> None:
+    assert extract_fields(ITEM) == Vacancy.from_api(ITEM).to_dict()
+    assert extract_fields(SECOND)["name_vacancy"] == "Не указано"
+    assert extract_fields(SECOND)["requirement"] is None
+
+
+def test_parse_records_accepts_payloads_and_bytes() -> None:
+    payload = {"items": [ITEM, SECOND], "found": 2}
+    raw = json.dumps({"items": [ITEM]}).encode("utf-8")
+
+    records, errors = parse_records([payload, raw, [SECOND]])
+    assert [record["city"] for record in records] == ["Москва", "Казань", "Москва", "Казань"]
+    assert errors == []
+
+    records, errors = parse_records(raw)
+    assert len(records) == 1
+
+    records, errors = parse_records([ITEM, SECOND])
+    assert len(records) == 2
+
+
+def test_parse_records_without_orjson() -> None:
+    with patch("src.bulk_parser.orjson", None):
+        records, errors = parse_records(json.dumps({"items": [ITEM]}))
+    assert records == [extract_fields(ITEM)]
+
+
+def test_malformed_items_are_reported() -> None:
+    nameless = {"professional_roles": [{"name": ""}], "area": {"url": "u", "name": "c"}}
+    broken = [ITEM, {"area": None}, "строка", nameless]
+    records, errors = parse_records([{"items": broken}, b"{not json", {"items": {}}])
+
+    assert len(records) == 1
+    assert [(error.page, error.item) for error in errors] == [(0, 1), (0, 2), (0, 3), (1, -1), (2, -1)]
+    assert all(isinstance(error, ParseError) for error in errors)
+
+
+def test_parse_vacancies_and_collection() -> None:
+    vacancies, errors = parse_vacancies({"items": [ITEM, SECOND, {}]})
+    assert [vacancy.city for vacancy in vacancies] == ["Москва", "Казань"]
+    assert len(errors) == 1
+
+    collection, errors = parse_collection({"items": [ITEM, SECOND]})
+    assert len(collection) == 2
+    assert collection.group_by("city", "count") == {"Москва": 1.0}
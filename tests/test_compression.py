@@ -0,0 +1,41 @@
+import gzip
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.compression import codec_for, open_text, read_bytes
+from src.safe_io import atomic_write
+
+
+def test_codec_for() -> None:
+    assert codec_for("data/vacancies.json.gz") == "gzip"
+    assert codec_for("data/vacancies.json.ZST") == "zstd"
+    assert codec_for("data/vacancies.jsonl.lz4") == "lz4"
+    assert codec_for("data/vacancies.json") is None
+
+
+def test_gzip_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "data.json.gz"
+    with atomic_write(path) as file:
+        file.write("привет" * 1000)
+
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    assert path.stat().st_size < 1000
+    with open_text(path) as file:
+        assert file.read() == "привет" * 1000
+    assert read_bytes(path) == ("привет" * 1000).encode("utf-8")
+    assert gzip.decompress(path.read_bytes()).decode("utf-8") == "привет" * 1000
+
+
+def test_plain_files_are_not_compressed(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    with open_text(path, "w") as file:
+        file.write("[]")
+    assert read_bytes(path) == b"[]"
+
+
+def test_missing_codec_package(tmp_path: Path) -> None:
+    with patch("src.compression.zstandard", None):
+        with pytest.raises(ImportError):
+            open_text(tmp_path / "data.json.zst", "w")
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from src.harvest import DATE_FORMAT, RESULTS_LIMIT, HarvestPlanner
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class FakeAPI:
+    """API с набором вакансий, равномерно опубликованных за последние 30 дней."""
+
+    def __init__(self, count: int, areas: tuple = ("1",)) -> None:
+        step = timedelta(days=30) / count
+        self.vacancies = [
+            {"id": str(i), "area": areas[i % len(areas)],
+             "published_at": (NOW - step * (i + 0.5)).replace(microsecond=0)}
+            for i in range(count)
+        ]
+        self.calls = 0
+
+    def search(self, keyword: str, page: int = 0, **filters: Any) -> Optional[Dict[str, Any]]:
+        self.calls += 1
+        date_from = datetime.strptime(filters["date_from"], DATE_FORMAT)
+        date_to = datetime.strptime(filters["date_to"], DATE_FORMAT)
+        matched: List[Dict[str, Any]] = [
+            vacancy
+            for vacancy in self.vacancies
+            if date_from <= vacancy["published_at"] <= date_to
+            and ("area" not in filters or vacancy["area"] == filters["area"])
+        ]
+        per_page = filters["per_page"]
+        if (page + 1) * per_page > RESULTS_LIMIT:
+            return {"found": len(matched), "items": []}
+        return {"found": len(matched), "items": matched[page * per_page:(page + 1) * per_page]}
+
+
+def test_plan_small_query_is_not_split() -> None:
+    """Запрос в пределах ограничения выдачи не делится."""
+    planner = HarvestPlanner(FakeAPI(500))  # type: ignore[arg-type]
+
+    plan = planner.plan("python", now=NOW)
+
+    assert len(plan) == 1
+    assert plan[0]["found"] == 500
+
+
+def test_plan_splits_by_date_window() -> None:
+    """Запрос сверх ограничения делится на подзапросы в пределах ограничения."""
+    planner = HarvestPlanner(FakeAPI(5000))  # type: ignore[arg-type]
+
+    plan = planner.plan("python", now=NOW)
+
+    assert len(plan) > 1
+    assert all(query["found"] <= RESULTS_LIMIT for query in plan)
+    assert sum(query["found"] for query in plan) == 5000
+
+
+def test_plan_windows_are_disjoint() -> None:
+    """Окна подзапросов не пересекаются и без пропусков покрывают интервал (since, now]."""
+    api = FakeAPI(5000)
+    since = NOW - timedelta(days=10)
+    planner = HarvestPlanner(api)  # type: ignore[arg-type]
+
+    windows = sorted(
+        (datetime.strptime(query["date_from"], DATE_FORMAT), datetime.strptime(query["date_to"], DATE_FORMAT))
+        for query in planner.plan("python", now=NOW, since=since)
+    )
+
+    assert windows[0][0] == since + timedelta(seconds=1)
+    assert windows[-1][1] == NOW
+    assert all(previous[1] + timedelta(seconds=1) == current[0] for previous, current in zip(windows, windows[1:]))
+
+
+def test_plan_boundary_vacancy_counted_once() -> None:
+    """Вакансия, опубликованная ровно на границе окон, попадает только в одно окно."""
+    api = FakeAPI(3000)
+    api.vacancies.append({"id": "boundary", "area": "1", "published_at": NOW - timedelta(days=15)})
+    planner = HarvestPlanner(api)  # type: ignore[arg-type]
+
+    assert sum(query["found"] for query in planner.plan("python", now=NOW)) == 3001
+
+
+def test_harvest_returns_complete_deduplicated_set() -> None:
+    """Выгрузка широкого запроса возвращает все вакансии без дублей."""
+    api = FakeAPI(4500, areas=("1", "2"))
+    planner = HarvestPlanner(api, max_workers=4)  # type: ignore[arg-type]
+
+    vacancies = planner.harvest("python", areas=["1", "2"], now=NOW)
+
+    assert len(vacancies) == 4500
+    assert len({vacancy["id"] for vacancy in vacancies}) == 4500
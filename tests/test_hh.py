@@ -4,6 +4,8 @@ import pytest
 import requests
 
 from src.hh import HeadHunterAPI
+from src.rate_limit import RateLimiter
+from src.vacancies_hh import Vacancy
 
 
 @pytest.fixture
@@ -81,3 +83,102 @@ def test_receiving_vacancies_mock(hh_api: HeadHunterAPI) -> None:
         result = hh_api.receiving_vacancies("python", 1)
         mock_connect.assert_called_once_with("python", 1)
         assert result == []
+
+
+def _page_response(params: dict, status_code: int = 200) -> MagicMock:
+    """Ответ API, в котором номер вакансии совпадает с номером страницы."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = {"items": [{"id": params["page"], "name": f"Страница {params['page']}"}]}
+    return response
+
+
+@patch("requests.Session.get")
+def test_receiving_vacancies_concurrent_keeps_page_order(mock_get: MagicMock) -> None:
+    """Параллельная загрузка возвращает страницы в исходном порядке."""
+    mock_get.side_effect = lambda url, params, **kwargs: _page_response(params)
+    hh_api = HeadHunterAPI(max_workers=4, rate_limiter=RateLimiter(rate=1000))
+
+    vacancies = hh_api.receiving_vacancies("python", pages=10)
+    hh_api.close()
+
+    assert [vacancy["id"] for vacancy in vacancies] == list(range(10))
+    assert mock_get.call_count == 10
+
+
+@patch("requests.Session.get")
+def test_receiving_vacancies_concurrent_stops_on_error(mock_get: MagicMock) -> None:
+    """При ошибочном статусе страницы после неё не попадают в результат."""
+    mock_get.side_effect = lambda url, params, **kwargs: _page_response(params, 404 if params["page"] == 2 else 200)
+    hh_api = HeadHunterAPI(max_workers=3)
+
+    vacancies = hh_api.receiving_vacancies("python", pages=5)
+
+    assert [vacancy["id"] for vacancy in vacancies] == [0, 1]
+
+
+@patch("requests.get")
+def test_receiving_vacancies_not_accumulated(mock_get: MagicMock, hh_api: HeadHunterAPI) -> None:
+    """Повторный вызов возвращает только результаты нового запроса."""
+    mock_get.side_effect = lambda url, headers, params: _page_response(params)
+
+    hh_api.receiving_vacancies("python", pages=2)
+    vacancies = hh_api.receiving_vacancies("java", pages=1)
+
+    assert [vacancy["id"] for vacancy in vacancies] == [0]
+    assert mock_get.call_args.kwargs["params"]["text"] == "java"
+
+
+@patch("requests.get")
+def test_iter_vacancies_is_lazy(mock_get: MagicMock, hh_api: HeadHunterAPI) -> None:
+    """Генератор загружает следующую страницу только по мере потребления."""
+    mock_get.side_effect = lambda url, headers, params: _page_response(params)
+
+    iterator = hh_api.iter_vacancies("python", pages=3)
+    first = next(iterator)
+
+    assert first["id"] == 0
+    assert mock_get.call_count == 1
+    assert [vacancy["id"] for vacancy in iterator] == [1, 2]
+    assert repr(hh_api) == "[]"
+
+
+@patch("requests.get")
+def test_iter_vacancies_as_objects(mock_get: MagicMock, hh_api: HeadHunterAPI) -> None:
+    """Генератор может выдавать объекты Vacancy."""
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        "items": [
+            {
+                "professional_roles": [{"name": "Программист"}],
+                "area": {"url": "https://api.hh.ru/areas/1", "name": "Москва"},
+                "snippet": {"requirement": "Python"},
+                "work_format": [],
+                "salary": None,
+            }
+        ]
+    }
+    mock_get.return_value = response
+
+    vacancies = list(hh_api.iter_vacancies("python", as_objects=True))
+
+    assert len(vacancies) == 1
+    assert isinstance(vacancies[0], Vacancy)
+    assert vacancies[0].city == "Москва"
+
+
+@patch("requests.get")
+def test_fetch_raises_on_error(mock_get: MagicMock, hh_api: HeadHunterAPI) -> None:
+    """fetch() пробрасывает ошибки, search() скрывает их и возвращает None."""
+    mock_response = MagicMock()
+    mock_response.status_code = 404
+    mock_get.return_value = mock_response
+
+    with pytest.raises(requests.HTTPError):
+        hh_api.fetch("python")
+    assert hh_api.search("python") is None
+
+    mock_get.side_effect = requests.exceptions.RequestException("Сетевая ошибка")
+    with pytest.raises(requests.RequestException):
+        hh_api.fetch("python")
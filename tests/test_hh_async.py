@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.hh_async import AsyncHeadHunterAPI  # noqa: E402
+
+
+class FakeResponse:
+    """Ответ, имитирующий aiohttp.ClientResponse."""
+
+    def __init__(self, status: int, payload: Dict[str, Any]) -> None:
+        self.status = status
+        self.payload = payload
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    async def json(self) -> Dict[str, Any]:
+        return self.payload
+
+
+class FakeSession:
+    """Сессия, отдающая по одной вакансии на страницу."""
+
+    def __init__(self, failed_page: int = -1) -> None:
+        self.failed_page = failed_page
+        self.calls: List[Dict[str, Any]] = []
+
+    def get(self, url: str, params: Dict[str, Any]) -> FakeResponse:
+        self.calls.append(params)
+        if params["page"] == self.failed_page:
+            return FakeResponse(503, {})
+        return FakeResponse(200, {"items": [{"id": params["page"], "name": params["text"]}]})
+
+
+def test_receiving_vacancies() -> None:
+    """Тест асинхронного получения нескольких страниц."""
+    session = FakeSession()
+    api = AsyncHeadHunterAPI(session=session)
+
+    vacancies = asyncio.run(api.receiving_vacancies("python", pages=3))
+
+    assert [vacancy["id"] for vacancy in vacancies] == [0, 1, 2]
+    assert len(session.calls) == 3
+
+
+def test_receiving_vacancies_error_page() -> None:
+    """Страницы после ошибочной отбрасываются."""
+    api = AsyncHeadHunterAPI(session=FakeSession(failed_page=1))
+
+    vacancies = asyncio.run(api.receiving_vacancies("python", pages=3))
+
+    assert [vacancy["id"] for vacancy in vacancies] == [0]
+
+
+def test_receiving_many() -> None:
+    """Тест получения вакансий по нескольким запросам сразу."""
+    api = AsyncHeadHunterAPI(session=FakeSession())
+
+    result = asyncio.run(api.receiving_many(["python", "java"], pages=2))
+
+    assert list(result) == ["python", "java"]
+    assert all(vacancy["name"] == "java" for vacancy in result["java"])
+    assert len(result["python"]) == 2
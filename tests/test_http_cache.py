@@ -0,0 +1,90 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.hh import HeadHunterAPI
+from src.http_cache import ResponseCache
+
+URL = "https://api.hh.ru/vacancies"
+
+
+def _response(status_code: int, payload: dict, headers: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.headers = headers
+    return response
+
+
+def test_set_and_get(tmp_path: Path) -> None:
+    """Тест на сохранение и чтение записи кэша."""
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.set(URL, {"text": "python", "page": 0}, {"items": [1]}, etag='"abc"')
+
+    entry = cache.get(URL, {"page": 0, "text": "python"})
+
+    assert entry is not None
+    assert entry["payload"] == {"items": [1]}
+    assert entry["etag"] == '"abc"'
+    assert cache.is_fresh(entry)
+    assert cache.get(URL, {"text": "java", "page": 0}) is None
+
+
+def test_ttl_expired(tmp_path: Path) -> None:
+    """Запись с истёкшим сроком жизни считается устаревшей."""
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.set(URL, {"page": 0}, {"items": []})
+
+    entry = cache.get(URL, {"page": 0})
+
+    assert entry is not None
+    assert not cache.is_fresh(entry)
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """При переполнении вытесняется давно не использовавшаяся запись."""
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.set(URL, {"page": 0}, {"items": [0]})
+    cache.set(URL, {"page": 1}, {"items": [1]})
+    cache.get(URL, {"page": 0})
+    cache.set(URL, {"page": 2}, {"items": [2]})
+
+    assert len(cache) == 2
+    assert cache.get(URL, {"page": 1}) is None
+    assert cache.get(URL, {"page": 0}) is not None
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_persistence(tmp_path: Path) -> None:
+    """Записи доступны новому экземпляру кэша."""
+    ResponseCache(str(tmp_path)).set(URL, {"page": 0}, {"items": [0]})
+
+    assert ResponseCache(str(tmp_path)).get(URL, {"page": 0}) is not None
+
+
+@patch("requests.get")
+def test_api_uses_fresh_cache(mock_get: MagicMock, tmp_path: Path) -> None:
+    """Повторный запрос обслуживается из кэша без обращения к сети."""
+    mock_get.return_value = _response(200, {"items": [{"id": 1}]}, {})
+
+    first = HeadHunterAPI(cache=ResponseCache(str(tmp_path))).receiving_vacancies("python")
+    second = HeadHunterAPI(cache=ResponseCache(str(tmp_path))).receiving_vacancies("python")
+
+    assert first == second == [{"id": 1}]
+    mock_get.assert_called_once()
+
+
+@patch("requests.get")
+def test_api_revalidates_stale_entry(mock_get: MagicMock, tmp_path: Path) -> None:
+    """Устаревшая запись ревалидируется по ETag, ответ 304 отдаёт закэшированные данные."""
+    mock_get.side_effect = [
+        _response(200, {"items": [{"id": 1}]}, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        _response(304, {}, {}),
+    ]
+
+    HeadHunterAPI(cache=ResponseCache(str(tmp_path), ttl=0)).receiving_vacancies("python")
+    vacancies = HeadHunterAPI(cache=ResponseCache(str(tmp_path), ttl=0)).receiving_vacancies("python")
+
+    assert vacancies == [{"id": 1}]
+    headers = mock_get.call_args_list[1].kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
@@ -1,3 +1,4 @@
+import gzip
 import json
 from pathlib import Path
 from typing import Generator
@@ -17,6 +18,8 @@ def setup_saver() -> Generator[JSONSaver, None, None]:
     yield saver
     if temp_file.exists():
         temp_file.unlink()
+    Path(f"{temp_file}.lock").unlink(missing_ok=True)
+    Path(f"{temp_file}.tombstones").unlink(missing_ok=True)
 
 
 @pytest.fixture
@@ -115,3 +118,230 @@ def test_add_duplicate_vacancy(setup_saver: JSONSaver, vacancy1: Vacancy) -> Non
     setup_saver.add_vacancy([vacancy1])
     data = setup_saver.load_data()
     assert len(data) == 1
+
+
+def test_add_vacancy_conflict_modes(setup_saver: JSONSaver) -> None:
+    """Тест режимов добавления вакансии с уже сохранённым id."""
+    original = Vacancy("Python", "https://hh.ru/vacancy/1", 100, 200, "Москва", "Python", "Гибрид", "1")
+    setup_saver.add_vacancy(original)
+
+    setup_saver.add_vacancy(Vacancy("Python", "https://hh.ru/vacancy/1", 100, 300, "Москва", None, "Гибрид", "1"))
+    assert setup_saver.load_data()[0]["salary_to"] == 200
+
+    setup_saver.add_vacancy(
+        Vacancy("Python", "https://hh.ru/vacancy/1", 100, 300, "Москва", None, "Гибрид", "1"), on_conflict="merge"
+    )
+    data = setup_saver.load_data()
+    assert data[0]["salary_to"] == 300
+    assert data[0]["requirement"] == "Python"
+
+    setup_saver.add_vacancy(
+        Vacancy("Python", "https://hh.ru/vacancy/1", 1, 2, "Москва", None, "Гибрид", "1"), on_conflict="replace"
+    )
+    data = setup_saver.load_data()
+    assert len(data) == 1
+    assert data[0]["salary_from"] == 1
+    assert data[0]["requirement"] is None
+
+
+def test_add_vacancy_unknown_conflict_mode(setup_saver: JSONSaver, vacancy1: Vacancy) -> None:
+    """Тест на неизвестный режим on_conflict."""
+    with pytest.raises(ValueError):
+        setup_saver.add_vacancy(vacancy1, on_conflict="ignore")
+
+
+def test_add_vacancy_dedup_within_batch(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Дубли внутри одной пачки тоже пропускаются."""
+    setup_saver.add_vacancy([vacancy1, vacancy2, vacancy1])
+    assert len(setup_saver.load_data()) == 2
+
+
+def test_load_data_uses_cache(setup_saver: JSONSaver, vacancy1: Vacancy) -> None:
+    """Повторное чтение неизменённого файла не разбирает его заново."""
+    setup_saver.add_vacancy(vacancy1)
+    with patch("json.loads") as mock_loads:
+        assert len(setup_saver.load_data()) == 1
+        assert setup_saver.get_vacancy({"city": "Москва"})
+        mock_loads.assert_not_called()
+
+
+def test_cache_invalidated_on_external_change(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Изменение файла другим экземпляром сбрасывает кэш."""
+    setup_saver.add_vacancy(vacancy1)
+    setup_saver.load_data()
+    other = JSONSaver(file_path=str(setup_saver.file_path))
+    other.add_vacancy(vacancy2)
+
+    assert len(setup_saver.load_data()) == 2
+
+
+def test_batch_writes_once(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Изменения внутри batch() записываются в файл один раз."""
+    with patch("json.dump", wraps=json.dump) as mock_dump:
+        with setup_saver.batch():
+            setup_saver.add_vacancy(vacancy1)
+            setup_saver.add_vacancy(vacancy2)
+            setup_saver.delete_vacancy({"name_vacancy": "Python"})
+            assert len(setup_saver.load_data()) == 1
+            mock_dump.assert_not_called()
+        mock_dump.assert_called_once()
+
+    assert len(JSONSaver(file_path=str(setup_saver.file_path)).load_data()) == 1
+
+
+def test_batch_discarded_on_error(setup_saver: JSONSaver, vacancy1: Vacancy) -> None:
+    """При исключении внутри batch() изменения не сохраняются."""
+    with pytest.raises(RuntimeError):
+        with setup_saver.batch():
+            setup_saver.add_vacancy(vacancy1)
+            raise RuntimeError
+
+    assert setup_saver.load_data() == []
+
+
+def test_streaming_mode(tmp_path: Path, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Без кэша поиск и удаление обрабатывают файл потоково."""
+    saver = JSONSaver(file_path=str(tmp_path / "vacancies.json"), cache=False)
+    saver.add_vacancy([vacancy1, vacancy2])
+
+    with patch("json.loads") as mock_loads:
+        assert [item["city"] for item in saver.iter_data()] == ["Москва", "Екатеринбург"]
+        assert len(saver.get_vacancy({"work_format": "Гибрид"})) == 1
+        saver.delete_vacancy({"city": "Москва"})
+        mock_loads.assert_not_called()
+
+    assert [item["city"] for item in saver.load_data()] == ["Екатеринбург"]
+    saver.compact()
+    with open(saver.file_path, encoding="utf-8") as file:
+        assert json.load(file) == [vacancy2.to_dict()]
+
+
+def test_top_by_salary(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Зарплаты хранятся числами, топ выбирается по средней зарплате."""
+    setup_saver.add_vacancy([vacancy1, vacancy2])
+
+    top = setup_saver.top_by_salary(1)
+    assert [item["city"] for item in top] == ["Екатеринбург"]
+    assert top[0]["salary_from"] == 200000
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_compressed_and_compact_file(tmp_path: Path, vacancy1: Vacancy, vacancy2: Vacancy, cache: bool) -> None:
+    """Путь .gz сжимается на лету, compact=True пишет JSON без отступов."""
+    path = tmp_path / "vacancies.json.gz"
+    saver = JSONSaver(file_path=str(path), cache=cache, compact=True)
+    saver.add_vacancy([vacancy1, vacancy2])
+    saver.delete_vacancy({"city": "Москва"})
+    saver.compact()
+
+    content = gzip.decompress(path.read_bytes()).decode("utf-8")
+    assert content == json.dumps([vacancy2.to_dict()], ensure_ascii=False, separators=(",", ":"))
+    assert JSONSaver(file_path=str(path)).load_data() == [vacancy2.to_dict()]
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_delete_writes_tombstones(tmp_path: Path, vacancy1: Vacancy, vacancy2: Vacancy, cache: bool) -> None:
+    """Удаление дописывает журнал надгробий, не переписывая файл; чтение применяет журнал."""
+    path = tmp_path / "vacancies.json"
+    saver = JSONSaver(file_path=str(path), cache=cache)
+    saver.add_vacancy([vacancy1, vacancy2])
+    content = path.read_bytes()
+
+    with patch("src.json_saver.atomic_write") as mock_write:
+        saver.delete_vacancy({"city": "Москва"})
+        saver.delete_vacancy({"city": "Казань"})
+        mock_write.assert_not_called()
+
+    assert path.read_bytes() == content
+    assert path.with_name("vacancies.json.tombstones").exists()
+    assert [item["city"] for item in saver.load_data()] == ["Екатеринбург"]
+    assert [item["city"] for item in JSONSaver(file_path=str(path), cache=not cache).load_data()] == ["Екатеринбург"]
+    assert saver.get_vacancy({"city": "Москва"}) == []
+    assert saver.dead_ratio() == 0.5
+
+    saver.compact()
+    assert not path.with_name("vacancies.json.tombstones").exists()
+    assert saver.dead_ratio() == 0.0
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file) == [vacancy2.to_dict()]
+
+
+def test_compaction_by_dead_ratio(tmp_path: Path) -> None:
+    """Файл сжимается, когда доля удалённых записей превышает порог."""
+    path = tmp_path / "vacancies.json"
+    saver = JSONSaver(file_path=str(path), compact_ratio=0.3, compact_min_records=4)
+    saver.add_vacancy([Vacancy(f"Вакансия {i}", f"https://hh.ru/vacancy/{i}", None, None, "Москва", "", "Офис", str(i))
+                       for i in range(5)])
+
+    saver.delete_vacancy({"vacancy_id": "0"})
+    assert path.with_name("vacancies.json.tombstones").exists()
+    saver.delete_vacancy({"vacancy_id": "1"})
+    assert not path.with_name("vacancies.json.tombstones").exists()
+    with open(path, encoding="utf-8") as file:
+        assert [item["vacancy_id"] for item in json.load(file)] == ["2", "3", "4"]
+
+
+def test_readd_after_delete(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Вакансию можно добавить снова после удаления; устаревший журнал не применяется."""
+    setup_saver.add_vacancy([vacancy1, vacancy2])
+    setup_saver.delete_vacancy({"city": "Москва"})
+    setup_saver.add_vacancy(vacancy1)
+
+    assert len(setup_saver.load_data()) == 2
+    assert len(JSONSaver(file_path=str(setup_saver.file_path)).load_data()) == 2
+
+
+def test_results_are_copies(setup_saver: JSONSaver, vacancy1: Vacancy, vacancy2: Vacancy) -> None:
+    """Изменение возвращённых записей не портит кэш и индексы."""
+    setup_saver.add_vacancy([vacancy1, vacancy2])
+    setup_saver.get_vacancy({"city": "Москва"})[0]["city"] = "Казань"
+    setup_saver.load_data()[1]["city"] = "Казань"
+    setup_saver.query({"city": "Москва"})[0]["city"] = "Казань"
+    next(setup_saver.iter_data())["salary_from"] = 1
+
+    assert [item["city"] for item in setup_saver.load_data()] == ["Москва", "Екатеринбург"]
+    assert len(setup_saver.query({"city": "Москва"})) == 1
+    assert setup_saver.load_data()[0]["salary_from"] == 100000
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_legacy_salary_placeholders(tmp_path: Path, cache: bool) -> None:
+    """Записи старого формата с заглушками зарплаты находятся, не дублируются и удаляются по Vacancy."""
+    legacy = {"name_vacancy": "Программист", "url": "https://api.hh.ru/areas/1", "salary_from": "Зарплата не указана",
+              "salary_to": "Зарплата не указана", "city": "Москва", "requirement": "JS",
+              "work_format": "На месте работодателя"}
+    path = tmp_path / "vacancies.json"
+    path.write_text(json.dumps([legacy], ensure_ascii=False), encoding="utf-8")
+    saver = JSONSaver(str(path), cache=cache)
+
+    assert saver.get_vacancy(Vacancy(**legacy)) == [legacy]
+    saver.add_vacancy(Vacancy(**legacy))
+    assert len(saver.load_data()) == 1
+    saver.delete_vacancy(Vacancy(**legacy))
+    assert saver.load_data() == []
+
+
+def test_delete_by_key_without_scan(tmp_path: Path) -> None:
+    """Вакансия с id и запись без id по всем полям находятся по индексу ключей, журнал не перечитывается."""
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    vacancies = [Vacancy(f"Вакансия {i}", f"https://hh.ru/vacancy/{i}", i, None, "Москва", "", "Офис", str(i))
+                 for i in range(10)]
+    legacy = Vacancy("Без id", "https://hh.ru/vacancy/legacy", None, None, "Казань", "", "Офис")
+    saver.add_vacancy(vacancies + [legacy])
+
+    with patch("src.json_saver.matches_criteria", return_value=True) as matches, \
+            patch("src.json_saver.read_tombstones") as read_tombstones:
+        saver.delete_vacancy(vacancies[3])
+        saver.delete_vacancy(legacy)
+        assert matches.call_count == 2
+        read_tombstones.assert_not_called()
+
+    saver.delete_vacancy({"vacancy_id": "7"})
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["0", "1", "2", "4", "5", "6", "8", "9"]
+    assert saver.dead_ratio() == 3 / 11
+    assert [item["vacancy_id"] for item in JSONSaver(str(tmp_path / "vacancies.json")).load_data()] == [
+        "0", "1", "2", "4", "5", "6", "8", "9"
+    ]
+
+    saver.upsert_vacancy(Vacancy("Вакансия 8", "https://hh.ru/vacancy/8", 800, None, "Москва", "", "Офис", "8"))
+    assert [item["salary_from"] for item in saver.load_data()] == [0, 1, 2, 4, 5, 6, 800, 9]
@@ -0,0 +1,50 @@
+import io
+import json
+
+import pytest
+
+from src.json_stream import iter_json_array, write_json_array
+
+ITEMS = [{"id": i, "text": "Требования " * i, "nested": [1, {"x": None}], "empty": {}} for i in range(20)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_array(chunk_size: int) -> None:
+    """Потоковый разбор совпадает с json.loads при любом размере фрагмента."""
+    text = json.dumps(ITEMS, ensure_ascii=False, indent=4)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == ITEMS
+
+
+def test_iter_json_array_is_lazy() -> None:
+    """Элементы выдаются до того, как прочитан весь файл."""
+    stream = io.StringIO(json.dumps(ITEMS))
+    first = next(iter_json_array(stream, chunk_size=64))
+
+    assert first == ITEMS[0]
+    assert stream.tell() < len(stream.getvalue())
+
+
+@pytest.mark.parametrize("text, expected", [("", []), ("[]", []), (" [ 1 , 23 ] ", [1, 23])])
+def test_iter_json_array_edge_cases(text: str, expected: list) -> None:
+    """Пустой файл, пустой массив и числа на границе фрагментов."""
+    assert list(iter_json_array(io.StringIO(text), chunk_size=1)) == expected
+
+
+@pytest.mark.parametrize("text", ["{}", "[1,", "[1 2]"])
+def test_iter_json_array_invalid(text: str) -> None:
+    """Тест на некорректный JSON."""
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+@pytest.mark.parametrize("items", [[], ITEMS])
+@pytest.mark.parametrize("indent", [4, None])
+def test_write_json_array_matches_json_dump(items: list, indent: int) -> None:
+    """Потоковая запись даёт тот же текст, что и json.dumps."""
+    stream = io.StringIO()
+
+    count = write_json_array(stream, iter(items), indent)
+
+    assert count == len(items)
+    assert stream.getvalue() == json.dumps(items, ensure_ascii=False, indent=indent)
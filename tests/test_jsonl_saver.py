@@ -0,0 +1,107 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from src.jsonl_saver import JSONLinesSaver
+from src.vacancies_hh import Vacancy
+
+
+def _vacancy(vacancy_id: str, salary_to: int = 200, city: str = "Москва") -> Vacancy:
+    return Vacancy("Python", f"https://hh.ru/vacancy/{vacancy_id}", 100, salary_to, city, "Python", "Гибрид",
+                   vacancy_id)
+
+
+@pytest.fixture
+def saver(tmp_path: Path) -> JSONLinesSaver:
+    return JSONLinesSaver(str(tmp_path / "vacancies.jsonl"), compact_min_lines=10**6)
+
+
+def _lines(saver: JSONLinesSaver) -> int:
+    return len(saver.file_path.read_text(encoding="utf-8").splitlines())
+
+
+def test_add_appends_and_skips_duplicates(saver: JSONLinesSaver) -> None:
+    """Добавление дописывает только новые вакансии."""
+    saver.add_vacancy([_vacancy("1"), _vacancy("2")])
+    saver.add_vacancy([_vacancy("2"), _vacancy("3")])
+
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["1", "2", "3"]
+    assert _lines(saver) == 3
+
+
+def test_duplicates_skipped_by_new_instance(saver: JSONLinesSaver) -> None:
+    """Индекс ключей восстанавливается из файла."""
+    saver.add_vacancy(_vacancy("1"))
+    JSONLinesSaver(str(saver.file_path)).add_vacancy(_vacancy("1"))
+
+    assert _lines(saver) == 1
+
+
+def test_delete_writes_tombstone(saver: JSONLinesSaver) -> None:
+    """Удаление дописывает надгробие и скрывает запись при чтении."""
+    saver.add_vacancy([_vacancy("1", city="Казань"), _vacancy("2")])
+    saver.delete_vacancy({"city": "Казань"})
+
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["2"]
+    assert _lines(saver) == 3
+    assert saver.get_vacancy({"city": "Казань"}) == []
+
+
+def test_readd_after_delete(saver: JSONLinesSaver) -> None:
+    """Удалённую вакансию можно добавить снова."""
+    saver.add_vacancy(_vacancy("1"))
+    saver.delete_vacancy({"vacancy_id": "1"})
+    saver.add_vacancy(_vacancy("1"))
+
+    assert len(saver.load_data()) == 1
+
+
+def test_replace_and_merge(saver: JSONLinesSaver) -> None:
+    """Режимы replace и merge заменяют запись новой версией."""
+    saver.add_vacancy(_vacancy("1"))
+    saver.add_vacancy(_vacancy("1", salary_to=300), on_conflict="replace")
+    assert [item["salary_to"] for item in saver.load_data()] == [300]
+
+    update = Vacancy("Python", "https://hh.ru/vacancy/1", 100, 400, "Москва", None, "Гибрид", "1")
+    saver.add_vacancy(update, on_conflict="merge")
+    data = saver.load_data()
+    assert len(data) == 1
+    assert data[0]["salary_to"] == 400
+    assert data[0]["requirement"] == "Python"
+
+
+def test_compact(saver: JSONLinesSaver) -> None:
+    """Сжатие оставляет в файле только живые записи."""
+    saver.add_vacancy([_vacancy(str(i)) for i in range(5)])
+    saver.delete_vacancy({"vacancy_id": "0"})
+    saver.delete_vacancy({"vacancy_id": "1"})
+    assert saver.dead_ratio() == pytest.approx(4 / 7)
+
+    saver.compact()
+
+    assert _lines(saver) == 3
+    assert saver.dead_ratio() == 0
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["2", "3", "4"]
+
+
+def test_automatic_compaction(tmp_path: Path) -> None:
+    """Сжатие запускается, когда доля мёртвых строк превышает порог."""
+    saver = JSONLinesSaver(str(tmp_path / "vacancies.jsonl"), compact_ratio=0.5, compact_min_lines=1)
+    saver.add_vacancy([_vacancy("1"), _vacancy("2")])
+    saver.delete_vacancy({"vacancy_id": "1"})
+
+    assert _lines(saver) == 1
+
+
+def test_gzip_append_and_compact(tmp_path: Path) -> None:
+    """Сжатый файл: дописывание добавляет новые блоки gzip, сжатие переписывает файл."""
+    saver = JSONLinesSaver(str(tmp_path / "vacancies.jsonl.gz"), compact_min_lines=10**6)
+    saver.add_vacancy([_vacancy("1"), _vacancy("2")])
+    saver.add_vacancy(_vacancy("3"))
+    saver.delete_vacancy({"vacancy_id": "2"})
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["1", "3"]
+
+    saver.compact()
+    assert len(gzip.decompress(saver.file_path.read_bytes()).splitlines()) == 2
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["1", "3"]
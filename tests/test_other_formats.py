@@ -1,13 +1,14 @@
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
+from openpyxl import Workbook
 
-from src.other_formats import ExcelFile
+from src.other_formats import ExcelExporter, ExcelFile, ParquetSaver
+from src.query import Field, Query
 from src.vacancies_hh import Vacancy
 
-# Создаем тестовый объект ExcelFile
-excel_file = ExcelFile("test_vacancies.xlsx")
-
 # Создаем тестовую вакансию
 test_vacancy = Vacancy(
     "Python Developer",
@@ -20,7 +21,13 @@ test_vacancy = Vacancy(
 )
 
 
-def test_add_vacancy_single() -> None:
+@pytest.fixture
+def excel_file(tmp_path: Path) -> ExcelFile:
+    """Тестовый объект ExcelFile во временном каталоге."""
+    return ExcelFile(str(tmp_path / "test_vacancies.xlsx"))
+
+
+def test_add_vacancy_single(excel_file: ExcelFile) -> None:
     """Тест на добавление одной вакансии."""
     with patch("pandas.read_excel") as mock_read_excel:
         mock_read_excel.return_value = pd.DataFrame()
@@ -30,7 +37,7 @@ def test_add_vacancy_single() -> None:
             mock_to_excel.assert_called_once()
 
 
-def test_add_vacancy_multiple() -> None:
+def test_add_vacancy_multiple(excel_file: ExcelFile) -> None:
     """Тест на добавление нескольких вакансий."""
     vacancies = [test_vacancy, test_vacancy]
     with patch("pandas.read_excel") as mock_read_excel:
@@ -41,20 +48,20 @@ def test_add_vacancy_multiple() -> None:
             mock_to_excel.assert_called_once()
 
 
-def test_add_vacancy_file_not_found() -> None:
+def test_add_vacancy_file_not_found(excel_file: ExcelFile) -> None:
     """Тест на обработку ошибки FileNotFoundError."""
     with patch("pandas.read_excel", side_effect=FileNotFoundError):
         excel_file.add_vacancy(test_vacancy)
 
 
-def test_get_vacancy_empty_file() -> None:
+def test_get_vacancy_empty_file(excel_file: ExcelFile) -> None:
     """Тест на получение данных из пустого файла."""
     with patch("pandas.read_excel", side_effect=FileNotFoundError):
         result = excel_file.get_vacancy({})
         assert result == []
 
 
-def test_get_vacancy_existing_file() -> None:
+def test_get_vacancy_existing_file(excel_file: ExcelFile) -> None:
     """Тест на получение данных из существующего файла."""
     mock_data = pd.DataFrame([test_vacancy.to_dict()])
     with patch("pandas.read_excel", return_value=mock_data):
@@ -62,7 +69,7 @@ def test_get_vacancy_existing_file() -> None:
         assert len(result) == 1
 
 
-def test_delete_vacancy() -> None:
+def test_delete_vacancy(excel_file: ExcelFile) -> None:
     """Тест на удаление вакансии."""
     mock_data = pd.DataFrame([test_vacancy.to_dict()])
     with patch("pandas.read_excel", return_value=mock_data):
@@ -71,7 +78,197 @@ def test_delete_vacancy() -> None:
             mock_to_excel.assert_called_once()
 
 
-def test_delete_vacancy_file_not_found() -> None:
+def test_delete_vacancy_file_not_found(excel_file: ExcelFile) -> None:
     """Тест на обработку ошибки FileNotFoundError при удалении."""
     with patch("pandas.read_excel", side_effect=FileNotFoundError):
         excel_file.delete_vacancy(test_vacancy)
+
+
+def test_add_vacancy_skips_duplicates(tmp_path: Path) -> None:
+    """Повторное добавление той же вакансии не создаёт дублей."""
+    excel = ExcelFile(str(tmp_path / "vacancies.xlsx"))
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис")
+    excel.add_vacancy([test_vacancy, test_vacancy])
+    excel.add_vacancy([test_vacancy, other])
+
+    rows = pd.read_excel(tmp_path / "vacancies.xlsx")
+    assert list(rows["name_vacancy"]) == ["Python Developer", "Go Developer"]
+
+
+def test_exporter_buffers_and_writes_once(tmp_path: Path) -> None:
+    """Выгрузка копит вакансии без дублей и пишет файл один раз при закрытии."""
+    path = tmp_path / "export.xlsx"
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис", "7")
+    with patch("openpyxl.Workbook.save", autospec=True, side_effect=Workbook.save) as mock_save:
+        with ExcelExporter(str(path)) as exporter:
+            exporter.add_vacancy([test_vacancy, other, test_vacancy])
+            exporter.add_vacancy(other.to_dict() | {"salary_to": 1})
+            assert len(exporter) == 2
+            assert not path.exists()
+        mock_save.assert_called_once()
+
+    rows = pd.read_excel(path)
+    assert list(rows.columns) == list(Vacancy.__slots__)
+    assert list(rows["salary_to"]) == [100000, 300000]
+
+
+def test_exporter_replace(tmp_path: Path) -> None:
+    """В режиме replace более поздняя версия вакансии заменяет раннюю."""
+    path = tmp_path / "export.xlsx"
+    exporter = ExcelExporter(str(path), on_conflict="replace")
+    vacancy = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис", "7")
+    exporter.add_vacancy([vacancy, vacancy.to_dict() | {"salary_to": 1}])
+    exporter.flush()
+    exporter.flush()
+
+    assert list(pd.read_excel(path)["salary_to"]) == [1]
+    with pytest.raises(ValueError):
+        ExcelExporter(str(path), on_conflict="merge")
+
+
+def test_exporter_keeps_existing_rows(tmp_path: Path) -> None:
+    """Строки, уже записанные в файл, не теряются при следующей выгрузке."""
+    path = tmp_path / "export.xlsx"
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис", "7")
+    with ExcelExporter(str(path)) as exporter:
+        exporter.add_vacancy([test_vacancy, other])
+    with ExcelExporter(str(path), on_conflict="replace") as exporter:
+        exporter.add_vacancy([test_vacancy, other.to_dict() | {"salary_to": 1}])
+        assert len(exporter) == 2
+
+    rows = pd.read_excel(path)
+    assert list(rows["name_vacancy"]) == ["Python Developer", "Go Developer"]
+    assert list(rows["salary_to"]) == [100000, 1]
+
+
+def test_excel_batch_writes_once(tmp_path: Path) -> None:
+    """Внутри batch() изменения видны сразу, а файл записывается один раз при выходе."""
+    excel = ExcelFile(str(tmp_path / "vacancies.xlsx"))
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис", "7")
+    with patch("pandas.DataFrame.to_excel", autospec=True, side_effect=pd.DataFrame.to_excel) as mock_to_excel:
+        with excel.batch():
+            excel.add_vacancy(test_vacancy)
+            excel.add_vacancy([other, other])
+            excel.add_vacancy(Vacancy(**(other.to_dict() | {"salary_to": 1})), on_conflict="merge")
+            excel.delete_vacancy({"city": "Москва"})
+            assert [row["salary_to"] for row in excel.get_vacancy({})] == [1]
+            mock_to_excel.assert_not_called()
+        mock_to_excel.assert_called_once()
+
+    with pytest.raises(RuntimeError):
+        with excel.batch():
+            excel.add_vacancy(test_vacancy)
+            raise RuntimeError
+    assert [row["name_vacancy"] for row in excel.get_vacancy({})] == ["Go Developer"]
+
+
+def test_get_vacancy_criteria_and_cache(tmp_path: Path) -> None:
+    """Критерии применяются одной маской, таблица читается повторно только после изменения файла."""
+    excel = ExcelFile(str(tmp_path / "vacancies.xlsx"))
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Казань", "Go", "Офис")
+    excel.add_vacancy([test_vacancy, other])
+
+    with patch("pandas.read_excel", wraps=pd.read_excel) as mock_read_excel:
+        assert [row["city"] for row in excel.get_vacancy({"city": "Казань"})] == ["Казань"]
+        assert excel.get_vacancy({"city": "Казань", "salary_from": None}, columns=["url"]) == [
+            {"url": "https://hh.ru/vacancy/1"}
+        ]
+        assert excel.get_vacancy({"city": "Москва", "work_format": "Офис"}) == []
+        assert excel.get_vacancy({"unknown": 1}) == []
+        assert len(excel.get_vacancy(other)) == 1
+        assert mock_read_excel.call_count == 1
+
+        excel.delete_vacancy({"city": "Москва"})
+        assert [row["city"] for row in excel.get_vacancy({})] == ["Казань"]
+        assert mock_read_excel.call_count == 2
+
+
+def test_delete_vacancy_requires_all_criteria(tmp_path: Path) -> None:
+    """Удаляются только строки, совпадающие по всем критериям."""
+    excel = ExcelFile(str(tmp_path / "vacancies.xlsx"))
+    other = Vacancy("Go Developer", "https://hh.ru/vacancy/1", None, 300000, "Москва", "Go", "Офис")
+    excel.add_vacancy([test_vacancy, other])
+
+    excel.delete_vacancy({"city": "Москва", "work_format": "Офис"})
+    excel.delete_vacancy({})
+    assert [row["name_vacancy"] for row in excel.get_vacancy({})] == ["Python Developer"]
+
+
+@pytest.fixture
+def parquet_saver(tmp_path: Path) -> ParquetSaver:
+    pytest.importorskip("pyarrow")
+    saver = ParquetSaver(str(tmp_path / "vacancies.parquet"), row_group_size=2)
+    saver.add_vacancy([
+        Vacancy(f"Вакансия {i}", f"https://hh.ru/vacancy/{i}", i * 1000, i * 2000,
+                ("Москва", "Казань", "Нижний Новгород")[i % 3], "Python", "Офис", str(i))
+        for i in range(9)
+    ])
+    return saver
+
+
+def test_parquet_partitions_and_row_groups(parquet_saver: ParquetSaver) -> None:
+    """Вакансии разложены по разделам города, внутри — группы строк со статистикой по зарплате."""
+    import pyarrow.parquet as pq
+
+    partitions = sorted(path.name for path in parquet_saver.directory.iterdir())
+    assert len(partitions) == 3
+    assert all(name.startswith("city=") for name in partitions)
+    metadata = pq.ParquetFile(next(parquet_saver.directory.glob("*/part-0.parquet"))).metadata
+    assert metadata.num_row_groups == 2
+    statistics = metadata.row_group(0).column(metadata.schema.names.index("salary_from")).statistics
+    assert statistics.has_min_max
+
+
+def test_parquet_get_vacancy(parquet_saver: ParquetSaver) -> None:
+    """Критерии, диапазон зарплаты и выбор колонок."""
+    assert len(parquet_saver.load_data()) == 9
+    assert parquet_saver.get_vacancy({"city": "Казань"}, columns=["vacancy_id"]) == [
+        {"vacancy_id": "1"}, {"vacancy_id": "4"}, {"vacancy_id": "7"}
+    ]
+    found = parquet_saver.get_vacancy({"work_format": "Офис"}, salary_min=3000, salary_max=12000)
+    assert sorted(row["vacancy_id"] for row in found) == ["3", "4", "5", "6"]
+    assert parquet_saver.get_vacancy({"unknown": 1}) == []
+    frame = parquet_saver.read_frame({"city": "Москва"}, columns=["salary_from"])
+    assert list(frame.columns) == ["salary_from"]
+    assert sorted(frame["salary_from"]) == [0, 3000, 6000]
+
+
+def test_parquet_query_pushdown(parquet_saver: ParquetSaver) -> None:
+    """Сравнения, наборы и диапазоны выполняются фильтром pyarrow без проверки строк в Python;
+    подстрока проверяется в Python, пустые значения под отрицанием сохраняют смысл Predicate.matches."""
+    salary_from, city = Field("salary_from"), Field("city")
+    parquet_saver.add_vacancy(Vacancy("Без зарплаты", "https://hh.ru/vacancy/9", None, None, "Москва", "Go", "Офис",
+                                      "9"))
+    query = Query(city.isin(["Москва", "Казань"]) & ~(salary_from > 3000)).order_by("salary_from", True).limit(3)
+    checked = AssertionError("строка проверена в Python")
+    with patch("src.query.Compare.matches", side_effect=checked), patch("src.query.In.matches", side_effect=checked), \
+            patch("src.query.Between.matches", side_effect=checked), \
+            patch("src.query.Not.matches", side_effect=checked):
+        assert parquet_saver.query(query, columns=["vacancy_id"]) == [
+            {"vacancy_id": "3"}, {"vacancy_id": "1"}, {"vacancy_id": "0"}
+        ]
+        assert [row["vacancy_id"] for row in parquet_saver.get_vacancy(salary_from.between(5500, 6500))] == ["6"]
+    assert parquet_saver.query(~(salary_from > 3000) & (city == "Москва"))[-1]["vacancy_id"] == "9"
+    found = parquet_saver.get_vacancy(Field("requirement").contains("go") | (salary_from >= 8000))
+    assert sorted(row["vacancy_id"] for row in found) == ["8", "9"]
+
+
+def test_parquet_add_conflicts_and_delete(parquet_saver: ParquetSaver) -> None:
+    """Дубли по ключу вакансии не добавляются, удаление перезаписывает только свой раздел."""
+    updated = Vacancy("Вакансия 1", "https://hh.ru/vacancy/1", 5, None, "Казань", "Go", "Офис", "1")
+    parquet_saver.add_vacancy(updated)
+    assert parquet_saver.get_vacancy({"vacancy_id": "1"})[0]["salary_from"] == 1000
+    parquet_saver.add_vacancy(updated, on_conflict="merge")
+    assert parquet_saver.get_vacancy({"vacancy_id": "1"})[0]["salary_to"] == 2000
+    assert parquet_saver.get_vacancy({"vacancy_id": "1"})[0]["salary_from"] == 5
+
+    moscow = next(parquet_saver.directory.glob("city=%D0%9C*/part-0.parquet"))
+    mtime = moscow.stat().st_mtime_ns
+    parquet_saver.delete_vacancy({"city": "Казань", "salary_to": 8000})
+    assert [row["vacancy_id"] for row in parquet_saver.get_vacancy({"city": "Казань"})] == ["1", "7"]
+    assert moscow.stat().st_mtime_ns == mtime
+
+    parquet_saver.delete_vacancy({"city": "Казань"})
+    assert len(list(parquet_saver.directory.iterdir())) == 2
+    with pytest.raises(ValueError):
+        parquet_saver.add_vacancy(updated, on_conflict="update")
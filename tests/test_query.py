@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Any, List
+
+import pandas as pd
+import pytest
+
+from src.json_saver import JSONSaver
+from src.jsonl_saver import JSONLinesSaver
+from src.other_formats import ExcelFile, ParquetSaver
+from src.query import And, Compare, Field, MemoryIndex, Query, Text, execute, from_criteria
+from src.sqlite_saver import SQLiteSaver
+from src.text_index import InvertedIndex
+from src.vacancies_hh import Vacancy
+
+VACANCIES = [
+    Vacancy("Python", "https://hh.ru/vacancy/1", 150000, 250000, "Москва", "Опыт Python и Django", "Удалённо", "1"),
+    Vacancy("Go", "https://hh.ru/vacancy/2", 200000, None, "Казань", "Знание Go", "Офис", "2"),
+    Vacancy("Java", "https://hh.ru/vacancy/3", None, 120000, "Москва", "Java, Spring", "Удалённо", "3"),
+    Vacancy("Python", "https://hh.ru/vacancy/4", 90000, 140000, "Сочи", "Python, SQL", "Гибрид", "4"),
+    Vacancy("QA", "https://hh.ru/vacancy/5", 160000, 180000, "Казань", None, "Удалённо", "5"),
+]
+RECORDS = [vacancy.to_dict() for vacancy in VACANCIES]
+salary_from, city, work_format, requirement = (Field(name) for name in
+                                               ("salary_from", "city", "work_format", "requirement"))
+
+QUERIES = [
+    (Query(And(salary_from >= 150000, city.isin(["Москва", "Казань"]), work_format == "Удалённо")), ["1", "5"]),
+    (Query(salary_from.between(100000, 160000) | (city == "Сочи")), ["1", "4", "5"]),
+    (Query(~(city == "Москва")).order_by("salary_from", descending=True), ["2", "5", "4"]),
+    (Query(requirement.matches("python")).order_by("salary_from"), ["4", "1"]),
+    (Query(requirement.contains("SPRING") | (Field("salary_to") < 130000)), ["3"]),
+    (Query(salary_from == None).limit(5), ["3"]),  # noqa: E711
+    (Query(Field("salary_to") != 250000).order_by("salary_to").limit(3), ["3", "4", "5"]),
+    (Query().order_by("salary_from", descending=True).limit(2), ["2", "5"]),
+    (Query(Field("unknown") == 1), []),
+]
+
+
+def _ids(rows: List[Any]) -> List[str]:
+    return [str(row["vacancy_id"]) for row in rows]
+
+
+@pytest.mark.parametrize("query, expected", QUERIES)
+def test_predicates_on_records(query: Query, expected: List[str]) -> None:
+    assert _ids(query.finish(row for row in RECORDS if query.matches(row))) == expected
+
+
+@pytest.mark.parametrize("query, expected", QUERIES)
+def test_memory_index(query: Query, expected: List[str]) -> None:
+    assert _ids(MemoryIndex(RECORDS).run(query)) == expected
+
+
+@pytest.mark.parametrize("query", [query for query, _ in QUERIES])
+def test_dataframe_mask(query: Query) -> None:
+    df = pd.DataFrame(RECORDS)
+    if query.predicate is not None:
+        df = df[query.predicate.mask(df)]
+    assert list(df["vacancy_id"]) == _ids([row for row in RECORDS if query.matches(row)])
+
+
+def test_index_candidates() -> None:
+    index = MemoryIndex(RECORDS, text_search=lambda query, mode: {0})
+    assert index.candidates(city == "Казань") == {1, 4}
+    assert index.candidates(salary_from > 150000) == {1, 4}
+    assert index.candidates(Field("salary_to") <= 140000) == {2, 3}
+    assert index.candidates(And(city == "Москва", salary_from >= 100000)) == {0}
+    assert index.candidates(requirement.matches("python")) == {0}
+    assert index.candidates(requirement.contains("python")) is None
+    assert index.candidates((city == "Сочи") | requirement.contains("x")) is None
+    assert index.candidates(~(city == "Сочи")) is None
+
+
+def test_split_sql() -> None:
+    query = Query(And(salary_from >= 1, requirement.contains("x"), city.isin(["a", None])))
+    where, params, residual = query.split_sql(("salary_from", "city", "requirement"))
+    assert where == "salary_from >= ? AND (city IN (?) OR city IS NULL)"
+    assert params == [1, "a"]
+    assert repr(residual) == "requirement contains 'x'"
+
+
+def test_from_criteria_and_coerce() -> None:
+    assert from_criteria({}) is None
+    assert Query.coerce({"city": "Москва"}).matches(RECORDS[0])
+    assert not Query.coerce(VACANCIES[1]).matches(RECORDS[0])
+    assert Query.coerce(Compare("city", "==", "Москва")).limit_count is None
+    with pytest.raises(ValueError):
+        Compare("salary_from", ">", None)
+    with pytest.raises(ValueError):
+        Text("requirement", "python", "xor")
+
+
+@pytest.fixture(params=["json", "json-stream", "json-indexed", "jsonl", "sqlite", "excel", "parquet"])
+def storage(request: pytest.FixtureRequest, tmp_path: Path) -> Any:
+    kind = request.param
+    if kind == "json":
+        saver: Any = JSONSaver(str(tmp_path / "v.json"))
+    elif kind == "json-stream":
+        saver = JSONSaver(str(tmp_path / "v.json"), cache=False)
+    elif kind == "json-indexed":
+        saver = JSONSaver(str(tmp_path / "v.json"), text_index=InvertedIndex(str(tmp_path / "v.index.json")))
+    elif kind == "jsonl":
+        saver = JSONLinesSaver(str(tmp_path / "v.jsonl"))
+    elif kind == "sqlite":
+        saver = SQLiteSaver(str(tmp_path / "v.db"))
+    elif kind == "parquet":
+        pytest.importorskip("pyarrow")
+        saver = ParquetSaver(str(tmp_path / "v.parquet"), row_group_size=2)
+    else:
+        saver = ExcelFile(str(tmp_path / "v.xlsx"))
+    saver.add_vacancy(VACANCIES)
+    return saver
+
+
+@pytest.mark.parametrize("query, expected", QUERIES)
+def test_same_query_across_backends(storage: Any, query: Query, expected: List[str]) -> None:
+    # Parquet возвращает строки по разделам, поэтому без сортировки порядок не сравнивается
+    normalize = sorted if isinstance(storage, ParquetSaver) and query.sort_field is None else list
+    assert normalize(_ids(execute(query, storage))) == normalize(expected)
+    assert normalize(_ids(storage.get_vacancy(query))) == normalize(expected)
+
+
+def test_predicate_across_backends(storage: Any) -> None:
+    """get_vacancy принимает и отдельное условие."""
+    assert sorted(_ids(storage.get_vacancy(salary_from >= 150000))) == ["1", "2", "5"]
+
+
+def test_json_index_invalidated_on_write(tmp_path: Path) -> None:
+    saver = JSONSaver(str(tmp_path / "v.json"))
+    saver.add_vacancy(VACANCIES[:2])
+    assert _ids(saver.query(city == "Москва")) == ["1"]
+    saver.add_vacancy(VACANCIES[2])
+    assert _ids(saver.query(city == "Москва")) == ["1", "3"]
+    saver.delete_vacancy({"vacancy_id": "1"})
+    assert _ids(saver.get_vacancy(city == "Москва")) == ["3"]
@@ -0,0 +1,105 @@
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.hh import HeadHunterAPI
+from src.rate_limit import RateLimiter, RetryPolicy
+
+
+class FakeClock:
+    """Часы, которые двигаются только при ожидании."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(status_code: int, retry_after: str = "") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    response.json.return_value = {"items": [{"id": status_code}]}
+    return response
+
+
+def test_rate_limiter_burst_and_wait() -> None:
+    """Запросы в пределах ёмкости проходят сразу, следующие ждут пополнения."""
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0.5
+    assert limiter.throttle_waits == 1
+    assert limiter.throttle_wait_time == 0.5
+
+
+def test_rate_limiter_adapts() -> None:
+    """После 429 частота падает вдвое и восстанавливается успешными ответами."""
+    limiter = RateLimiter(rate=4, increase_step=1)
+
+    limiter.on_throttled()
+    assert limiter.rate == 2
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 4
+
+
+def test_retry_policy_delay() -> None:
+    """Экспоненциальная задержка ограничена сверху, Retry-After имеет приоритет."""
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, random_func=lambda low, high: high)
+
+    assert policy.delay(0) == 1
+    assert policy.delay(2) == 4
+    assert policy.delay(5) == 5
+    assert policy.delay(0, "3") == 3
+    assert policy.delay(0, "60") == 60
+    assert RetryPolicy(retry_after_max=120).delay(0, "86400") == 120
+    assert RetryPolicy.parse_retry_after("garbage") is None
+
+
+@patch("requests.get")
+def test_api_retries_after_throttling(mock_get: MagicMock) -> None:
+    """Ответы 429 и 503 не прерывают загрузку, а повторяются."""
+    clock = FakeClock()
+    mock_get.side_effect = [_response(429, "2"), _response(503), _response(200)]
+    hh_api = HeadHunterAPI(
+        rate_limiter=RateLimiter(rate=100, clock=clock, sleep=clock.sleep),
+        retry_policy=RetryPolicy(sleep=clock.sleep, random_func=lambda low, high: high),
+    )
+
+    vacancies = hh_api.receiving_vacancies("python")
+
+    assert vacancies == [{"id": 200}]
+    assert mock_get.call_count == 3
+    assert clock.sleeps[:2] == [2.0, 1.0]
+    assert hh_api.stats["retries"] == 2
+    assert hh_api.stats["rate"] < 100
+
+
+@patch("requests.get")
+def test_api_gives_up_after_max_retries(mock_get: MagicMock) -> None:
+    """После исчерпания попыток страница считается ошибочной."""
+    mock_get.return_value = _response(502)
+    hh_api = HeadHunterAPI(retry_policy=RetryPolicy(max_retries=2, sleep=lambda seconds: None))
+
+    assert hh_api.receiving_vacancies("python") == []
+    assert mock_get.call_count == 3
+
+
+@patch("requests.get")
+def test_api_retries_connection_errors(mock_get: MagicMock) -> None:
+    """Сбой соединения повторяется."""
+    mock_get.side_effect = [requests.ConnectionError("reset"), _response(200)]
+    hh_api = HeadHunterAPI(retry_policy=RetryPolicy(sleep=lambda seconds: None))
+
+    assert hh_api.receiving_vacancies("python") == [{"id": 200}]
@@ -0,0 +1,111 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.json_saver import JSONSaver
+from src.other_formats import ExcelFile
+from src.reingest import find_archives, main, open_storage, parse_shard, reingest, shard
+from src.sqlite_saver import SQLiteSaver
+
+
+def make_item(vacancy_id: str, salary_from: int) -> dict:
+    return {
+        "id": vacancy_id,
+        "professional_roles": [{"name": "Программист"}],
+        "area": {"url": f"https://api.hh.ru/areas/{vacancy_id}", "name": "Москва"},
+        "snippet": {"requirement": "Python"},
+        "work_format": [{"name": "Удалённо"}],
+        "salary": {"from": salary_from, "to": None},
+    }
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Path:
+    directory = tmp_path / "archive"
+    (directory / "2025-01").mkdir(parents=True)
+    pages = {
+        "2025-01/page-0.json": {"items": [make_item("1", 100), make_item("2", 200)]},
+        "2025-01/page-1.json": {"payload": {"items": [make_item("3", 300)]}, "etag": None},
+        "page-2.json": {"items": [make_item("1", 150), {"area": None}]},
+    }
+    for name, payload in pages.items():
+        (directory / name).write_text(json.dumps(payload), encoding="utf-8")
+    (directory / "broken.json").write_text("{oops", encoding="utf-8")
+    return directory
+
+
+def test_find_archives_and_shard(archive: Path) -> None:
+    files = find_archives([str(archive)])
+    assert [file.name for file in files] == ["page-0.json", "page-1.json", "broken.json", "page-2.json"]
+    assert shard(files, 3) == [[str(files[0]), str(files[1])], [str(files[2])], [str(files[3])]]
+    assert shard(files, 10) == [[str(file)] for file in files]
+
+
+def test_parse_shard_reports_errors(archive: Path) -> None:
+    vacancies, errors = parse_shard([str(archive / "page-2.json"), str(archive / "broken.json")])
+    assert [vacancy.vacancy_id for vacancy in vacancies] == ["1"]
+    assert vacancies[0].salary_from == 150
+    assert len(errors) == 2
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reingest_dedups_into_storage(archive: Path, tmp_path: Path, workers: int) -> None:
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    report = reingest([str(archive)], storage, max_workers=workers)
+
+    assert report.files == 4
+    assert report.vacancies == 3
+    assert report.duplicates == 1
+    assert len(report.errors) == 2
+    salaries = {item["vacancy_id"]: item["salary_from"] for item in storage.load_data()}
+    assert salaries == {"1": 150, "2": 200, "3": 300}
+
+
+def test_reingest_replaces_existing(archive: Path, tmp_path: Path) -> None:
+    with SQLiteSaver(str(tmp_path / "vacancies.db")) as storage:
+        reingest([str(archive / "2025-01")], storage, max_workers=1)
+        reingest([str(archive / "page-2.json")], storage, max_workers=1)
+        assert storage.get_vacancy({"vacancy_id": "1"})[0]["salary_from"] == 150
+
+
+def test_open_storage(tmp_path: Path) -> None:
+    assert isinstance(open_storage(str(tmp_path / "a.json")), JSONSaver)
+    assert isinstance(open_storage(str(tmp_path / "a.xlsx")), ExcelFile)
+    with pytest.raises(ValueError):
+        open_storage(str(tmp_path / "a.csv"))
+
+
+def test_cli(archive: Path, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    target = tmp_path / "cli.jsonl"
+    assert main([str(archive / "2025-01"), "--storage", str(target), "--workers", "1"]) == 0
+    assert "вакансий: 3" in capsys.readouterr().out
+    assert main([str(archive), "--storage", str(target), "--workers", "1"]) == 1
+
+
+def test_parse_shard_compressed(tmp_path: Path) -> None:
+    path = tmp_path / "page.json.gz"
+    path.write_bytes(gzip.compress(json.dumps({"items": [make_item("5", 500)]}).encode("utf-8")))
+    vacancies, errors = parse_shard([str(path)])
+    assert [vacancy.vacancy_id for vacancy in vacancies] == ["5"]
+    assert errors == []
+
+
+def test_find_archives_matches_compressed(archive: Path) -> None:
+    """По умолчанию находятся и сжатые страницы архива."""
+    (archive / "page-3.json.gz").write_bytes(gzip.compress(json.dumps({"items": [make_item("6", 600)]}).encode()))
+    (archive / "notes.txt").write_text("-", encoding="utf-8")
+    assert [file.name for file in find_archives([str(archive)])][-1] == "page-3.json.gz"
+    assert len(find_archives([str(archive)])) == 5
+    assert len(find_archives([str(archive)], "*.json")) == 4
+
+
+def test_reingest_excel_on_conflict(archive: Path, tmp_path: Path) -> None:
+    """on_conflict передаётся хранилищу Excel так же, как остальным."""
+    storage = ExcelFile(str(tmp_path / "vacancies.xlsx"))
+    reingest([str(archive / "2025-01")], storage, max_workers=1)
+    reingest([str(archive / "page-2.json")], storage, max_workers=1)
+    assert storage.get_vacancy({"vacancy_id": 1})[0]["salary_from"] == 150
+    reingest([str(archive / "2025-01")], storage, max_workers=1, on_conflict="skip")
+    assert storage.get_vacancy({"vacancy_id": 1})[0]["salary_from"] == 150
@@ -0,0 +1,87 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.json_saver import JSONSaver
+from src.safe_io import FileLock, atomic_write
+from src.vacancies_hh import Vacancy
+
+
+def test_atomic_write_replaces_file(tmp_path: Path) -> None:
+    """Тест на атомарную запись файла."""
+    path = tmp_path / "data.json"
+    path.write_text("old", encoding="utf-8")
+
+    with atomic_write(path) as file:
+        file.write("new")
+
+    assert path.read_text(encoding="utf-8") == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path: Path) -> None:
+    """При ошибке во время записи старый файл остаётся целым."""
+    path = tmp_path / "data.json"
+    path.write_text("old", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as file:
+            file.write("partial")
+            raise RuntimeError
+
+    assert path.read_text(encoding="utf-8") == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_exclusive_lock_blocks_other_holder(tmp_path: Path) -> None:
+    """Исключительная блокировка не даёт другому объекту захватить файл."""
+    path = tmp_path / "data.json"
+    first, second = FileLock(path), FileLock(path)
+    acquired = threading.Event()
+
+    def take_second() -> None:
+        with second.shared():
+            acquired.set()
+
+    with first.exclusive():
+        with first.shared():
+            thread = threading.Thread(target=take_second)
+            thread.start()
+            assert not acquired.wait(0.2)
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_shared_lock_cannot_be_upgraded(tmp_path: Path) -> None:
+    """Повышение разделяемой блокировки до исключительной запрещено, блокировка освобождается."""
+    lock = FileLock(tmp_path / "data.json")
+    with lock.shared():
+        with pytest.raises(RuntimeError):
+            with lock.exclusive():
+                pass
+    with lock.exclusive():
+        pass
+
+
+def test_parallel_writers_do_not_lose_updates(tmp_path: Path) -> None:
+    """Несколько писателей с отдельными экземплярами JSONSaver не теряют данные друг друга."""
+    path = tmp_path / "vacancies.json"
+    JSONSaver(str(path))
+
+    def writer(worker: int) -> None:
+        saver = JSONSaver(str(path))
+        for number in range(10):
+            vacancy_id = f"{worker}-{number}"
+            saver.add_vacancy(Vacancy("Python", f"https://hh.ru/vacancy/{vacancy_id}", 1, 2, "Москва", "", "",
+                                      vacancy_id))
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(path, encoding="utf-8") as file:
+        assert len(json.load(file)) == 40
@@ -0,0 +1,40 @@
+from src.salary import DEFAULT_RATES, parse_salary, salary_value, top_by_salary
+
+
+def test_parse_salary() -> None:
+    assert parse_salary(100000) == 100000
+    assert parse_salary(1500.0) == 1500
+    assert parse_salary("120 000") == 120000
+    assert parse_salary("120\u00a0000") == 120000
+    assert parse_salary("Зарплата не указана") is None
+    assert parse_salary("Стартовая зарплата не указана") is None
+    assert parse_salary(None) is None
+    assert parse_salary(True) is None
+    assert parse_salary(float("nan")) is None
+
+
+def test_salary_value() -> None:
+    assert salary_value({"salary_from": 100, "salary_to": 200}) == 150
+    assert salary_value({"salary_from": 100, "salary_to": "Итоговая зарплата не указана"}) == 100
+    assert salary_value({"salary_from": None, "salary_to": None}) is None
+    assert salary_value({"salary_from": 10, "salary_to": 30, "salary_currency": "USD"}, {"USD": 90}) == 1800
+    assert salary_value({"salary_from": 10, "salary_currency": "EUR"}, {"USD": 90}) is None
+    assert salary_value({"salary_from": 10, "salary_currency": "EUR"}) == 10
+    assert salary_value({"salary_from": 10}, {"USD": 90}) == 10
+
+
+def test_top_by_salary() -> None:
+    records = [
+        {"name_vacancy": "a", "salary_from": 100, "salary_to": 200},
+        {"name_vacancy": "b", "salary_from": None, "salary_to": None},
+        {"name_vacancy": "c", "salary_from": 300, "salary_to": None},
+        {"name_vacancy": "d", "salary_from": 50, "salary_to": 60},
+        {"name_vacancy": "e", "salary_from": 5, "salary_to": 5, "salary_currency": "USD"},
+        {"name_vacancy": "f", "salary_from": 1000, "salary_to": None, "salary_currency": "KZT"},
+        {"name_vacancy": "g", "salary_from": 1000, "salary_to": None, "salary_currency": "XXX"},
+    ]
+    assert DEFAULT_RATES["USD"] * 5 > 300 > DEFAULT_RATES["KZT"] * 1000
+    assert [r["name_vacancy"] for r in top_by_salary(records, 2)] == ["e", "c"]
+    assert [r["name_vacancy"] for r in top_by_salary(records, 10)] == ["e", "c", "f", "a", "d"]
+    assert [r["name_vacancy"] for r in top_by_salary(records, 1, {"USD": 100})] == ["e"]
+    assert top_by_salary(iter(records), 0) == []
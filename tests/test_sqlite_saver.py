@@ -0,0 +1,130 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from src.json_saver import JSONSaver
+from src.query import Field
+from src.sqlite_saver import SQLiteSaver
+from src.vacancies_hh import Vacancy
+
+
+def _vacancy(vacancy_id: str, city: str = "Москва", salary_to: int = 200) -> Vacancy:
+    return Vacancy("Python", f"https://hh.ru/vacancy/{vacancy_id}", 100, salary_to, city, "Python", "Гибрид",
+                   vacancy_id)
+
+
+@pytest.fixture
+def saver(tmp_path: Path) -> Generator[SQLiteSaver, None, None]:
+    with SQLiteSaver(str(tmp_path / "vacancies.db")) as saver:
+        yield saver
+
+
+def test_add_and_get(saver: SQLiteSaver) -> None:
+    """Тест на добавление и поиск по критериям."""
+    saver.add_vacancy([_vacancy("1"), _vacancy("2", city="Казань"), _vacancy("1")])
+
+    assert len(saver.load_data()) == 2
+    result = saver.get_vacancy({"city": "Казань"})
+    assert [item["vacancy_id"] for item in result] == ["2"]
+    assert saver.get_vacancy(_vacancy("1"))[0]["url"] == "https://hh.ru/vacancy/1"
+    assert saver.get_vacancy({"unknown": "value"}) == []
+
+
+def test_conflict_modes(saver: SQLiteSaver) -> None:
+    """Тест режимов replace и merge."""
+    saver.add_vacancy(_vacancy("1"))
+    saver.add_vacancy(_vacancy("1", salary_to=300), on_conflict="replace")
+    assert saver.load_data()[0]["salary_to"] == 300
+
+    update = Vacancy("Python", "https://hh.ru/vacancy/1", 100, 400, "Москва", None, "Гибрид", "1")
+    saver.add_vacancy(update, on_conflict="merge")
+    data = saver.load_data()
+    assert data[0]["salary_to"] == 400
+    assert data[0]["requirement"] == "Python"
+
+
+def test_delete(saver: SQLiteSaver) -> None:
+    """Тест на удаление вакансий."""
+    saver.add_vacancy([_vacancy("1"), _vacancy("2", city="Казань")])
+    saver.delete_vacancy({"city": "Москва"})
+
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["2"]
+
+
+def test_indexes_and_wal(saver: SQLiteSaver) -> None:
+    """Поиск по городу использует индекс, база работает в режиме WAL."""
+    connection = sqlite3.connect(saver.file_path)
+    plan = " ".join(row[-1] for row in connection.execute("EXPLAIN QUERY PLAN SELECT * FROM vacancies WHERE city = ?",
+                                                          ("Москва",)))
+    mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    connection.close()
+
+    assert "idx_vacancies_city" in plan
+    assert mode == "wal"
+
+
+def test_import_json(saver: SQLiteSaver, tmp_path: Path) -> None:
+    """Тест на перенос данных из JSON-файла старого формата."""
+    legacy = [
+        {
+            "name_vacancy": "Программист",
+            "url": "https://api.hh.ru/areas/1",
+            "salary_from": "Зарплата не указана",
+            "salary_to": "Зарплата не указана",
+            "city": "Москва",
+            "requirement": "JS",
+            "work_format": "На месте работодателя",
+        }
+    ]
+    json_path = tmp_path / "vacancies.json"
+    json_path.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+    saver.import_json(str(json_path))
+
+    data = saver.load_data()
+    assert len(data) == 1
+    assert data[0]["salary_from"] is None
+    assert data[0]["vacancy_id"] is None
+
+
+def test_import_json_missing_file(saver: SQLiteSaver, tmp_path: Path) -> None:
+    """Отсутствующий файл — ошибка, при этом ни файл, ни блокировка не создаются."""
+    with pytest.raises(FileNotFoundError):
+        saver.import_json(str(tmp_path / "missing.json"))
+    assert not list(tmp_path.glob("missing*"))
+
+
+def test_import_json_skips_deleted(saver: SQLiteSaver, tmp_path: Path) -> None:
+    """Вакансии, удалённые через журнал надгробий JSONSaver, не переносятся."""
+    json_path = tmp_path / "vacancies.json"
+    storage = JSONSaver(str(json_path))
+    storage.add_vacancy([_vacancy("1"), _vacancy("2")])
+    storage.delete_vacancy({"vacancy_id": "1"})
+
+    saver.import_json(str(json_path))
+
+    assert [item["vacancy_id"] for item in saver.load_data()] == ["2"]
+
+
+def test_legacy_salaries_migrated(tmp_path: Path) -> None:
+    """Заглушки и числа в строках из старой базы приводятся к NULL и целым числам,
+    поэтому сравнения по зарплате совпадают с другими хранилищами."""
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE vacancies (key TEXT PRIMARY KEY, name_vacancy, url, salary_from, salary_to, "
+                           "city, requirement, work_format)")
+        connection.executemany("INSERT INTO vacancies VALUES (?, 'Python', ?, ?, ?, 'Москва', '', 'Офис')", [
+            ("a", "u1", "Зарплата не указана", "Итоговая зарплата не указана"),
+            ("b", "u2", "120 000", None),
+            ("c", "u3", 50000, 90000),
+        ])
+    connection.close()
+
+    with SQLiteSaver(str(path)) as saver:
+        salaries = {row["url"]: (row["salary_from"], row["salary_to"]) for row in saver.load_data()}
+        assert salaries == {"u1": (None, None), "u2": (120000, None), "u3": (50000, 90000)}
+        assert [row["url"] for row in saver.query(Field("salary_from") >= 60000)] == ["u2"]
+        assert saver.query(Field("salary_to") > 100000) == []
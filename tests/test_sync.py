@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from requests import HTTPError
+
+from src.json_saver import JSONSaver
+from src.sync import DATE_FORMAT, IncrementalSync, SyncError
+
+NOW = datetime(2024, 5, 10, tzinfo=timezone.utc)
+
+
+def _item(vacancy_id: str, published_at: str, salary_to: int = 100) -> Dict[str, Any]:
+    return {
+        "id": vacancy_id,
+        "published_at": published_at,
+        "professional_roles": [{"name": "Python"}],
+        "area": {"url": f"https://hh.ru/vacancy/{vacancy_id}", "name": "Москва"},
+        "snippet": {"requirement": "Python"},
+        "work_format": [{"name": "Удалённо"}],
+        "salary": {"from": 50, "to": salary_to, "currency": "RUR"},
+    }
+
+
+class FakeAPI:
+    """API, отдающее заранее заданные вакансии (новые первыми) и запоминающее фильтры."""
+
+    def __init__(self, items: List[Dict[str, Any]], fail_page: Optional[int] = None, extra_found: int = 0) -> None:
+        self.items = items
+        self.fail_page = fail_page
+        self.extra_found = extra_found
+        self.filters: List[Dict[str, Any]] = []
+
+    def fetch(self, keyword: str, page: int = 0, **filters: Any) -> Dict[str, Any]:
+        self.filters.append(filters)
+        if page == self.fail_page:
+            raise HTTPError("503")
+        date_from = datetime.strptime(filters.get("date_from", "2000-01-01T00:00:00+0000"), DATE_FORMAT)
+        date_to = datetime.strptime(filters.get("date_to", "2100-01-01T00:00:00+0000"), DATE_FORMAT)
+        matched = [item for item in self.items
+                   if date_from <= datetime.strptime(item["published_at"], DATE_FORMAT) <= date_to]
+        per_page = filters["per_page"]
+        return {"found": len(matched) + self.extra_found, "items": matched[page * per_page:(page + 1) * per_page]}
+
+    def search(self, keyword: str, page: int = 0, **filters: Any) -> Optional[Dict[str, Any]]:
+        return self.fetch(keyword, page, **filters)
+
+
+def test_first_run_stores_mark(tmp_path: Path) -> None:
+    """Первый запуск загружает всё и сохраняет отметку последней публикации."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    api = FakeAPI([_item("2", "2024-05-02T10:00:00+0300"), _item("1", "2024-05-01T10:00:00+0300")])
+    sync = IncrementalSync(api, storage)  # type: ignore[arg-type]
+
+    sync.run("python")
+
+    assert "date_from" not in api.filters[0]
+    assert sync.load_state() == {"python": "2024-05-02T10:00:00+0300"}
+    assert (tmp_path / "vacancies.sync.json").exists()
+    assert len(storage.load_data()) == 2
+
+
+def test_next_run_requests_only_newer_and_upserts(tmp_path: Path) -> None:
+    """Следующий запуск передаёт date_from и обновляет вакансии по id."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    IncrementalSync(FakeAPI([_item("1", "2024-05-01T10:00:00+0300")]), storage).run(  # type: ignore[arg-type]
+        "python"
+    )
+    api = FakeAPI([_item("3", "2024-05-03T10:00:00+0300"), _item("1", "2024-05-01T10:00:00+0300", 200)])
+    sync = IncrementalSync(api, storage)  # type: ignore[arg-type]
+
+    sync.run("python")
+
+    assert api.filters[0]["date_from"] == "2024-05-01T10:00:00+0300"
+    data = storage.load_data()
+    assert sorted(item["vacancy_id"] for item in data) == ["1", "3"]
+    assert next(item for item in data if item["vacancy_id"] == "1")["salary_to"] == 200
+    assert sync.load_state()["python"] == "2024-05-03T10:00:00+0300"
+
+
+def test_failed_page_keeps_mark(tmp_path: Path) -> None:
+    """Ошибка загрузки страницы пробрасывается, отметка синхронизации не сохраняется."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    items = [_item(str(i), (NOW - timedelta(minutes=i)).strftime(DATE_FORMAT)) for i in range(150)]
+    sync = IncrementalSync(FakeAPI(items, fail_page=1), storage)  # type: ignore[arg-type]
+
+    with pytest.raises(HTTPError):
+        sync.run("python")
+    assert sync.load_state() == {}
+
+
+def test_incomplete_fetch_keeps_mark(tmp_path: Path) -> None:
+    """Если загружено меньше найденного, отметка не сдвигается."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    sync = IncrementalSync(FakeAPI([_item("1", "2024-05-01T10:00:00+0300")], extra_found=1),  # type: ignore[arg-type]
+                           storage)
+
+    with pytest.raises(SyncError):
+        sync.run("python")
+    assert sync.load_state() == {}
+    assert len(storage.load_data()) == 1
+
+
+def test_large_result_is_split(tmp_path: Path) -> None:
+    """Найденное сверх pages страниц загружается подзапросами планировщика, отметка сдвигается."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    items = [_item(str(i), (NOW - timedelta(minutes=i + 1)).strftime(DATE_FORMAT)) for i in range(250)]
+    sync = IncrementalSync(FakeAPI(items), storage)  # type: ignore[arg-type]
+
+    vacancies = sync.run("python", pages=1, now=NOW)
+
+    assert len(vacancies) == 250
+    assert len(storage.load_data()) == 250
+    assert sync.load_state() == {"python": items[0]["published_at"]}
+
+
+class GrowingAPI(FakeAPI):
+    """API, в котором после запроса первой страницы публикуется новая вакансия."""
+
+    def fetch(self, keyword: str, page: int = 0, **filters: Any) -> Dict[str, Any]:
+        response = super().fetch(keyword, page, **filters)
+        if page == 0:
+            self.items.insert(0, _item("new", (NOW + timedelta(minutes=1)).strftime(DATE_FORMAT)))
+        return response
+
+
+def test_pages_pinned_to_run_time(tmp_path: Path) -> None:
+    """Публикация между запросами страниц не сдвигает выдачу: все страницы ограничены date_to = now."""
+    storage = JSONSaver(str(tmp_path / "vacancies.json"))
+    items = [_item(str(i), (NOW - timedelta(minutes=i + 1)).strftime(DATE_FORMAT)) for i in range(200)]
+    api = GrowingAPI(items)
+    sync = IncrementalSync(api, storage)  # type: ignore[arg-type]
+
+    vacancies = sync.run("python", now=NOW)
+
+    assert len(vacancies) == 200
+    assert {filters["date_to"] for filters in api.filters} == {NOW.strftime(DATE_FORMAT)}
+    assert sync.load_state() == {"python": (NOW - timedelta(minutes=1)).strftime(DATE_FORMAT)}
@@ -0,0 +1,100 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.json_saver import JSONSaver
+from src.text_index import InvertedIndex, normalize_token, tokenize
+from src.vacancies_hh import Vacancy
+
+
+def _vacancy(vacancy_id: str, requirement: str) -> Vacancy:
+    return Vacancy("Python", f"https://hh.ru/vacancy/{vacancy_id}", 1, 2, "Москва", requirement, "Гибрид", vacancy_id)
+
+
+def test_normalize_token() -> None:
+    """Разные падежи и ё приводятся к одной основе."""
+    assert normalize_token("Разработки") == normalize_token("разработка") == normalize_token("РАЗРАБОТКОЙ")
+    assert normalize_token("ёлка") == normalize_token("елки")
+    assert normalize_token("Django") == "django"
+    assert tokenize("Опыт работы с Python 3") == ["опыт", "работ", "с", "python", "3"]
+
+
+def test_search_modes_and_ranking() -> None:
+    """Поиск по всем словам, по любому слову и ранжирование по частоте."""
+    index = InvertedIndex()
+    index.add("a", "Python и Django")
+    index.add("b", "Python, python, Python")
+    index.add("c", "Java")
+
+    assert [key for key, _ in index.search("python django")] == ["a"]
+    assert [key for key, _ in index.search("python")] == ["b", "a"]
+    assert {key for key, _ in index.search("django java", mode="or")} == {"a", "c"}
+    assert index.search("go") == []
+    with pytest.raises(ValueError):
+        index.search("python", mode="not")
+
+
+def test_remove_and_persist(tmp_path: Path) -> None:
+    """Удаление документа и сохранение индекса на диск."""
+    path = tmp_path / "index.json"
+    index = InvertedIndex(str(path))
+    index.add("a", "Python")
+    index.add("b", "Python")
+    index.remove("a")
+    index.save()
+
+    loaded = InvertedIndex(str(path))
+    assert len(loaded) == 1
+    assert loaded.search("python") == index.search("python")
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_storage_keeps_index_in_sync(tmp_path: Path, cache: bool) -> None:
+    """Хранилище обновляет индекс при добавлении и удалении вакансий."""
+    index_path = tmp_path / "index.json"
+    storage = JSONSaver(str(tmp_path / "vacancies.json"), cache=cache, text_index=InvertedIndex(str(index_path)))
+    storage.add_vacancy([_vacancy("1", "Знание Python и SQL"), _vacancy("2", "Опыт разработки на Python")])
+
+    assert [item["vacancy_id"] for item in storage.search("python sql")] == ["1"]
+    assert len(storage.search("разработка")) == 1
+
+    storage.delete_vacancy({"vacancy_id": "1"})
+    assert storage.search("sql") == []
+
+    reopened = JSONSaver(str(tmp_path / "vacancies.json"), text_index=InvertedIndex(str(index_path)))
+    assert [item["vacancy_id"] for item in reopened.search("python")] == ["2"]
+
+
+def test_delete_defers_index_save(tmp_path: Path) -> None:
+    """Удаление не сохраняет индекс на диск: он сохраняется при следующей записи файла,
+    а до неё другой экземпляр перестраивает устаревший индекс."""
+    index_path = tmp_path / "index.json"
+    storage = JSONSaver(str(tmp_path / "vacancies.json"), text_index=InvertedIndex(str(index_path)))
+    storage.add_vacancy([_vacancy("1", "Python"), _vacancy("2", "Python"), _vacancy("3", "Python")])
+
+    with patch.object(InvertedIndex, "save") as save, patch.object(InvertedIndex, "rebuild") as rebuild:
+        storage.delete_vacancy({"vacancy_id": "1"})
+        assert [item["vacancy_id"] for item in storage.search("python")] == ["2", "3"]
+        save.assert_not_called()
+        rebuild.assert_not_called()
+
+    reopened = JSONSaver(str(tmp_path / "vacancies.json"), text_index=InvertedIndex(str(index_path)))
+    assert sorted(item["vacancy_id"] for item in reopened.search("python")) == ["2", "3"]
+    storage.compact()
+    assert len(InvertedIndex(str(index_path))) == 2
+
+
+def test_storage_rebuilds_stale_index(tmp_path: Path) -> None:
+    """Индекс перестраивается, если файл изменили без него."""
+    path = str(tmp_path / "vacancies.json")
+    storage = JSONSaver(path, text_index=InvertedIndex(str(tmp_path / "index.json")))
+    JSONSaver(path).add_vacancy(_vacancy("1", "Kotlin"))
+
+    assert [item["vacancy_id"] for item in storage.search("kotlin")] == ["1"]
+
+
+def test_search_without_index(tmp_path: Path) -> None:
+    """Поиск без подключённого индекса невозможен."""
+    with pytest.raises(ValueError):
+        JSONSaver(str(tmp_path / "vacancies.json")).search("python")
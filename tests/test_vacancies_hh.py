@@ -1,12 +1,14 @@
 from unittest import mock
 
-from src.vacancies_hh import Vacancy
+import numpy as np
+import pytest
+
+from src.salary import top_by_salary
+from src.vacancies_hh import Vacancy, VacancyCollection
 
 
 def test_init() -> None:
     """Тест на инициализацию объекта."""
-    Vacancy.list_vacancies = []
-
     vacancy = Vacancy(
         name_vacancy="Python Developer",
         url="https://example.com",
@@ -24,7 +26,16 @@ def test_init() -> None:
     assert vacancy.city == "Москва"
     assert vacancy.requirement == "Опыт от 3 лет"
     assert vacancy.work_format == "Удаленная"
-    assert len(Vacancy.list_vacancies) == 1
+    assert not hasattr(Vacancy, "list_vacancies")
+
+
+def test_interned_fields() -> None:
+    """Повторяющиеся строки разделяют один объект."""
+    first = Vacancy("".join(["Python ", "Developer"]), "u1", None, None, "".join(["Моск", "ва"]), "", "Офис")
+    second = Vacancy.from_dict(first.to_dict() | {"url": "u2", "name_vacancy": " ".join(["Python", "Developer"])})
+    assert first.name_vacancy is second.name_vacancy
+    assert first.city is second.city
+    assert first.work_format is second.work_format
 
 
 def test_repr() -> None:
@@ -144,8 +155,8 @@ def test_receiving_vacancies_list() -> None:
     assert first_vacancy.url == "https://api.hh.ru/areas/160"
     assert first_vacancy.city == "Алматы"
     assert first_vacancy.work_format == "На месте работодателя"
-    assert first_vacancy.salary_from == "Стартовая зарплата не указана"
-    assert first_vacancy.salary_to == "Итоговая зарплата не указана"
+    assert first_vacancy.salary_from is None
+    assert first_vacancy.salary_to is None
     assert (
         first_vacancy.requirement
         == "Знание Git. Знание JS/HTML/CSS. Знание Vue.js, React, vite. Умение писать SQL. "
@@ -163,3 +174,83 @@ def test_receiving_vacancies_list() -> None:
         "Минимум 2 года опыта в frontend web-разработке. "
         "Участие минимум в 5 реальных веб-проектах. Опыт работы с REST API. "
     )
+
+
+def test_receiving_vacancies_list_skips_malformed() -> None:
+    """Некорректная вакансия пропускается, остальные разбираются."""
+    vacancies = Vacancy.receiving_vacancies_list([test_vacancies_list[0], {"area": None}, test_vacancies_list[1]])
+    assert [vacancy.city for vacancy in vacancies] == ["Алматы", "Ташкент"]
+
+
+@pytest.fixture
+def collection() -> VacancyCollection:
+    records = [
+        {"name_vacancy": "a", "url": "u1", "salary_from": 100, "salary_to": 200, "city": "Москва",
+         "requirement": "Python", "work_format": "Удалённо"},
+        {"name_vacancy": "b", "url": "u2", "salary_from": None, "salary_to": None, "city": "Казань",
+         "requirement": "Go", "work_format": "Офис"},
+        {"name_vacancy": "c", "url": "u3", "salary_from": 300, "salary_to": None, "city": "Москва",
+         "requirement": "SQL", "work_format": "Офис"},
+        {"name_vacancy": "d", "url": "u4", "salary_from": "Стартовая зарплата не указана", "salary_to": 80,
+         "city": "Казань", "requirement": None, "work_format": "Удалённо", "salary_currency": "USD"},
+    ]
+    return VacancyCollection.from_records(records)
+
+
+def test_collection_filters(collection: VacancyCollection) -> None:
+    assert len(collection) == 4
+    assert list(collection.filter(city="Москва").column("name_vacancy")) == ["a", "c"]
+    assert list(collection.filter(city=["Казань", "Сочи"], work_format="Офис").column("name_vacancy")) == ["b"]
+    assert len(collection.filter(city="Сочи")) == 0
+    assert list(collection.salary_between(100, 200).column("name_vacancy")) == ["a"]
+    assert list(collection.salary_between(low=90, field="salary_to").column("name_vacancy")) == ["a"]
+    with pytest.raises(KeyError):
+        collection.mask(unknown=1)
+
+
+def test_collection_sort_and_top(collection: VacancyCollection) -> None:
+    assert list(collection.sort_by().column("name_vacancy")) == ["d", "c", "a", "b"]
+    assert list(collection.sort_by(descending=False).column("name_vacancy")) == ["a", "c", "d", "b"]
+    assert list(collection.top(2).column("name_vacancy")) == ["d", "c"]
+    assert list(collection.top(10).column("name_vacancy")) == ["d", "c", "a"]
+    assert list(collection.top(10, rates={}).column("name_vacancy")) == ["c", "a", "d"]
+    assert len(collection.top(0)) == 0
+
+
+def test_collection_currency_rates(collection: VacancyCollection) -> None:
+    """По умолчанию суммы пересчитываются по DEFAULT_RATES, как в top_by_salary и при сравнении Vacancy;
+    зарплата в валюте без курса несравнима."""
+    records = collection.to_records()
+    expected = [record["name_vacancy"] for record in top_by_salary(records, 10)]
+    assert list(collection.top(10).column("name_vacancy")) == expected
+    assert [vacancy.name_vacancy for vacancy in sorted(collection, reverse=True)][:3] == expected
+    assert list(collection.top(10, rates={"RUR": 1.0}).column("name_vacancy")) == ["c", "a"]
+    assert np.isnan(collection.salary({"RUR": 1.0})[3])
+
+
+def test_collection_group_by(collection: VacancyCollection) -> None:
+    assert collection.group_by("city") == {"Москва": 225.0, "Казань": 7200.0}
+    assert collection.group_by("city", "count") == {"Москва": 2.0, "Казань": 1.0}
+    assert collection.group_by("work_format", "max") == {"Удалённо": 7200.0, "Офис": 300.0}
+    assert collection.group_by("city", "min", value="salary_from") == {"Москва": 100.0}
+    with pytest.raises(ValueError):
+        collection.group_by("name_vacancy")
+    with pytest.raises(ValueError):
+        collection.group_by("city", "median")
+
+
+def test_collection_lazy_vacancies(collection: VacancyCollection) -> None:
+    top = collection.filter(city="Москва").top(1)
+    vacancy = top[0]
+    assert isinstance(vacancy, Vacancy)
+    assert vacancy.name_vacancy == "c"
+    assert vacancy.salary_from == 300
+    assert vacancy.salary_to is None
+    assert top.record(0)["city"] == "Москва"
+    assert [item.name_vacancy for item in collection.filter(city="Казань")] == ["b", "d"]
+    assert VacancyCollection.from_vacancies([vacancy]).to_records() == [vacancy.to_dict()]
+
+
+def test_collection_numeric_criteria(collection: VacancyCollection) -> None:
+    assert list(collection.filter(salary_from=None).column("name_vacancy")) == ["b", "d"]
+    assert list(collection.filter(salary_from=[300, None], city="Москва").column("name_vacancy")) == ["c"]